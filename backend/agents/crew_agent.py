@@ -1,49 +1,40 @@
-from crewai import Task, Crew
-import logging
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from .weather_agent import weather_agent, get_weather_data
-from .transport_agent import (
-    transport_agent,
-    route_planner,
-    transport_searcher,
-    cost_analyzer,
-    get_web_transport_search,
-    get_real_time_transport_search,
-)
-from .hotel_agent import hotel_agent, get_hotel_recommendations
-from .plan_agent import plan_agent
-from .food_agent import food_agent, planner, searcher, analyst, get_real_time_food_data
-from typing import Dict, Any
-
-# 로깅 설정
+from .weather_agent import format_weather_report, get_weather_report
+from .weather_renderer import WEATHER_RENDER_MODE, render_weather_section
+from .transport_agent import get_real_time_transport_search
+from .hotel_agent import get_hotel_recommendations
+from .food_agent import get_real_time_food_data
+from . import prompt_builder as pb
+from . import registry
+from .model_router import escalation_model, section_model, validate_output
+from .prompt_builder import PromptBuilder
+from .execution_budget import agent_run
+from .llm_factory import OPENAI_MODEL
+from backend.utils.log_pipeline import LazyMessage, setup_logger, should_log_full_prompt
+from backend.utils import metrics
+from backend.utils.trace_store import trace_context, trace_span
+from backend.utils.cache import make_cache, cache_key, canonicalize_plan_request, normalize_text, plan_cache_key
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# 로깅 설정 (큐 기반 비동기 기록 + 크기 로테이션, backend/utils/log_pipeline.py 참고)
 
 def setup_crew_logging():
-    logger = logging.getLogger('crewai_llm_responses')
-    logger.setLevel(logging.INFO)
-    if not logger.handlers:
-        file_handler = logging.FileHandler('crew_llm_responses.log', encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-    return logger
+    return setup_logger('crewai_llm_responses', 'crew_llm_responses.log')
 
 crew_logger = setup_crew_logging()
 
-def log_agent_interaction(agent_name, task_name, prompt, response, execution_time=None):
-    log_message = f"""
+def _format_agent_interaction(agent_name, task_name, logged_at, prompt, response, execution_time=None, usage=None):
+    return f"""
 {'='*80}
 🤖 AGENT: {agent_name}
 📋 TASK: {task_name}
-⏰ TIME: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ TIME: {logged_at.strftime('%Y-%m-%d %H:%M:%S')}
 {f'⚡ EXECUTION_TIME: {execution_time:.2f}초' if execution_time else ''}
+{f"🔁 USAGE: LLM 턴 {usage['turns']}회, 도구 호출 {usage['tool_calls']}회 (차단 {usage['blocked_tool_calls']}회)" if usage else ''}
 
 📤 PROMPT:
 {prompt}
@@ -52,126 +43,113 @@ def log_agent_interaction(agent_name, task_name, prompt, response, execution_tim
 {response}
 {'='*80}
 """
-    crew_logger.info(log_message)
-
-def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
-    crew_logger.info(f"🚀 여행 계획 생성 시작 - 목적지: {data.get('destination', '')}")
-    import time
-    results = {}
-
-    # 1. 날씨 정보
-    start_time = time.time()
-    weather_info = get_weather_data(
-        data.get('destination', ''),
-        data.get('start_date', ''),
-        data.get('end_date', '')
-    )
-    weather_prompt = f"""
-## 여행 날씨 분석 및 준비물 추천 작업
-
-### 📋 기본 정보
-- **목적지**: {data.get('destination', '')}
-- **여행 기간**: {data.get('start_date', '')} ~ {data.get('end_date', '')}
-- **인원수**: {data.get('people', '')}명
-- **여행 목적**: {data.get('purpose', '')}
-
-### 🎯 작업 목표
-제공된 실시간 날씨 데이터를 분석하여 여행자가 날씨에 최적화된 준비를 할 수 있도록 구체적이고 실용적인 가이드를 제공합니다.
-
-### 📝 단계별 분석 요구사항
-
-**1단계: 날씨 패턴 분석**
-- 여행 기간 중 날씨 변화 패턴 파악
-- 기온 변화폭 및 강수 확률 분석
-- 특이 날씨 (폭염, 한파, 태풍 등) 가능성 평가
 
-**2단계: 맞춤형 옷차림 추천**
-- 일별/시간대별 최적 복장 조합
-- 레이어링 기법을 활용한 온도 변화 대응
-- 활동별 (관광, 식사, 휴식) 적합한 의류
-
-**3단계: 필수 준비물 선별**
-- 날씨별 필수 아이템 (우산, 선크림, 보온용품 등)
-- 여행 목적에 따른 특수 준비물
-- 현지 구매 vs 미리 준비 구분
-
-**4단계: 안전 및 편의 팁 제공**
-- 날씨로 인한 주의사항 및 대처법
-- 실내/실외 활동 비율 최적화 제안
-- 비상상황 대비 계획
-
-### 📊 출력 형식 (필수)
-다음 표 형식으로 정확히 작성해주세요:
-
-| 날짜 | 날씨 | 기온(°C) | 강수확률 | 추천 옷차림 | 필수 준비물 | 주의사항 |
-|------|------|----------|----------|-------------|-------------|----------|
-| MM/DD | 예: 맑음 | 예: 15-25 | 예: 10% | 예: 긴팔+얇은 겉옷 | 예: 선글라스, 선크림 | 예: 자외선 주의 |
+def log_agent_interaction(agent_name, task_name, prompt, response, execution_time=None, usage=None, failed=False):
+    """프롬프트/응답 전문은 실패했거나 샘플링된 경우에만 기록 (메시지는 로그 스레드에서 생성)"""
+    if failed or should_log_full_prompt():
+        crew_logger.info('%s', LazyMessage(
+            _format_agent_interaction, agent_name, task_name, datetime.now(), prompt, response, execution_time, usage
+        ))
+    else:
+        crew_logger.info(
+            "🤖 %s / %s - %.2f초, 프롬프트 %d자, 응답 %d자 (전문 생략: PROMPT_LOG_SAMPLE_RATE)",
+            agent_name, task_name, execution_time or 0.0, len(prompt or ''), len(response or '')
+        )
 
-### 📎 참고 데이터
-```
-{weather_info}
-```
 
-### ✅ 품질 검증 요구사항
+def _trip_info(data: Dict[str, Any]):
+    return [
+        ('목적지', data.get('destination', '')),
+        ('여행 기간', f"{data.get('start_date', '')} ~ {data.get('end_date', '')}"),
+        ('인원수', f"{data.get('people', '')}명"),
+        ('여행 목적', data.get('purpose', '')),
+    ]
+
+def _weather_report(data: Dict[str, Any]) -> Dict[str, Any]:
+    return get_weather_report(data.get('destination', ''), data.get('start_date', ''), data.get('end_date', ''))
+
+def _render_weather(data: Dict[str, Any], prepare_kwargs: Dict[str, Any]) -> Optional[str]:
+    """WEATHER_RENDER_MODE=rules면 날씨 섹션을 규칙 표로 바로 생성
+
+    정보가 없는 날짜가 있어 None을 반환하면 조회한 날씨 정보를 prepare_kwargs에 넣어 LLM 프롬프트에 재사용한다.
+    """
+    if WEATHER_RENDER_MODE != 'rules':
+        return None
+    report = _weather_report(data)
+    prepare_kwargs['report'] = report
+    return render_weather_section(report)
+
+def _prepare_weather(data: Dict[str, Any], report: Optional[Dict[str, Any]] = None, model: str = OPENAI_MODEL):
+    """날씨 섹션 프롬프트 준비 (report가 없으면 날씨 정보 조회)"""
+    report = report or _weather_report(data)
+    weather_info = format_weather_report(report)
+    draft = render_weather_section(report) if WEATHER_RENDER_MODE == 'rules+llm' else None
+    builder = PromptBuilder('weather', model).add(
+        pb.heading("여행 날씨 분석 및 준비물 추천 작업"),
+        pb.info_list("기본 정보", _trip_info(data)),
+        pb.block("🎯 작업 목표", "제공된 날씨 데이터를 분석하여 여행자가 날씨에 최적화된 준비를 할 수 있도록 구체적이고 실용적인 가이드를 제공합니다."),
+        pb.steps("📝 단계별 분석 요구사항", [
+            ("날씨 패턴 분석", ["여행 기간 중 날씨 변화 패턴 파악", "기온 변화폭 및 강수 확률 분석", "특이 날씨 (폭염, 한파, 태풍 등) 가능성 평가"]),
+            ("맞춤형 옷차림 추천", ["일별/시간대별 최적 복장 조합", "레이어링 기법을 활용한 온도 변화 대응", "활동별 (관광, 식사, 휴식) 적합한 의류"]),
+            ("필수 준비물 선별", ["날씨별 필수 아이템 (우산, 선크림, 보온용품 등)", "여행 목적에 따른 특수 준비물", "현지 구매 vs 미리 준비 구분"]),
+            ("안전 및 편의 팁 제공", ["날씨로 인한 주의사항 및 대처법", "실내/실외 활동 비율 최적화 제안", "비상상황 대비 계획"]),
+        ]),
+        pb.output_table(
+            ["날짜", "날씨", "기온(°C)", "강수확률", "추천 옷차림", "필수 준비물", "주의사항"],
+            ["MM/DD", "예: 맑음", "예: 15-25", "예: 10%", "예: 긴팔+얇은 겉옷", "예: 선글라스, 선크림", "예: 자외선 주의"],
+        ),
+    )
+    builder.add_data('weather_info', weather_info)
+    if draft:
+        builder.add(pb.block("📐 규칙 기반 초안 활용", """
+- 아래 초안 표의 날짜/날씨/기온/강수확률은 그대로 유지
+- 옷차림, 준비물, 주의사항을 여행 목적과 인원수에 맞게 구체화하고 필요하면 항목 추가"""))
+        builder.add_data('weather_draft', draft, "📐 규칙 기반 초안 표")
+    builder.add(
+        pb.block("✅ 품질 검증 요구사항", """
 - 모든 추천은 제공된 날씨 데이터에 근거해야 함
+- 참고 데이터의 출처가 '평년'인 날짜는 예보가 아닌 기후 평년값임을 주의사항에 명시
+- 참고 데이터에 '정보 없음'인 날짜는 기온/날씨를 추측하지 말고 '정보 없음'으로 표기
 - 여행 목적과 인원수를 고려한 실용적 조언 포함
-- 현지에서 쉽게 구할 수 있는 품목과 미리 준비해야 할 품목 구분 명시
-
-### 📎 필수 참고자료 섹션
-응답 마지막에 반드시 다음 형식으로 참고 링크를 포함하세요:
-
-**📚 참고자료 및 출처:**
-- [사이트명1] URL1 - 정보 설명
-- [사이트명2] URL2 - 정보 설명
-- [사이트명3] URL3 - 정보 설명
-
-예시:
-- [기상청] https://www.weather.go.kr - 날씨 예보 정보
-- [OpenWeatherMap] https://openweathermap.org - 실시간 날씨 데이터
-"""
-    weather_task = Task(
-        name="weather",
-        description=weather_prompt,
-        agent=weather_agent,
-        expected_output="날짜별 날씨 예보, 추천 옷차림, 필수 준비물이 표로 정리된 결과"
+- 현지에서 쉽게 구할 수 있는 품목과 미리 준비해야 할 품목 구분 명시"""),
+        pb.reference_section(
+            ("기상청", "https://www.weather.go.kr", "날씨 예보 정보"),
+            ("OpenWeatherMap", "https://openweathermap.org", "실시간 날씨 데이터"),
+        ),
     )
-    weather_crew = Crew(tasks=[weather_task])
-    try:
-        weather_result = weather_crew.kickoff()
-        results['weather'] = str(weather_result)
-    except Exception as e:
-        results['weather'] = f"날씨 분석 중 오류: {e}"
-    weather_time = time.time() - start_time
-    log_agent_interaction("WeatherAgent", "weather_analysis", weather_prompt, str(results.get('weather')), weather_time)
-
-    # 2. 교통 정보
-    start_time = time.time()
-    transport_prompt = f"""
-## 교통편 분석 및 최적 이동 방안 제시 작업
-
-### 📋 여행 정보
-- **출발지**: {data.get('departure', '')}
-- **목적지**: {data.get('destination', '')}  
-- **여행 기간**: {data.get('start_date', '')} ~ {data.get('end_date', '')}
-- **인원수**: {data.get('people', '')}명
-- **예산**: {data.get('budget', '')}만원
-- **여행 목적**: {data.get('purpose', '')}
-
-### 🎯 분석 목표
-출발지에서 목적지까지의 모든 가능한 교통수단을 실시간 검색을 통해 조사하고, 여행자의 조건에 최적화된 이동 방안을 제시합니다.
-
-⚠️ **중요**: 반드시 검색 도구를 사용해야 합니다. 검색 없이는 답변할 수 없습니다.
-
-### 🔍 단계별 분석 요구사항
-
-**1단계: 교통수단 전수조사** (검색 도구 필수 사용)
-먼저 다음 키워드로 반드시 검색해야 합니다:
-- "{data.get('departure', '')} {data.get('destination', '')} KTX 시간표 요금"
-- "{data.get('departure', '')} {data.get('destination', '')} 고속버스 예약"
-- "{data.get('departure', '')} {data.get('destination', '')} 항공편"
-- "{data.get('departure', '')} {data.get('destination', '')} 렌터카"
+    prompt, prompt_stats = builder.build()
+    return prompt, "날짜별 날씨 예보, 추천 옷차림, 필수 준비물이 표로 정리된 결과", prompt_stats
+
+def _prepare_transport(data: Dict[str, Any], model: str = OPENAI_MODEL):
+    """교통편 섹션 프롬프트 준비"""
+    departure = data.get('departure', '')
+    destination = data.get('destination', '')
+    prefetched = get_real_time_transport_search(departure, destination)
+    if prefetched:
+        # 사전 검색 결과가 있으면 추가 검색 없이 한 번에 답할 수 있도록 안내
+        search_guide = "**1단계: 교통수단 전수조사** (아래 사전 검색 결과 우선 활용)\n" + """- 아래 '사전 검색 결과'에 기차/고속버스/항공/대중교통 검색 결과가 이미 포함되어 있습니다
+- 사전 검색 결과로 확인되는 내용은 추가 검색 없이 바로 작성하고, 빠진 정보(렌터카, 최신 요금 등)만 검색 도구로 확인하세요"""
+        source_rule = "- **검색 결과 기반 답변**: 사전 검색 결과와 검색 도구로 확인한 데이터만 사용하고, 추측이나 일반적 지식 사용 금지"
+        expected_output = "사전 검색 결과와 검색 도구로 확인한 실시간 교통편 정보를 표 형식으로 제공. 검색하지 않은 추측 정보는 허용되지 않음"
+    else:
+        search_guide = pb.SEARCH_REQUIRED + "\n\n**1단계: 교통수단 전수조사** (검색 도구 필수 사용)\n" + pb.search_first([
+            f"{departure} {destination} KTX 시간표 요금",
+            f"{departure} {destination} 고속버스 예약",
+            f"{departure} {destination} 항공편",
+            f"{departure} {destination} 렌터카",
+        ])
+        source_rule = "- **검색 결과 기반 답변**: 위 키워드로 실제 검색한 데이터만 사용하고, 추측이나 일반적 지식 사용 금지"
+        expected_output = "반드시 검색 도구를 사용하여 얻은 실시간 교통편 정보를 표 형식으로 제공. 검색하지 않은 추측 정보는 허용되지 않음"
+    builder = PromptBuilder('transport', model).add(
+        pb.heading("교통편 분석 및 최적 이동 방안 제시 작업"),
+        pb.info_list("여행 정보", [('출발지', departure)] + _trip_info(data)[:3] + [
+            ('예산', f"{data.get('budget', '')}만원"),
+            ('여행 목적', data.get('purpose', '')),
+        ]),
+        pb.block("🎯 분석 목표", "출발지에서 목적지까지의 모든 가능한 교통수단을 실시간 검색을 통해 조사하고, 여행자의 조건에 최적화된 이동 방안을 제시합니다."),
+        pb.block("🔍 단계별 분석 요구사항", search_guide + """
 - 항공편: 직항/경유, 항공사별 요금 및 시간표
-- 철도: KTX/SRT/무궁화호 등 등급별 요금 및 소요시간  
+- 철도: KTX/SRT/무궁화호 등 등급별 요금 및 소요시간
 - 버스: 고속버스/시외버스 노선 및 요금
 - 기타: 렌터카, 지하철, 개인차량 등
 
@@ -188,101 +166,66 @@ def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
 **4단계: 예약 정보 및 실용적 팁**
 - 실시간 예약 가능성 확인
 - 할인 혜택 및 특가 정보
-- 예약 취소/변경 정책
-
-### 📊 출력 형식 (필수)
-다음 표 형식으로 정확히 작성해주세요:
-
-| 순위 | 교통수단 | 소요시간 | 총비용 | 예약방법 | 장점 | 단점 | 추천이유 |
-|------|----------|----------|--------|----------|------|------|----------|
-| 1 | 예: KTX | 예: 2시간30분 | 예: 15만원 | 코레일톡 앱 | 빠름, 편안함 | 비쌈 | 시간 절약 중시시 최적 |
-
-### 🔗 예약 정보 섹션
-각 교통수단별로 다음 정보를 포함해야 합니다:
+- 예약 취소/변경 정책"""),
+        pb.output_table(
+            ["순위", "교통수단", "소요시간", "총비용", "예약방법", "장점", "단점", "추천이유"],
+            ["1", "예: KTX", "예: 2시간30분", "예: 15만원", "코레일톡 앱", "빠름, 편안함", "비쌈", "시간 절약 중시시 최적"],
+        ),
+        pb.block("🔗 예약 정보 섹션", """각 교통수단별로 다음 정보를 포함해야 합니다:
 - **공식 예약 사이트 URL**
-- **예약 앱 이름**  
+- **예약 앱 이름**
 - **전화 예약 번호**
-- **현재 예약 가능 여부**
-
-### ⚠️ 중요 지침
-- **검색 도구 사용 필수**: 위에 명시된 키워드로 실제 검색을 수행한 후 답변하세요
-- **검색 결과 기반 답변**: 검색에서 얻은 실제 데이터만 사용하고, 추측이나 일반적 지식 사용 금지
+- **현재 예약 가능 여부**"""),
+        pb.block("⚠️ 중요 지침", source_rule + """
 - **실시간 정보 확인**: 운휴, 지연, 요금 변동 등 최신 상황 반영
-- **출처 명시**: 참고한 웹사이트 URL을 반드시 포함
-- **검증 가능성**: 제시된 모든 정보가 검증 가능해야 함
-
-🔍 **작업 순서**:
-1. 먼저 위에 제시된 키워드로 검색 도구를 사용하세요
-2. 검색 결과를 분석하여 정확한 정보를 추출하세요
-3. 추출한 정보를 바탕으로 표 형식으로 답변하세요
-4. 답변 마지막에 참고자료 섹션을 포함하세요
-
-### 📎 필수 참고자료 섹션
-응답 마지막에 반드시 다음 형식으로 참고 링크를 포함하세요:
-
-**📚 참고자료 및 출처:**
-- [사이트명1] URL1 - 정보 설명
-- [사이트명2] URL2 - 정보 설명
-- [사이트명3] URL3 - 정보 설명
-
-예시:
-- [코레일] https://www.letskorail.com - KTX 요금 및 시간표
-- [고속버스통합예매] https://www.kobus.co.kr - 고속버스 노선 정보
-
-### 📈 개인화 추천 기준
-- 예산 제약: {data.get('budget', '')}만원 범위 내 최적화
+- **출처 명시 및 검증 가능성**: 참고한 웹사이트 URL을 반드시 포함하고, 모든 정보가 검증 가능해야 함"""),
+        pb.reference_section(
+            ("코레일", "https://www.letskorail.com", "KTX 요금 및 시간표"),
+            ("고속버스통합예매", "https://www.kobus.co.kr", "고속버스 노선 정보"),
+        ),
+        pb.block("📈 개인화 추천 기준", f"""- 예산 제약: {data.get('budget', '')}만원 범위 내 최적화
 - 인원수 고려: {data.get('people', '')}명 단체/개인 특성 반영
-- 여행 목적: {data.get('purpose', '')}에 적합한 이동 방식 우선순위
-"""
-    transport_task = Task(
-        name="transport",
-        description=transport_prompt,
-        agent=transport_agent,
-        expected_output="반드시 검색 도구를 사용하여 얻은 실시간 교통편 정보를 표 형식으로 제공. 검색하지 않은 추측 정보는 허용되지 않음"
+- 여행 목적: {data.get('purpose', '')}에 적합한 이동 방식 우선순위"""),
     )
-    transport_crew = Crew(tasks=[transport_task])
-    try:
-        transport_result = transport_crew.kickoff()
-        results['transport'] = str(transport_result)
-    except Exception as e:
-        results['transport'] = f"교통편 추천 중 오류: {e}"
-    transport_time = time.time() - start_time
-    log_agent_interaction("TransportAgent", "transport_recommendation", transport_prompt, str(results.get('transport')), transport_time)
-
-    # 3. 숙소 정보
-    start_time = time.time()
+    if prefetched:
+        builder.add_data('transport_search', prefetched, "🔎 사전 검색 결과 (교통수단별)")
+    prompt, prompt_stats = builder.build()
+    return prompt, expected_output, prompt_stats
+
+def _prepare_hotel(data: Dict[str, Any], model: str = OPENAI_MODEL):
+    """숙박 섹션 프롬프트 준비"""
+    destination = data.get('destination', '')
     hotel_data = get_hotel_recommendations(
-        data.get('destination', ''),
+        destination,
         checkin=data.get('start_date', None),
         checkout=data.get('end_date', None),
         people=data.get('people', None),
         budget=data.get('budget', None),
         purpose=data.get('purpose', None)
     )
-    hotel_prompt = f"""
-## 숙박시설 분석 및 최적 숙소 추천 작업
-
-### 📋 숙박 조건
-- **목적지**: {data.get('destination', '')}
-- **체크인**: {data.get('start_date', '')}
-- **체크아웃**: {data.get('end_date', '')}
-- **인원수**: {data.get('people', '')}명
-- **예산**: {data.get('budget', '')}만원
-- **여행 목적**: {data.get('purpose', '')}
-
-### 🎯 분석 목표
-다양한 숙박시설을 종합적으로 분석하여 여행자의 조건과 목적에 가장 적합한 숙소 옵션을 제시합니다.
-
-⚠️ **중요**: 반드시 검색 도구를 사용해야 합니다. 검색 없이는 답변할 수 없습니다.
-
-### 🔍 단계별 분석 요구사항
-
-**1단계: 숙소 유형별 분석** (검색 도구 필수 사용)
-먼저 다음 키워드로 반드시 검색해야 합니다:
-- "{data.get('destination', '')} 호텔 추천 {data.get('start_date', '')}"
-- "{data.get('destination', '')} 숙박 예약 가격"
-- "{data.get('destination', '')} 펜션 게스트하우스"
-- "{data.get('destination', '')} 커플 숙소 추천"
+    if hotel_data:
+        # 사전 검색 + 예산 기준으로 추린 후보가 있으면 후보 검토 위주로 안내
+        search_guide = "**1단계: 숙소 유형별 분석** (아래 숙소 후보 목록 우선 검토)\n" + """- 아래 '숙소 후보 목록'은 호텔/펜션/게스트하우스를 검색해 중복을 제거하고 1박 예산에 가까운 순으로 정렬한 것입니다
+- 후보 목록에서 조건에 맞는 숙소를 고르고, 요금/예약 가능 여부 등 빠진 정보만 검색 도구로 확인하세요"""
+    else:
+        search_guide = pb.SEARCH_REQUIRED + "\n\n**1단계: 숙소 유형별 분석** (검색 도구 필수 사용)\n" + pb.search_first([
+            f"{destination} 호텔 추천 {data.get('start_date', '')}",
+            f"{destination} 숙박 예약 가격",
+            f"{destination} 펜션 게스트하우스",
+            f"{destination} 커플 숙소 추천",
+        ])
+    builder = PromptBuilder('hotel', model).add(
+        pb.heading("숙박시설 분석 및 최적 숙소 추천 작업"),
+        pb.info_list("숙박 조건", [
+            ('목적지', destination),
+            ('체크인', data.get('start_date', '')),
+            ('체크아웃', data.get('end_date', '')),
+            ('인원수', f"{data.get('people', '')}명"),
+            ('예산', f"{data.get('budget', '')}만원"),
+            ('여행 목적', data.get('purpose', '')),
+        ]),
+        pb.block("🎯 분석 목표", "다양한 숙박시설을 종합적으로 분석하여 여행자의 조건과 목적에 가장 적합한 숙소 옵션을 제시합니다."),
+        pb.block("🔍 단계별 분석 요구사항", search_guide + """
 - 호텔: 체인호텔, 부티크호텔, 비즈니스호텔
 - 리조트: 올인클루시브, 풀빌라, 스파리조트
 - 대안숙소: 펜션, 게스트하우스, 에어비앤비, 한옥스테이
@@ -292,7 +235,7 @@ def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
 - 교통 편의성: 공항/역 접근성, 대중교통 연결
 - 주변 편의시설: 식당, 편의점, 병원, 쇼핑센터
 
-**3단계: 가성비 및 가격 분석**  
+**3단계: 가성비 및 가격 분석**
 - 1박당 비용 대비 제공 서비스 분석
 - 포함 서비스: 조식, 와이파이, 주차, 수영장 등
 - 숨은 비용: 리조트피, 세금, 서비스료 등
@@ -301,91 +244,52 @@ def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
 **4단계: 만족도 및 품질 평가**
 - 최근 리뷰 동향 및 평점 분석
 - 청결도, 서비스 품질, 시설 상태
-- 특별한 장점이나 주의사항
-
-### 📊 출력 형식 (필수)
-다음 표 형식으로 정확히 작성해주세요:
-
-| 순위 | 숙소명 | 유형 | 위치 | 1박요금 | 총비용 | 주요시설 | 장점 | 단점 | 예약링크 |
-|------|--------|------|------|---------|--------|----------|------|------|----------|
-| 1 | 예: 그랜드호텔 | 5성급호텔 | 시내중심가 | 15만원 | 45만원 | 조식,주차,스파 | 교통편리 | 비쌈 | booking.com |
-
-### 🏨 세부 정보 섹션
-각 추천 숙소별로 다음 정보를 포함:
+- 특별한 장점이나 주의사항"""),
+        pb.output_table(
+            ["순위", "숙소명", "유형", "위치", "1박요금", "총비용", "주요시설", "장점", "단점", "예약링크"],
+            ["1", "예: 그랜드호텔", "5성급호텔", "시내중심가", "15만원", "45만원", "조식,주차,스파", "교통편리", "비쌈", "booking.com"],
+        ),
+        pb.block("🏨 세부 정보 섹션", """각 추천 숙소별로 다음 정보를 포함:
 - **정확한 주소 및 연락처**
-- **체크인/아웃 시간**  
+- **체크인/아웃 시간**
 - **포함/불포함 서비스 명시**
 - **객실 타입 및 최대 수용인원**
-- **예약 가능 플랫폼 및 URL**
-
-### 🎯 맞춤형 추천 기준
-- **인원수 최적화**: {data.get('people', '')}명에 적합한 객실 구성
+- **예약 가능 플랫폼 및 URL**"""),
+        pb.block("🎯 맞춤형 추천 기준", f"""- **인원수 최적화**: {data.get('people', '')}명에 적합한 객실 구성
 - **예산 효율성**: {data.get('budget', '')}만원 내에서 최고 가치
 - **목적 부합성**: {data.get('purpose', '')}에 특화된 시설/서비스
-- **안전성**: 여행자 안전 및 보안 수준
-
-### 📎 참고 데이터
-```
-{hotel_data}
-```
-
-### ✅ 품질 보증 요구사항
-- **실시간 검색 기반**: 모든 정보는 검색 도구로 확인된 최신 정보
+- **안전성**: 여행자 안전 및 보안 수준"""),
+    )
+    if hotel_data:
+        builder.add_data('hotel_data', hotel_data, "🏨 숙소 후보 목록 (예산 기준 정렬)")
+    builder.add(
+        pb.block("✅ 품질 보증 요구사항", """- **실시간 검색 기반**: 모든 정보는 검색 도구로 확인된 최신 정보
 - **예약 가능 확인**: 해당 날짜에 실제 예약 가능한 숙소만 추천
 - **가격 정확성**: 모든 비용은 세금 및 추가 요금 포함 총액
-- **출처 신뢰성**: 공식 웹사이트 또는 검증된 예약 플랫폼 정보
-
-### 📎 필수 참고자료 섹션
-응답 마지막에 반드시 다음 형식으로 참고 링크를 포함하세요:
-
-**📚 참고자료 및 출처:**
-- [사이트명1] URL1 - 정보 설명
-- [사이트명2] URL2 - 정보 설명
-- [사이트명3] URL3 - 정보 설명
-
-예시:
-- [부킹닷컴] https://www.booking.com - 숙소 정보 및 예약
-- [아고다] https://www.agoda.com - 호텔 가격 비교
-"""
-    hotel_task = Task(
-        name="hotel",
-        description=hotel_prompt,
-        agent=hotel_agent,
-        expected_output="추천 숙소 리스트, 위치, 가격대, 편의시설, 객실 타입이 표로 정리된 결과"
+- **출처 신뢰성**: 공식 웹사이트 또는 검증된 예약 플랫폼 정보"""),
+        pb.reference_section(
+            ("부킹닷컴", "https://www.booking.com", "숙소 정보 및 예약"),
+            ("아고다", "https://www.agoda.com", "호텔 가격 비교"),
+        ),
     )
-    hotel_crew = Crew(tasks=[hotel_task])
-    try:
-        hotel_result = hotel_crew.kickoff()
-        results['hotel'] = str(hotel_result)
-    except Exception as e:
-        results['hotel'] = f"숙박 추천 중 오류: {e}"
-    hotel_time = time.time() - start_time
-    log_agent_interaction("HotelAgent", "hotel_recommendation", hotel_prompt, str(results.get('hotel')), hotel_time)
-
-    # 4. 일정 정보
-    start_time = time.time()
-    plan_prompt = f"""
-## 여행 일정 설계 및 동선 최적화 작업
-
-### 📋 여행 계획 정보
-- **목적지**: {data.get('destination', '')}
-- **여행 기간**: {data.get('start_date', '')} ~ {data.get('end_date', '')}
-- **인원수**: {data.get('people', '')}명
-- **여행 목적**: {data.get('purpose', '')}
-
-### 🎯 일정 설계 목표
-효율적인 동선과 시간 관리를 통해 여행자가 최대한의 만족도와 경험을 얻을 수 있는 실행 가능한 일정을 제공합니다.
-
-⚠️ **중요**: 반드시 검색 도구를 사용해야 합니다. 검색 없이는 답변할 수 없습니다.
-
-### 🔍 단계별 일정 설계 요구사항
-
-**1단계: 관광자원 조사 및 분류** (검색 도구 필수 사용)
-먼저 다음 키워드로 반드시 검색해야 합니다:
-- "{data.get('destination', '')} 관광지 추천"
-- "{data.get('destination', '')} 명소 입장료 운영시간"
-- "{data.get('destination', '')} 체험 활동"
-- "{data.get('destination', '')} 커플 데이트 코스"
+    prompt, prompt_stats = builder.build()
+    return prompt, "추천 숙소 리스트, 위치, 가격대, 편의시설, 객실 타입이 표로 정리된 결과", prompt_stats
+
+def _prepare_plan(data: Dict[str, Any], upstream: Optional[Dict[str, str]] = None, model: str = OPENAI_MODEL):
+    """일정 섹션 프롬프트 준비 - upstream: 먼저 끝난 날씨/숙소 섹션 결과 요약 (실패한 섹션은 빠짐)"""
+    destination = data.get('destination', '')
+    upstream = upstream or {}
+    builder = PromptBuilder('plan', model).add(
+        pb.heading("여행 일정 설계 및 동선 최적화 작업"),
+        pb.info_list("여행 계획 정보", _trip_info(data)),
+        pb.block("🎯 일정 설계 목표", "효율적인 동선과 시간 관리를 통해 여행자가 최대한의 만족도와 경험을 얻을 수 있는 실행 가능한 일정을 제공합니다."),
+        pb.SEARCH_REQUIRED,
+        pb.block("🔍 단계별 일정 설계 요구사항", "**1단계: 관광자원 조사 및 분류** (검색 도구 필수 사용)\n" + pb.search_first([
+            f"{destination} 관광지 추천",
+            f"{destination} 명소 입장료 운영시간",
+            f"{destination} 체험 활동",
+            f"{destination} 커플 데이트 코스",
+        ]) + """
 - 필수 방문지: 대표 명소, 문화유산, 자연경관
 - 체험 활동: 지역 특색 체험, 액티비티, 워크샵
 - 휴식 공간: 카페, 공원, 전망대, 휴게시설
@@ -407,87 +311,59 @@ def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
 - 예약 필요 시설 및 마감시간 안내
 - 입장료, 주차비 등 예상 비용
 - 준비물 및 주의사항
-- 대안 계획 및 비상 옵션
-
-### 📊 출력 형식 (필수)
-다음 표 형식으로 정확히 작성해주세요:
-
-| 일차 | 시간 | 장소/활동 | 소요시간 | 예상비용 | 이동방법 | 예약필요 | 준비물/팁 |
-|------|------|-----------|----------|----------|----------|----------|-----------|
-| 1일차 | 09:00 | 예: 경복궁 관람 | 2시간 | 3,000원 | 지하철 | X | 편한 신발 |
-| 1일차 | 12:00 | 예: 북촌 한옥마을 | 1시간 | 무료 | 도보 | X | 사진 촬영 |
-
-### 🚀 맞춤화 기준
-- **여행 목적 반영**: {data.get('purpose', '')}에 특화된 활동 우선 배치
+- 대안 계획 및 비상 옵션"""),
+        pb.output_table(
+            ["일차", "시간", "장소/활동", "소요시간", "예상비용", "이동방법", "예약필요", "준비물/팁"],
+            ["1일차", "09:00", "예: 경복궁 관람", "2시간", "3,000원", "지하철", "X", "편한 신발"],
+            ["1일차", "12:00", "예: 북촌 한옥마을", "1시간", "무료", "도보", "X", "사진 촬영"],
+        ),
+        pb.block("🚀 맞춤화 기준", f"""- **여행 목적 반영**: {data.get('purpose', '')}에 특화된 활동 우선 배치
 - **체력 관리**: {data.get('people', '')}명 그룹의 연령대/체력 고려
 - **시간 효율성**: 제한된 기간 내 핵심 경험 극대화
-- **현실 가능성**: 실제 운영시간과 이동시간 정확 반영
-
-### 📅 일별 구성 원칙
-- **오전**: 주요 관광지, 체력 소모가 큰 활동
+- **현실 가능성**: 실제 운영시간과 이동시간 정확 반영"""),
+        pb.block("📅 일별 구성 원칙", """- **오전**: 주요 관광지, 체력 소모가 큰 활동
 - **점심**: 지역 특색 음식 체험, 휴식
 - **오후**: 문화 체험, 쇼핑, 가벼운 관광
 - **저녁**: 야경 명소, 현지 문화 체험
-- **야간**: 휴식 또는 선택적 활동
-
-### ⚠️ 중요 고려사항
-- **계절/날씨 영향**: 실외 활동의 날씨 의존성 고려
+- **야간**: 휴식 또는 선택적 활동"""),
+        pb.block("⚠️ 중요 고려사항", """- **계절/날씨 영향**: 실외 활동의 날씨 의존성 고려
 - **현지 사정**: 지역 축제, 휴무일, 특별 이벤트 확인
 - **예산 관리**: 일정별 예상 비용의 현실적 산정
-- **유연성 확보**: 상황 변화에 대응할 수 있는 대안 제시
-
-### 📎 필수 참고자료 섹션
-응답 마지막에 반드시 다음 형식으로 참고 링크를 포함하세요:
-
-**📚 참고자료 및 출처:**
-- [사이트명1] URL1 - 정보 설명
-- [사이트명2] URL2 - 정보 설명
-- [사이트명3] URL3 - 정보 설명
-
-예시:
-- [한국관광공사] https://visitkorea.or.kr - 관광지 정보 및 운영시간
-- [네이버 지도] https://map.naver.com - 위치 및 교통정보
-"""
-    plan_task = Task(
-        name="plan",
-        description=plan_prompt,
-        agent=plan_agent,
-        expected_output="1일 단위 여행 일정, 각 일정별 소요 시간, 추천 이유, 참고 팁이 표로 정리된 결과"
+- **유연성 확보**: 상황 변화에 대응할 수 있는 대안 제시"""),
+        pb.reference_section(
+            ("한국관광공사", "https://visitkorea.or.kr", "관광지 정보 및 운영시간"),
+            ("네이버 지도", "https://map.naver.com", "위치 및 교통정보"),
+        ),
     )
-    plan_crew = Crew(tasks=[plan_task])
-    try:
-        plan_result = plan_crew.kickoff()
-        results['plan'] = str(plan_result)
-    except Exception as e:
-        results['plan'] = f"일정 설계 중 오류: {e}"
-    plan_time = time.time() - start_time
-    log_agent_interaction("PlanAgent", "itinerary_planning", plan_prompt, str(results.get('plan')), plan_time)
-
-    # 5. 맛집 정보
-    start_time = time.time()
-    real_time_food = get_real_time_food_data(data.get('destination', ''))
-    food_prompt = f"""
-## 맛집 분석 및 미식 여행 큐레이션 작업
-
-### 📋 미식 여행 정보  
-- **목적지**: {data.get('destination', '')}
-- **여행 기간**: {data.get('start_date', '')} ~ {data.get('end_date', '')}
-- **인원수**: {data.get('people', '')}명
-- **여행 목적**: {data.get('purpose', '')}
-
-### 🎯 큐레이션 목표
-여행지의 음식문화를 깊이 있게 체험할 수 있도록 현지 특색과 여행자 취향을 모두 만족하는 맛집을 선별하여 추천합니다.
-
-⚠️ **중요**: 반드시 검색 도구를 사용해야 합니다. 검색 없이는 답변할 수 없습니다.
-
-### 🔍 단계별 맛집 분석 요구사항
-
-**1단계: 지역 음식문화 조사** (검색 도구 필수 사용)
-먼저 다음 키워드로 반드시 검색해야 합니다:
-- "{data.get('destination', '')} 맛집 추천"
-- "{data.get('destination', '')} 유명 음식점"
-- "{data.get('destination', '')} 현지 음식 특산물"
-- "{data.get('destination', '')} 카페 디저트"
+    if upstream:
+        rules = []
+        if 'weather' in upstream:
+            rules.append("- **날씨 반영**: 위 날씨 분석에서 비/폭염/한파가 예상되는 날은 실내 활동 위주로 배치하고, 맑은 날에 실외 명소를 배치")
+            builder.add_data('weather_summary', upstream['weather'], "🌤️ 날씨 분석 요약 (WeatherAgent 결과)")
+        if 'hotel' in upstream:
+            rules.append("- **숙소 연계**: 위 추천 숙소의 위치를 매일 일정의 출발/복귀 지점으로 삼아 동선 설계")
+            builder.add_data('hotel_summary', upstream['hotel'], "🏨 추천 숙소 요약 (HotelAgent 결과)")
+        builder.add(pb.block("🔗 다른 에이전트 결과 반영", "\n".join(rules + [
+            "- 날씨/숙소 정보와 모순되는 일정을 만들지 말 것",
+        ])))
+    prompt, prompt_stats = builder.build()
+    return prompt, "1일 단위 여행 일정, 각 일정별 소요 시간, 추천 이유, 참고 팁이 표로 정리된 결과", prompt_stats
+
+def _prepare_food(data: Dict[str, Any], model: str = OPENAI_MODEL):
+    """맛집 섹션 프롬프트 준비"""
+    destination = data.get('destination', '')
+    real_time_food = get_real_time_food_data(destination)
+    builder = PromptBuilder('food', model).add(
+        pb.heading("맛집 분석 및 미식 여행 큐레이션 작업"),
+        pb.info_list("미식 여행 정보", _trip_info(data)),
+        pb.block("🎯 큐레이션 목표", "여행지의 음식문화를 깊이 있게 체험할 수 있도록 현지 특색과 여행자 취향을 모두 만족하는 맛집을 선별하여 추천합니다."),
+        pb.SEARCH_REQUIRED,
+        pb.block("🔍 단계별 맛집 분석 요구사항", "**1단계: 지역 음식문화 조사** (검색 도구 필수 사용)\n" + pb.search_first([
+            f"{destination} 맛집 추천",
+            f"{destination} 유명 음식점",
+            f"{destination} 현지 음식 특산물",
+            f"{destination} 카페 디저트",
+        ]) + """
 - 지역 특산물 및 향토 요리 분석
 - 계절별 별미 및 제철 재료 활용 메뉴
 - 전통 조리법과 현대적 해석의 퓨전 요리
@@ -509,74 +385,446 @@ def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
 - 최신 리뷰 동향 및 평점 분석
 - 가격 대비 만족도 평가
 - 서비스 품질 및 청결도
-- 특별한 장점이나 주의사항
-
-### 📊 출력 형식 (필수)
-다음 표 형식으로 정확히 작성해주세요:
-
-| 순위 | 맛집명 | 음식종류 | 가격대 | 대표메뉴 | 위치 | 예약방법 | 추천시간 | 특징/팁 |
-|------|--------|----------|--------|----------|------|----------|----------|----------|
-| 1 | 예: 할머니국수 | 한식/면요리 | 5천원-1만원 | 멸치국수 | 시내중심가 | 불필요 | 점심 | 현지인 단골, 대기 필수 |
-
-### 🍽️ 상세 정보 섹션
-각 추천 맛집별로 다음 정보를 포함:
+- 특별한 장점이나 주의사항"""),
+        pb.output_table(
+            ["순위", "맛집명", "음식종류", "가격대", "대표메뉴", "위치", "예약방법", "추천시간", "특징/팁"],
+            ["1", "예: 할머니국수", "한식/면요리", "5천원-1만원", "멸치국수", "시내중심가", "불필요", "점심", "현지인 단골, 대기 필수"],
+        ),
+        pb.block("🍽️ 상세 정보 섹션", """각 추천 맛집별로 다음 정보를 포함:
 - **정확한 주소 및 연락처**
 - **운영시간 및 휴무일**
 - **메뉴 및 가격 정보**
 - **예약 방법 (전화/앱/웹사이트)**
 - **특별 메뉴나 할인 정보**
-- **주차 및 교통편 안내**
-
-### 🎯 맞춤형 큐레이션 기준
-- **그룹 특성**: {data.get('people', '')}명 그룹에 적합한 좌석/분위기
+- **주차 및 교통편 안내**"""),
+        pb.block("🎯 맞춤형 큐레이션 기준", f"""- **그룹 특성**: {data.get('people', '')}명 그룹에 적합한 좌석/분위기
 - **여행 목적**: {data.get('purpose', '')}에 어울리는 다이닝 경험
 - **일정 연계**: 관광 동선과 연계한 효율적 맛집 배치
-- **다양성**: 다양한 맛과 경험을 위한 균형 잡힌 선택
-
-### 📎 참고 데이터
-```
-{real_time_food}
-```
-
-### ✅ 품질 보증 요구사항
-- **실시간 검색 기반**: 모든 정보는 검색 도구로 확인된 최신 정보
+- **다양성**: 다양한 맛과 경험을 위한 균형 잡힌 선택"""),
+    )
+    builder.add_data('real_time_food', real_time_food)
+    builder.add(
+        pb.block("✅ 품질 보증 요구사항", """- **실시간 검색 기반**: 모든 정보는 검색 도구로 확인된 최신 정보
 - **운영 상태 확인**: 현재 운영 중이며 예약 가능한 맛집만 추천
 - **정보 정확성**: 메뉴, 가격, 운영시간 등 모든 정보의 정확성 보장
-- **출처 신뢰성**: 공식 홈페이지, SNS, 신뢰할 수 있는 리뷰 플랫폼 기반
-
-### 📎 필수 참고자료 섹션
-응답 마지막에 반드시 다음 형식으로 참고 링크를 포함하세요:
-
-**📚 참고자료 및 출처:**
-- [사이트명1] URL1 - 정보 설명
-- [사이트명2] URL2 - 정보 설명
-- [사이트명3] URL3 - 정보 설명
-
-예시:
-- [망고플레이트] https://www.mangoplate.com - 맛집 리뷰 및 평점
-- [카카오맵] https://map.kakao.com - 맛집 위치 및 정보
-
-### 🌟 특별 고려사항
-- **식이 제한**: 할랄, 비건, 알레르기 대응 가능 맛집 별도 표시
+- **출처 신뢰성**: 공식 홈페이지, SNS, 신뢰할 수 있는 리뷰 플랫폼 기반"""),
+        pb.reference_section(
+            ("망고플레이트", "https://www.mangoplate.com", "맛집 리뷰 및 평점"),
+            ("카카오맵", "https://map.kakao.com", "맛집 위치 및 정보"),
+        ),
+        pb.block("🌟 특별 고려사항", """- **식이 제한**: 할랄, 비건, 알레르기 대응 가능 맛집 별도 표시
 - **현지 에티켓**: 주문 방법, 팁 문화, 테이블 매너 등 안내
 - **계절성**: 제철 메뉴나 계절 한정 특별 요리 정보
-- **예산 관리**: 식사별 예상 비용 및 전체 예산 내 배분
-"""
-    food_task = Task(
-        name="food",
-        description=food_prompt,
-        agent=food_agent,
-        expected_output="아침/점심/저녁별 추천 맛집, 위치, 가격대, 대표 메뉴, 평점이 표로 정리된 결과"
+- **예산 관리**: 식사별 예상 비용 및 전체 예산 내 배분"""),
+    )
+    prompt, prompt_stats = builder.build()
+    return prompt, "아침/점심/저녁별 추천 맛집, 위치, 가격대, 대표 메뉴, 평점이 표로 정리된 결과", prompt_stats
+
+# 섹션별 실행 사양 (결과 dict의 키 순서도 이 순서를 따름)
+# - key_fields: 해당 섹션 프롬프트가 실제로 사용하는 요청 필드 (섹션 캐시 키 구성)
+# - cache_ttl: 섹션 결과 캐시 유효 시간(초), SECTION_CACHE_TTL_<SECTION> 환경 변수로 변경 가능
+# - depends_on: 결과(요약)를 입력으로 받는 선행 섹션 - 선행 섹션이 모두 끝나면(실패/시간 초과 포함) 바로 시작
+# - required_columns: 결과 표에 반드시 있어야 하는 열 - 없으면 상위 모델로 재실행 (model_router.py 참고)
+# - render(data, prepare_kwargs): LLM 없이 결과를 바로 만드는 함수 - None을 반환하면 LLM 실행하며,
+#   그동안 조회한 데이터는 prepare_kwargs로 prepare에 넘겨 다시 조회하지 않음 (weather_renderer.py 참고)
+# - digest_columns: 후속 섹션 캐시 키에 반영하는 결과 표의 열 - 다른 열(가격 등)만 바뀌면 후속 섹션은 캐시 사용
+SECTION_SPECS = {
+    'weather': {
+        'prepare': _prepare_weather, 'agent_name': 'WeatherAgent', 'task_name': 'weather_analysis', 'error_label': '날씨 분석',
+        'key_fields': ('destination', 'start_date', 'end_date', 'people', 'purpose'), 'cache_ttl': 3600,
+        'required_columns': ('날짜', '날씨'),
+        'digest_columns': ('날짜', '날씨', '강수확률'),
+        'render': _render_weather,
+    },
+    'transport': {
+        'prepare': _prepare_transport, 'agent_name': 'TransportAgent', 'task_name': 'transport_recommendation', 'error_label': '교통편 추천',
+        'key_fields': ('departure', 'destination', 'start_date', 'end_date', 'people', 'budget', 'purpose'), 'cache_ttl': 86400,
+        'required_columns': ('교통수단',),
+    },
+    'hotel': {
+        'prepare': _prepare_hotel, 'agent_name': 'HotelAgent', 'task_name': 'hotel_recommendation', 'error_label': '숙박 추천',
+        'key_fields': ('destination', 'start_date', 'end_date', 'people', 'budget', 'purpose'), 'cache_ttl': 21600,
+        'required_columns': ('숙소명',),
+        'digest_columns': ('숙소명', '위치'),
+    },
+    'plan': {
+        'prepare': _prepare_plan, 'agent_name': 'PlanAgent', 'task_name': 'itinerary_planning', 'error_label': '일정 설계',
+        'key_fields': ('destination', 'start_date', 'end_date', 'people', 'purpose'), 'cache_ttl': 86400,
+        'required_columns': ('일차', '시간'),
+        'depends_on': ('weather', 'hotel'),
+    },
+    'food': {
+        'prepare': _prepare_food, 'agent_name': 'FoodAgent', 'task_name': 'restaurant_recommendation', 'error_label': '맛집 추천',
+        'key_fields': ('destination', 'start_date', 'end_date', 'people', 'purpose'), 'cache_ttl': 259200,
+        'required_columns': ('맛집명',),
+    },
+}
+for _section, _spec in SECTION_SPECS.items():
+    _spec['cache_ttl'] = float(os.getenv(f'SECTION_CACHE_TTL_{_section.upper()}', str(_spec['cache_ttl'])))
+
+# 섹션별 결과 캐시 - 일부 필드만 바뀐 요청은 해당 필드를 사용하는 섹션만 다시 실행
+section_cache = make_cache(
+    'section',
+    backend=os.getenv('SECTION_CACHE_BACKEND', 'memory'),
+    max_entries=int(os.getenv('SECTION_CACHE_MAX_ENTRIES', '1024')),
+)
+
+def section_cache_key(section: str, data: Dict[str, Any], upstream: Optional[Dict[str, str]] = None) -> str:
+    fields = canonicalize_plan_request(data, SECTION_SPECS[section]['key_fields'])
+    fields['model'] = section_model(section, data)
+    if SECTION_SPECS[section].get('render'):
+        # 규칙 표 / LLM / 규칙+LLM 결과가 서로 다르므로 렌더링 방식 포함
+        fields['render_mode'] = WEATHER_RENDER_MODE
+    if SECTION_SPECS[section].get('depends_on'):
+        # 선행 섹션 결과 중 후속 섹션 일정에 영향을 주는 열만 키에 포함
+        # (예산만 바뀌어 숙소 가격이 달라져도 같은 숙소/위치면 일정은 다시 만들지 않음)
+        fields['upstream'] = {name: upstream_digest(name, text) for name, text in sorted((upstream or {}).items())}
+    return cache_key({'section': section, **fields})
+
+def upstream_digest(section: str, text: str) -> str:
+    """선행 섹션 결과의 digest_columns 열 값만으로 만든 해시 (표가 없으면 정규화한 전체 텍스트의 해시)"""
+    columns = SECTION_SPECS[section].get('digest_columns', ())
+    rows = [
+        [cell.strip() for cell in line.strip().strip('|').split('|')]
+        for line in str(text or '').splitlines()
+        if line.strip().startswith('|') and not set(line.strip()) <= set('|-: ')
+    ]
+    for i, header in enumerate(rows):
+        indexes = [next((j for j, cell in enumerate(header) if column in cell), None) for column in columns]
+        if columns and None not in indexes:
+            values = [[normalize_text(row[j]) if j < len(row) else '' for j in indexes] for row in rows[i + 1:]]
+            return cache_key(values)
+    return cache_key(normalize_text(text))
+
+# 후속 섹션에 넘기는 선행 섹션 결과 요약의 최대 토큰 수
+CREW_UPSTREAM_TOKENS = int(os.getenv('CREW_UPSTREAM_TOKENS', '350'))
+
+def condense_section_output(text: str, model: str = OPENAI_MODEL) -> str:
+    """선행 섹션 결과를 후속 섹션 입력용으로 축소 - 마크다운 표가 있으면 표 행만 남김 (토큰 수는 model 기준)"""
+    lines = [line.strip() for line in str(text or '').splitlines()]
+    table = [line for line in lines if line.startswith('|') and not set(line) <= set('|-: ')]
+    condensed, _ = pb.fit_to_budget("\n".join(table) if table else text, CREW_UPSTREAM_TOKENS, model)
+    return condensed
+
+def _upstream_inputs(section: str, results: Dict[str, Tuple[str, bool]], data: Dict[str, Any]) -> Dict[str, str]:
+    """section이 의존하는 선행 섹션 중 성공한 결과의 요약 (section에서 사용할 모델의 토크나이저 기준)"""
+    model = section_model(section, data)
+    return {
+        dep: condense_section_output(results[dep][0], model)
+        for dep in SECTION_SPECS[section].get('depends_on', ())
+        if dep in results and results[dep][1]
+    }
+
+# 병렬 실행 설정
+CREW_PARALLEL = os.getenv('CREW_PARALLEL', '1') == '1'
+CREW_MAX_WORKERS = int(os.getenv('CREW_MAX_WORKERS', str(len(SECTION_SPECS))))
+CREW_AGENT_TIMEOUT = float(os.getenv('CREW_AGENT_TIMEOUT', '180'))
+CREW_TOTAL_TIMEOUT = float(os.getenv('CREW_TOTAL_TIMEOUT', '280'))
+
+def _token_usage(output: Any) -> Dict[str, int]:
+    """CrewOutput.token_usage에서 프롬프트/완료 토큰 수 추출"""
+    usage = getattr(output, 'token_usage', None)
+    if usage is None:
+        return {}
+    return {name: getattr(usage, name, 0) for name in ('prompt_tokens', 'completion_tokens', 'total_tokens')}
+
+def _kickoff(section: str, prompt: str, expected_output: str, model: str, usages: list) -> Any:
+    """model을 쓰는 섹션 에이전트로 Crew 1회 실행 - 실행 예산 사용량은 usages에 추가
+
+    LLM 턴과 도구 호출은 agent_run 블록 안의 호출이 현재 실행(컨텍스트 변수)에 기록한다.
+    """
+    task = registry.new_task(
+        name=section,
+        description=prompt,
+        agent=registry.new_agent(section, model),
+        expected_output=expected_output
     )
-    food_crew = Crew(tasks=[food_task])
+    with agent_run(section) as run:
+        crew = registry.new_crew(tasks=[task])
+        try:
+            return crew.kickoff()
+        finally:
+            usages.append(run.summary())
+
+def _merge_usage(usages: list) -> Optional[Dict[str, Any]]:
+    """재실행까지 포함한 실행 예산 사용량 합계"""
+    if not usages:
+        return None
+    merged = dict(usages[-1])
+    for name in ('turns', 'tool_calls', 'blocked_tool_calls'):
+        merged[name] = sum(usage[name] for usage in usages)
+    merged['budget_exhausted'] = any(usage['budget_exhausted'] for usage in usages)
+    return merged
+
+def run_section(section: str, data: Dict[str, Any],
+                upstream: Optional[Dict[str, str]] = None) -> Tuple[str, float, bool, bool]:
+    """단일 섹션(프롬프트 준비 + Crew 실행)을 수행하고 (결과, 소요시간, 성공 여부, 출력 검증 통과 여부)를 반환
+
+    검증에 실패한 결과(필수 표 누락 등)도 성공으로 반환하지만 캐시하지 않는다.
+    """
+    with trace_span('section', agent=section) as span:
+        if upstream is not None:
+            span['upstream'] = sorted(upstream)
+        result, execution_time, ok, valid = _run_section(section, data, upstream, span)
+        span['ok'] = ok
+    metrics.section_duration.observe(execution_time, section=section, cached=str(span['cached']).lower())
+    metrics.sections_total.inc(section=section, status='ok' if ok else 'error')
+    return result, execution_time, ok, valid
+
+def _run_section(section: str, data: Dict[str, Any], upstream: Optional[Dict[str, str]],
+                 span: Dict[str, Any]) -> Tuple[str, float, bool, bool]:
+    spec = SECTION_SPECS[section]
+    start_time = time.time()
+    key = section_cache_key(section, data, upstream) if section_cache is not None else None
+    cached = section_cache.get(key) if key else None
+    span['cached'] = cached is not None
+    if cached is not None:
+        crew_logger.info(f"⚡ {spec['agent_name']} 캐시된 결과 사용")
+        return cached, time.time() - start_time, True, True
+
+    rendered = None
+    prepare_kwargs: Dict[str, Any] = {}
+    if spec.get('render'):
+        try:
+            rendered = spec['render'](data, prepare_kwargs)
+        except Exception as e:
+            crew_logger.warning(f"⚠️ {spec['agent_name']} 규칙 기반 생성 실패, LLM으로 대체: {e}")
+    if rendered is not None:
+        execution_time = time.time() - start_time
+        span['model'] = 'rules'
+        crew_logger.info(f"📐 {spec['agent_name']} 규칙 기반 생성 ({execution_time * 1000:.0f}ms, LLM 호출 없음)")
+        log_agent_interaction(spec['agent_name'], spec['task_name'], '(규칙 기반 생성)', rendered, execution_time)
+        if key:
+            section_cache.set(key, rendered, ttl=spec['cache_ttl'])
+        return rendered, execution_time, True, True
+
+    prompt = ''
+    usages = []
+    valid = False
     try:
-        food_result = food_crew.kickoff()
-        results['food'] = str(food_result)
+        # 프롬프트 토큰 예산은 실제로 실행할 모델의 토크나이저로 계산
+        model = section_model(section, data)
+        prepare_args = (data, upstream) if spec.get('depends_on') else (data,)
+        prompt, expected_output, prompt_stats = spec['prepare'](*prepare_args, model=model, **prepare_kwargs)
+        span['prepare_time'] = round(time.time() - start_time, 3)
+        span['prompt_tokens_est'] = prompt_stats['prompt_tokens']
+        truncated = f", 잘린 데이터: {', '.join(prompt_stats['truncated'])}" if prompt_stats['truncated'] else ''
+        crew_logger.info(
+            f"📏 {spec['agent_name']} 프롬프트 {prompt_stats['prompt_tokens']}토큰 "
+            f"(고정 {prompt_stats['fixed_tokens']}, 데이터 {sum(prompt_stats['data_tokens'].values())}, "
+            f"예산 {prompt_stats['budget']}{truncated})"
+        )
+        span['model'] = model
+        output = _kickoff(section, prompt, expected_output, model, usages)
+        result = str(output)
+        span.update(_token_usage(output))
+        problem = validate_output(result, spec['required_columns'])
+        stronger = escalation_model(model) if problem else None
+        if stronger:
+            # 빠른 모델 출력이 형식을 지키지 않으면 상위 모델로 한 번 더 실행
+            crew_logger.warning(f"⬆️ {spec['agent_name']} 출력 검증 실패({problem}) - {model} → {stronger} 재실행")
+            metrics.model_escalations.inc(section=section, from_model=model, to_model=stronger)
+            span.update({'escalated_from': model, 'model': stronger, 'escalation_reason': problem})
+            output = _kickoff(section, prompt, expected_output, stronger, usages)
+            result = str(output)
+            for name, count in _token_usage(output).items():
+                span[name] = span.get(name, 0) + count
+            problem = validate_output(result, spec['required_columns'])
+        # 형식이 맞지 않는 결과도 그대로 반환하되 캐시하지 않음
+        valid = problem is None
+        if problem:
+            span['validation_error'] = problem
+        ok = True
     except Exception as e:
-        results['food'] = f"맛집 추천 중 오류: {e}"
-    food_time = time.time() - start_time
-    log_agent_interaction("FoodAgent", "restaurant_recommendation", food_prompt, str(results.get('food')), food_time)
+        result = f"{spec['error_label']} 중 오류: {e}"
+        ok = False
+    execution_time = time.time() - start_time
+    usage = _merge_usage(usages)
+    if usage:
+        span.update({key_: usage[key_] for key_ in ('turns', 'tool_calls', 'blocked_tool_calls')})
+        exhausted = " - 예산 소진, 수집된 정보로 답변" if usage['budget_exhausted'] else ''
+        crew_logger.info(
+            f"🔁 {spec['agent_name']} LLM 턴 {usage['turns']}회, 도구 호출 {usage['tool_calls']}회 "
+            f"(차단 {usage['blocked_tool_calls']}회){exhausted}"
+        )
+    log_agent_interaction(spec['agent_name'], spec['task_name'], prompt, result, execution_time, usage, failed=not ok)
+    if key and ok and valid:
+        section_cache.set(key, result, ttl=spec['cache_ttl'])
+    return result, execution_time, ok, valid
+
+def _iter_sections_sequential(data: Dict[str, Any]) -> Iterator[Tuple[str, str, float, bool, bool]]:
+    # SECTION_SPECS 순서가 의존 관계 순서(선행 섹션이 먼저)를 따름
+    results: Dict[str, Tuple[str, bool]] = {}
+    for section in SECTION_SPECS:
+        upstream = _upstream_inputs(section, results, data) if SECTION_SPECS[section].get('depends_on') else None
+        result, execution_time, ok, valid = run_section(section, data, upstream)
+        results[section] = (result, ok)
+        yield section, result, execution_time, ok, valid
+
+def _iter_sections_parallel(data: Dict[str, Any]) -> Iterator[Tuple[str, str, float, bool, bool]]:
+    """섹션 의존 관계(depends_on)에 따라 스레드 풀에서 섹션들을 실행하고 끝나는 순서대로
+    (섹션, 결과, 소요시간, 성공 여부, 검증 통과 여부)를 반환
+
+    선행 섹션이 없는 섹션은 바로 동시에 시작하고, 나머지는 선행 섹션이 모두 끝나는 즉시
+    성공한 선행 결과의 요약을 받아 시작한다 (전체 지연 = 가장 긴 의존 경로).
+    에이전트별 타임아웃(CREW_AGENT_TIMEOUT)은 섹션이 실제로 시작된 시점부터,
+    전체 데드라인(CREW_TOTAL_TIMEOUT)은 요청 시작 시점부터 계산한다.
+    시간 초과된 섹션은 오류 메시지로 채워지며 결과 dict의 형태는 그대로 유지된다.
+    """
+    request_start = time.time()
+    deadline = request_start + CREW_TOTAL_TIMEOUT
+    started: Dict[str, float] = {}
+    results: Dict[str, Tuple[str, bool]] = {}
+    pending: Dict[Any, str] = {}
+    waiting = list(SECTION_SPECS)
+    expired: List[str] = []
+
+    def worker(section, upstream):
+        started[section] = time.time()
+        return run_section(section, data, upstream)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, CREW_MAX_WORKERS), thread_name_prefix='crew')
+
+    def submit_ready():
+        for section in list(waiting):
+            depends_on = SECTION_SPECS[section].get('depends_on', ())
+            if not all(dep in results for dep in depends_on):
+                continue
+            waiting.remove(section)
+            if time.time() >= deadline:
+                # 전체 데드라인이 지났으면 스레드에 넘기지 않고 바로 시간 초과로 처리
+                expired.append(section)
+                continue
+            upstream = _upstream_inputs(section, results, data) if depends_on else None
+            # 섹션 스레드에서도 같은 trace_id로 기록되도록 현재 컨텍스트를 복사해 실행
+            future = executor.submit(contextvars.copy_context().run, worker, section, upstream)
+            pending[future] = section
+
+    def finish(section, result, execution_time, ok, valid):
+        results[section] = (result, ok)
+        submit_ready()
+        return section, result, execution_time, ok, valid
+
+    def time_out(section, limit, elapsed):
+        label = SECTION_SPECS[section]['error_label']
+        crew_logger.warning(f"⏰ {SECTION_SPECS[section]['agent_name']} 시간 초과 ({limit:.0f}초)")
+        return finish(section, f"{label} 중 오류: 시간 초과 ({limit:.0f}초)", elapsed, False, False)
+
+    submit_ready()
+    try:
+        while pending or expired:
+            while expired:
+                yield time_out(expired.pop(0), CREW_TOTAL_TIMEOUT, time.time() - request_start)
+            if not pending:
+                break
+            now = time.time()
+            remaining = [deadline - now]
+            remaining += [started[s] + CREW_AGENT_TIMEOUT - now for s in pending.values() if s in started]
+            done, _ = wait(pending, timeout=max(0.0, min(remaining)), return_when=FIRST_COMPLETED)
+            for future in done:
+                section = pending.pop(future)
+                yield finish(section, *future.result())
+
+            now = time.time()
+            for future, section in list(pending.items()):
+                section_start = started.get(section)
+                agent_expired = section_start is not None and now >= section_start + CREW_AGENT_TIMEOUT
+                if now < deadline and not agent_expired:
+                    continue
+                pending.pop(future)
+                future.cancel()
+                limit = CREW_AGENT_TIMEOUT if agent_expired else CREW_TOTAL_TIMEOUT
+                yield time_out(section, limit, now - (section_start or request_start))
+    finally:
+        # 시간 초과된 작업을 기다리지 않고 반환 (남은 스레드는 백그라운드에서 종료됨)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# 전체 여행 계획 결과 캐시 (정규화된 요청 기준)
+PLAN_CACHE_TTL = float(os.getenv('PLAN_CACHE_TTL', '3600'))
+plan_cache = make_cache(
+    'plan',
+    backend=os.getenv('PLAN_CACHE_BACKEND', 'memory'),
+    max_entries=int(os.getenv('PLAN_CACHE_MAX_ENTRIES', '256')),
+    default_ttl=PLAN_CACHE_TTL,
+)
+
+def iter_travel_plan_events(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """여행 계획 생성 과정을 이벤트(dict) 스트림으로 반환
+
+    - start: 실행할 섹션 목록
+    - weather/transport/hotel/plan/food: 해당 섹션이 끝나는 즉시 결과(content)와 소요시간(elapsed)
+    - progress: 완료된 섹션 수와 경과시간
+    - done: 섹션별 소요시간(timings), 총 소요시간(total_time), 캐시 사용 여부(cached)
 
-    total_time = weather_time + transport_time + hotel_time + plan_time + food_time
+    정규화된 요청이 같은 결과가 캐시에 있으면 Crew를 실행하지 않고 바로 반환한다.
+    모든 섹션이 성공하고 출력 검증을 통과한 결과만 캐시에 저장한다.
+    start 이벤트의 trace_id로 추적 로그(gta_traces.jsonl)의 섹션별 기록을 찾을 수 있다.
+    """
+    span: Dict[str, Any] = {}
+    metrics.plans_in_flight.inc()
+    try:
+        with trace_context(destination=str(data.get('destination', '')).strip()) as trace_id:
+            with trace_span('plan') as span:
+                yield from _iter_plan_events(data, trace_id, span)
+    finally:
+        metrics.plans_in_flight.dec()
+        if 'duration' in span:
+            metrics.plan_duration.observe(span['duration'], cached=str(bool(span.get('cached'))).lower())
+            metrics.plans_total.inc(status='ok' if span.get('ok') else 'error')
+
+def _iter_plan_events(data: Dict[str, Any], trace_id: str, span: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    crew_logger.info(f"🚀 여행 계획 생성 시작 - 목적지: {data.get('destination', '')}")
+    start_time = time.time()
+    sections = list(SECTION_SPECS)
+    yield {'event': 'start', 'sections': sections, 'trace_id': trace_id}
+
+    key = plan_cache_key(data) if plan_cache is not None else None
+    cached = plan_cache.get(key) if key else None
+    span.update({'cached': cached is not None, 'ok': True})
+    if cached is not None:
+        crew_logger.info(f"⚡ 캐시된 여행 계획 반환 - 목적지: {data.get('destination', '')}")
+        for i, section in enumerate(sections, 1):
+            yield {'event': section, 'content': cached[section], 'elapsed': 0.0, 'cached': True}
+            yield {'event': 'progress', 'completed': i, 'total': len(sections), 'elapsed': round(time.time() - start_time, 3)}
+        yield {'event': 'done', 'timings': {}, 'total_time': round(time.time() - start_time, 3), 'cached': True}
+        return
+
+    iter_sections = _iter_sections_parallel if CREW_PARALLEL else _iter_sections_sequential
+    timings = {}
+    results = {}
+    all_ok = True
+    all_valid = True
+    for section, result, execution_time, ok, valid in iter_sections(data):
+        timings[section] = round(execution_time, 3)
+        results[section] = result
+        all_ok = all_ok and ok
+        all_valid = all_valid and valid
+        yield {'event': section, 'content': result, 'elapsed': round(execution_time, 3)}
+        yield {
+            'event': 'progress',
+            'completed': len(timings),
+            'total': len(sections),
+            'elapsed': round(time.time() - start_time, 3),
+        }
+
+    span['ok'] = all_ok and len(results) == len(sections)
+    # 검증에 실패한 섹션이 있으면 다음 요청에서 다시 생성(및 상위 모델 재실행)하도록 캐시하지 않음
+    if key and span['ok'] and all_valid:
+        plan_cache.set(key, results)
+
+    total_time = time.time() - start_time
     crew_logger.info(f"✅ 모든 에이전트 작업 완료 - 총 소요시간: {total_time:.2f}초")
-    return results
+    yield {'event': 'done', 'timings': timings, 'total_time': round(total_time, 3), 'cached': False}
+
+def collect_plan_sections(events: Iterator[Dict[str, Any]]) -> Dict[str, str]:
+    """이벤트 스트림에서 섹션 결과만 모아 섹션 순서대로 반환 - error 이벤트는 예외로 변환"""
+    completed = {}
+    for event in events:
+        if event['event'] == 'error':
+            raise RuntimeError(event.get('error', '여행 계획 생성 실패'))
+        if event['event'] in SECTION_SPECS:
+            completed[event['event']] = event['content']
+    return {section: completed[section] for section in SECTION_SPECS if section in completed}
+
+def get_travel_plan_with_crew(data: Dict[str, Any]) -> Dict[str, str]:
+    return collect_plan_sections(iter_travel_plan_events(data))
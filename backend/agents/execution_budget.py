@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+# 에이전트 1회 실행 예산 - <NAME>_<SECTION> 환경 변수로 섹션별 지정 (예: AGENT_MAX_TOOL_CALLS_TRANSPORT)
+# - AGENT_MAX_ITER: LLM 추론 턴 최대 횟수 (crewai max_iter, 초과 시 crewai가 최종 답변을 강제)
+# - AGENT_MAX_TOOL_CALLS: 검색 도구 호출 최대 횟수 (초과 호출은 실행하지 않고 답변 작성을 안내)
+# - AGENT_TIME_BUDGET: 이 시간(초)이 지나면 도구 호출을 막아 지금까지의 정보로 답하게 함
+# - AGENT_MAX_RPM: 에이전트의 분당 LLM 요청 수 제한 (0이면 제한 없음)
+_DEFAULTS = {
+    'max_iter': int(os.getenv('AGENT_MAX_ITER', '5')),
+    'max_tool_calls': int(os.getenv('AGENT_MAX_TOOL_CALLS', '4')),
+    'time_budget': float(os.getenv('AGENT_TIME_BUDGET', '120')),
+    'max_rpm': int(os.getenv('AGENT_MAX_RPM', '0')),
+}
+_ENV_NAMES = {
+    'max_iter': 'AGENT_MAX_ITER',
+    'max_tool_calls': 'AGENT_MAX_TOOL_CALLS',
+    'time_budget': 'AGENT_TIME_BUDGET',
+    'max_rpm': 'AGENT_MAX_RPM',
+}
+
+
+def agent_limits(section: str) -> Dict[str, Any]:
+    """섹션별 실행 예산 {'max_iter', 'max_tool_calls', 'time_budget', 'max_rpm'}"""
+    limits = {}
+    for name, default in _DEFAULTS.items():
+        raw = os.getenv(f'{_ENV_NAMES[name]}_{section.upper()}')
+        limits[name] = type(default)(raw) if raw else default
+    return limits
+
+
+def agent_kwargs(section: str) -> Dict[str, Any]:
+    """crewai Agent 생성 인자로 넘길 실행 제한"""
+    limits = agent_limits(section)
+    kwargs = {'max_iter': limits['max_iter']}
+    if limits['max_rpm']:
+        kwargs['max_rpm'] = limits['max_rpm']
+    return kwargs
+
+
+class AgentRun:
+    """에이전트 1회 실행의 LLM 턴/도구 호출 횟수를 세고 도구 호출 예산을 적용"""
+
+    def __init__(self, section: str):
+        self.section = section
+        self.limits = agent_limits(section)
+        self.started = time.time()
+        self.turns = 0
+        self.tool_calls = 0
+        self.blocked_tool_calls = 0
+        self._lock = threading.Lock()
+
+    def on_llm_call(self):
+        """이 실행 안에서 LLM 요청을 보낼 때마다 호출됨 (llm_factory의 LLM이 기록)
+
+        crewai step_callback은 도구 없이 바로 최종 답변한 턴에는 호출되지 않아 턴 수를 LLM 요청에서 센다.
+        """
+        with self._lock:
+            self.turns += 1
+
+    def acquire_tool_call(self) -> Optional[str]:
+        """도구 호출을 허용하면 None, 예산을 넘었으면 에이전트에게 돌려줄 안내 문구 반환"""
+        with self._lock:
+            if time.time() - self.started > self.limits['time_budget']:
+                self.blocked_tool_calls += 1
+                return (f"⚠️ 실행 시간 예산({self.limits['time_budget']:.0f}초)을 초과했습니다. "
+                        "더 이상 검색하지 말고 지금까지 수집한 정보로 최종 답변을 작성하세요.")
+            if self.tool_calls >= self.limits['max_tool_calls']:
+                self.blocked_tool_calls += 1
+                return (f"⚠️ 검색 한도({self.limits['max_tool_calls']}회)에 도달했습니다. "
+                        "더 이상 검색하지 말고 지금까지 수집한 정보로 최종 답변을 작성하세요.")
+            self.tool_calls += 1
+            return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'section': self.section,
+            'turns': self.turns,
+            'tool_calls': self.tool_calls,
+            'blocked_tool_calls': self.blocked_tool_calls,
+            'elapsed': round(time.time() - self.started, 3),
+            'budget_exhausted': self.blocked_tool_calls > 0 or self.turns >= self.limits['max_iter'],
+        }
+
+
+_current_run: ContextVar[Optional[AgentRun]] = ContextVar('agent_run', default=None)
+
+
+def current_run() -> Optional[AgentRun]:
+    return _current_run.get()
+
+
+@contextmanager
+def agent_run(section: str) -> Iterator[AgentRun]:
+    """with 블록 안에서 실행되는 도구 호출이 이 실행의 예산을 사용하도록 설정"""
+    run = AgentRun(section)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
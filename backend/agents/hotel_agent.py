@@ -1,79 +1,161 @@
-from crewai import Agent
+import math
 import os
-from crewai_tools import SerperDevTool
-from langchain_openai import ChatOpenAI
-from backend.utils.crew_logger import crew_logger
-
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-SERPER_API_KEY = os.getenv('SERPER_API_KEY')
-
-if SERPER_API_KEY:
-    os.environ["SERPER_API_KEY"] = SERPER_API_KEY
-
-search_tool = SerperDevTool()
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-llm = ChatOpenAI(model=OPENAI_MODEL, api_key=OPENAI_API_KEY)
-
-hotel_agent = Agent(
-    name="HotelAgent",
-    role="여행 숙박시설 분석 및 예약 최적화 전문가",
-    goal="""
-    여행 목적지의 숙박시설을 체계적으로 분석하여 다음을 제공:
-    1. 숙박 유형별 분석 (호텔, 리조트, 펜션, 게스트하우스, 에어비앤비 등)
-    2. 위치별 접근성 및 교통편의성 평가
-    3. 예산 대비 가성비 최적화 분석
-    4. 편의시설 및 서비스 품질 비교
-    5. 실시간 예약 가능성 및 할인 혜택 조사
-    6. 리뷰 기반 만족도 분석 및 주의사항 제공
-    
-    **필수 검색 도구 사용**: 모든 숙소 정보는 실시간 검색을 통해 수집하며, 예약 가능성과 정확한 요금을 확인
-    """,
-    backstory="""
-    당신은 12년 경력의 호텔리어 출신 여행 숙박 컨설턴트입니다.
-    
-    **전문 분야:**
-    - 숙박업계 동향: 호텔체인별 특성, 등급별 서비스 수준, 성수기/비수기 요금정책
-    - 지역별 숙박특성: 관광지별 숙소 분포, 교통 접근성, 주변 편의시설
-    - 예약 시스템: 온라인 예약플랫폼별 특징, 할인 혜택, 취소정책
-    - 고객 만족도: 리뷰 분석, 재방문율, 서비스 품질 평가
-    
-    **분석 방법론:**
-    1. 실시간 검색을 통한 가격 및 예약 가능성 확인
-    2. 다양한 예약 플랫폼 간 가격 비교 분석
-    3. 최근 리뷰 동향 및 평점 변화 추적
-    4. 숨은 비용(세금, 서비스료 등) 포함 총 비용 계산
-    
-    **추천 기준:**
-    - 안전성: 시설 안전도, 주변 치안, 비상시설 완비도
-    - 편의성: 체크인/아웃 편의, 짐보관 서비스, 컨시어지 서비스
-    - 가성비: 동일 조건 대비 최적 가격, 포함 서비스 범위
-    - 접근성: 대중교통 연결성, 관광지 근접성, 공항/역 거리
-    """,
-    tools=[search_tool],
-    llm=llm,
-    verbose=True
-)
+import re
+from datetime import date
+from backend.agents.execution_budget import agent_kwargs
+from backend.agents.llm_factory import OPENAI_MODEL, get_llm
+from backend.agents.registry import shared_search_tool
+from backend.utils.cache import normalize_date, normalize_text
+from backend.utils.crew_logger import crew_logger, log_function_execution
+from backend.utils.search_service import get_search_service
 
+def build_hotel_agent(model: str = OPENAI_MODEL):
+    """숙소 에이전트 생성 - backend.agents.registry.new_agent()가 실행마다 호출"""
+    from crewai import Agent
+    return Agent(
+        name="HotelAgent",
+        role="여행 숙박시설 분석 및 예약 최적화 전문가",
+        goal="""
+        여행 목적지의 숙박시설을 체계적으로 분석하여 다음을 제공:
+        1. 숙박 유형별 분석 (호텔, 리조트, 펜션, 게스트하우스, 에어비앤비 등)
+        2. 위치별 접근성 및 교통편의성 평가
+        3. 예산 대비 가성비 최적화 분석
+        4. 편의시설 및 서비스 품질 비교
+        5. 실시간 예약 가능성 및 할인 혜택 조사
+        6. 리뷰 기반 만족도 분석 및 주의사항 제공
+        
+        **필수 검색 도구 사용**: 모든 숙소 정보는 실시간 검색을 통해 수집하며, 예약 가능성과 정확한 요금을 확인
+        """,
+        backstory="""
+        당신은 12년 경력의 호텔리어 출신 여행 숙박 컨설턴트입니다.
+        
+        **전문 분야:**
+        - 숙박업계 동향: 호텔체인별 특성, 등급별 서비스 수준, 성수기/비수기 요금정책
+        - 지역별 숙박특성: 관광지별 숙소 분포, 교통 접근성, 주변 편의시설
+        - 예약 시스템: 온라인 예약플랫폼별 특징, 할인 혜택, 취소정책
+        - 고객 만족도: 리뷰 분석, 재방문율, 서비스 품질 평가
+        
+        **분석 방법론:**
+        1. 실시간 검색을 통한 가격 및 예약 가능성 확인
+        2. 다양한 예약 플랫폼 간 가격 비교 분석
+        3. 최근 리뷰 동향 및 평점 변화 추적
+        4. 숨은 비용(세금, 서비스료 등) 포함 총 비용 계산
+        
+        **추천 기준:**
+        - 안전성: 시설 안전도, 주변 치안, 비상시설 완비도
+        - 편의성: 체크인/아웃 편의, 짐보관 서비스, 컨시어지 서비스
+        - 가성비: 동일 조건 대비 최적 가격, 포함 서비스 범위
+        - 접근성: 대중교통 연결성, 관광지 근접성, 공항/역 거리
+        """,
+        tools=[shared_search_tool()],
+        llm=get_llm(model),
+        verbose=True,
+        **agent_kwargs('hotel')
+    )
+
+# 숙소 후보 검색/순위 설정
+HOTEL_BUDGET_SHARE = float(os.getenv('HOTEL_BUDGET_SHARE', '0.4'))  # 전체 예산 중 숙박비 비중
+HOTEL_SHORTLIST_SIZE = int(os.getenv('HOTEL_SHORTLIST_SIZE', '6'))
+# 검색은 에이전트 검색 도구와 같은 개수로 요청해 검색 캐시를 공유하고, 검색어별 상위 결과만 후보로 사용
+HOTEL_RESULTS_PER_QUERY = int(os.getenv('HOTEL_RESULTS_PER_QUERY', '8'))
+HOTEL_ROOM_CAPACITY = 2  # 객실당 기본 인원
+HOTEL_TYPES = ('호텔', '펜션', '게스트하우스')
+
+_MANWON_RE = re.compile(r'(\d+(?:\.\d+)?)\s*만\s*원?')
+_WON_RE = re.compile(r'(\d{1,3}(?:,\d{3})+|\d{5,7})\s*원')
+_NAME_SEPARATORS = re.compile(r'\s+[-|:·]\s+|\s*[\[(]')
+
+
+def _to_int(value, default):
+    try:
+        return max(1, int(float(str(value).replace(',', '').strip())))
+    except (TypeError, ValueError):
+        return default
+
+
+def _nights(checkin, checkout):
+    try:
+        start = date.fromisoformat(normalize_date(checkin))
+        end = date.fromisoformat(normalize_date(checkout))
+    except ValueError:
+        return 1
+    return max(1, (end - start).days)
+
+
+def parse_nightly_price(text):
+    """검색 결과 문구에서 1박 가격(원) 추정 - '9만원', '89,000원' 형식, 없으면 None"""
+    prices = [int(float(m) * 10000) for m in _MANWON_RE.findall(text or '')]
+    prices += [int(m.replace(',', '')) for m in _WON_RE.findall(text or '')]
+    prices = [p for p in prices if 10000 <= p <= 3000000]
+    return min(prices) if prices else None
+
+
+def _listing_name(title):
+    return _NAME_SEPARATORS.split(title or '', maxsplit=1)[0].strip() or (title or '').strip()
+
+
+def rank_hotel_candidates(candidates, nightly_budget, rooms):
+    """1박 예산 대비 추정 비용으로 정렬 - 예산에 가까운 후보 우선, 초과는 3배 가중, 가격 미상은 그 다음"""
+    def score(candidate):
+        price = candidate['price']
+        if price is None or not nightly_budget:
+            return (1.5, candidate['rank'], candidate['name'])
+        ratio = price * rooms / nightly_budget
+        penalty = 1 - ratio if ratio <= 1 else (ratio - 1) * 3
+        return (round(penalty, 4), candidate['rank'], candidate['name'])
+    return sorted(candidates, key=score)
+
+
+@log_function_execution("숙소_후보_검색")
 def get_hotel_recommendations(city, checkin=None, checkout=None, people=None, budget=None, purpose=None):
+    """숙소 유형별 검색을 동시에 실행해 중복 제거 후 예산 기준 상위 후보 목록 반환 (후보가 없으면 빈 문자열)"""
     city = (city or '').strip()
-    checkin = (checkin or '').strip()
-    checkout = (checkout or '').strip()
-    purpose = (purpose or '').strip()
     if not city:
-        return "도시 정보가 입력되지 않아 숙소 검색이 불가합니다."
-    query_parts = [city, "호텔 추천"]
-    if checkin:
-        query_parts.append(checkin)
-    if checkout:
-        query_parts.append(checkout)
-    if purpose:
-        query_parts.append(purpose)
-    query = " ".join(query_parts).strip()
-    if not query or query == "호텔 추천" or query == f"{city} 호텔 추천":
-        return "검색어가 비어있어 숙소 검색이 불가합니다."
-    crew_logger.logger.info(f"🔎 호텔 검색 쿼리 준비: '{query}'")
-    # 검색 결과를 직접 가져오지 않고, 프롬프트에서 Agent가 검색 도구를 사용하도록 유도
-    return query
+        return ""
+    nights = _nights(checkin, checkout)
+    party = _to_int(people, 2)
+    rooms = math.ceil(party / HOTEL_ROOM_CAPACITY)
+    total_budget = _to_int(budget, 0) * 10000 if budget else 0
+    nightly_budget = int(total_budget * HOTEL_BUDGET_SHARE / nights) if total_budget else 0
+
+    queries = {kind: f"{city} {kind} 추천" for kind in HOTEL_TYPES}
+    results = get_search_service().search_many(list(queries.values()))
+
+    candidates = []
+    seen = set()
+    for kind, query in queries.items():
+        for rank, item in enumerate(results.get(query, [])[:HOTEL_RESULTS_PER_QUERY]):
+            name = _listing_name(item['title'])
+            keys = {normalize_text(name), item['link']} - {''}
+            if keys & seen:
+                continue
+            seen |= keys
+            candidates.append({
+                'name': name,
+                'kind': kind,
+                'link': item['link'],
+                'snippet': item['snippet'],
+                'price': parse_nightly_price(f"{item['title']} {item['snippet']}"),
+                'rank': rank,
+            })
+    if not candidates:
+        return ""
+
+    shortlist = rank_hotel_candidates(candidates, nightly_budget, rooms)[:HOTEL_SHORTLIST_SIZE]
+    lines = []
+    if nightly_budget:
+        lines.append(f"1박 숙박 예산(추정): 약 {nightly_budget / 10000:.1f}만원 "
+                     f"(총 예산 {total_budget // 10000}만원 × {HOTEL_BUDGET_SHARE:.0%} ÷ {nights}박, 객실 {rooms}개 기준)")
+    for i, c in enumerate(shortlist, 1):
+        if c['price'] is None:
+            price = "가격 정보 없음"
+        else:
+            price = f"1박 약 {c['price'] / 10000:.1f}만원 × 객실 {rooms}개"
+            if nightly_budget:
+                price += f" (예산 대비 {c['price'] * rooms / nightly_budget:.0%})"
+        lines.append(f"{i}. {c['name']} [{c['kind']}] | {price} | {c['link']} | {c['snippet'][:100]}")
+    crew_logger.logger.info(f"🔎 {city} 숙소 후보 {len(candidates)}건 중 {len(shortlist)}건 선별")
+    return "\n".join(lines)
 
 # Only export agent object and helper functions for use by the central workflow
 # No Crew/Task orchestration here
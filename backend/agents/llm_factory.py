@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from backend.agents.execution_budget import current_run
+from backend.utils.metrics import record_external_call
+from backend.utils.rate_limiter import get_limiter, retry_after_seconds
+
+# LLM 클라이언트 팩토리 - (모델, 파라미터)별 crewai OpenAI LLM 하나를 모든 에이전트가 공유하고,
+# 모든 LLM의 OpenAI SDK 클라이언트가 하나의 httpx keep-alive 연결 풀을 함께 사용 (동시 섹션이 TLS 연결을 재사용)
+# crewai Agent는 ChatOpenAI 같은 외부 LLM 객체를 받으면 모델/temperature만 남긴 새 LLM으로 바꿔
+# http_client 등이 버려지므로, crewai의 OpenAI LLM을 직접 만들어 넘긴다 (crewai 버전은 requirements.txt에 고정)
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', '20'))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv('LLM_KEEPALIVE_EXPIRY', '60'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '60'))
+LLM_CONNECT_TIMEOUT = float(os.getenv('LLM_CONNECT_TIMEOUT', '10'))
+# 429/5xx/연결 오류 재시도 횟수 (openai SDK의 지수 백오프 + Retry-After 준수)
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+# LLM 호출을 속도 제한(RATE_LIMIT_OPENAI_*)과 외부 호출 지표에 집계할 제공자 이름
+LLM_PROVIDER = 'openai'
+
+_http_client = None
+_http_client_lock = threading.Lock()
+_llms: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Any] = {}
+_llms_lock = threading.Lock()
+_llm_class = None
+
+
+def _instrumented_transport_class():
+    import httpx
+
+    class InstrumentedTransport(httpx.HTTPTransport):
+        """요청마다 openai 속도 제한을 거치고 호출 수, 실패 수, 소요시간을 기록하는 httpx 전송 계층
+
+        LLM 호출 전용 클라이언트이므로 OPENAI_BASE_URL로 프록시/게이트웨이를 쓰더라도 openai 제공자로 집계한다.
+        재시도는 openai SDK가 담당하므로 (각 재시도도 1회로 기록) 여기서는 429를 제공자 백오프에 반영만 한다.
+        """
+
+        def handle_request(self, request):
+            provider = LLM_PROVIDER
+            limiter = get_limiter(provider)
+            if limiter is not None:
+                limiter.acquire()
+            start = time.time()
+            response = None
+            try:
+                response = super().handle_request(request)
+                return response
+            finally:
+                status = response.status_code if response is not None else None
+                record_external_call(provider, time.time() - start, status is not None and status < 400)
+                if limiter is not None:
+                    limiter.release(status, retry_after_seconds(response.headers) if status == 429 else None)
+
+    return InstrumentedTransport
+
+
+def get_llm_http_client():
+    """LLM 호출에 공유하는 httpx.Client (keep-alive 연결 풀, 타임아웃 설정)"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                import httpx
+                limits = httpx.Limits(
+                    max_connections=LLM_POOL_SIZE,
+                    max_keepalive_connections=LLM_POOL_SIZE,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+                )
+                _http_client = httpx.Client(
+                    transport=_instrumented_transport_class()(limits=limits),
+                    limits=limits,
+                    timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                )
+    return _http_client
+
+
+def _pooled_llm_class():
+    """공유 httpx.Client를 쓰는 crewai OpenAI LLM 클래스 (crewai/openai는 이때 처음 import)"""
+    global _llm_class
+    if _llm_class is None:
+        from crewai.llms.providers.openai.completion import OpenAICompletion
+        from openai import OpenAI
+
+        class PooledOpenAICompletion(OpenAICompletion):
+            """crewai OpenAI LLM과 같되 동기 SDK 클라이언트가 공유 연결 풀(속도 제한, 호출 지표)을 사용
+
+            Crew.kickoff()는 동기 클라이언트로 호출한다. 비동기 클라이언트(akickoff 전용)는 crewai 기본값을 그대로 쓴다.
+            """
+
+            def _build_sync_client(self):
+                return OpenAI(**self._get_client_params(), http_client=get_llm_http_client())
+
+            def call(self, *args, **kwargs):
+                run = current_run()
+                if run is not None:
+                    run.on_llm_call()
+                return super().call(*args, **kwargs)
+
+        _llm_class = PooledOpenAICompletion
+    return _llm_class
+
+
+def get_llm(model: str = OPENAI_MODEL, **params: Any):
+    """(모델, 파라미터)별로 하나만 만들어 공유하는 crewai LLM
+
+    params는 crewai OpenAI LLM 인자(temperature 등)로 전달되며, timeout/max_retries를 주지 않으면
+    LLM_TIMEOUT/LLM_MAX_RETRIES를 사용한다 (재시도는 openai SDK가 Retry-After를 지켜 수행).
+    """
+    key = (model, tuple(sorted(params.items())))
+    llm = _llms.get(key)
+    if llm is None:
+        with _llms_lock:
+            llm = _llms.get(key)
+            if llm is None:
+                options = {'timeout': LLM_TIMEOUT, 'max_retries': LLM_MAX_RETRIES, **params}
+                llm = _pooled_llm_class()(model=model, api_key=os.getenv('OPENAI_API_KEY'), **options)
+                _llms[key] = llm
+    return llm
@@ -0,0 +1,67 @@
+import os
+from typing import Any, Dict, Optional, Sequence
+
+from backend.agents.llm_factory import OPENAI_MODEL
+
+# 섹션별 모델 라우팅
+# - 단계(tier): fast(MODEL_FAST) / strong(MODEL_STRONG) - 둘 다 기본은 OPENAI_MODEL (지정하지 않으면 모든 섹션이 같은 모델)
+# - 섹션 기본 단계: 구조화된 데이터를 정리하는 섹션은 fast, 추론이 필요한 교통/일정은 strong
+# - SECTION_MODEL_<SECTION> 환경 변수로 섹션별 단계나 모델 이름 지정 (예: SECTION_MODEL_PLAN=fast)
+# - 요청 body의 models로 요청 단위 지정 (예: {"models": {"plan": "fast"}}) - 단계 이름이나 허용된 모델만 사용
+# - 출력이 검증(필수 표 등)에 실패하면 strong 모델로 한 번 재실행 - 실행한 모델과 strong 모델이 다를 때만 (MODEL_ESCALATION=0이면 끔)
+MODEL_FAST = os.getenv('MODEL_FAST', OPENAI_MODEL)
+MODEL_STRONG = os.getenv('MODEL_STRONG', OPENAI_MODEL)
+MODEL_TIERS = {'fast': MODEL_FAST, 'strong': MODEL_STRONG}
+MODEL_ESCALATION = os.getenv('MODEL_ESCALATION', '1') == '1'
+# 요청 단위 지정에 허용할 모델 이름 (단계 모델은 항상 허용)
+MODEL_ALLOWED = {m.strip() for m in os.getenv('MODEL_ALLOWED', '').split(',') if m.strip()} | set(MODEL_TIERS.values())
+
+DEFAULT_SECTION_TIERS = {
+    'weather': 'fast',
+    'transport': 'strong',
+    'hotel': 'fast',
+    'plan': 'strong',
+    'food': 'fast',
+}
+
+
+def _resolve(value: Any, allowed_only: bool) -> Optional[str]:
+    name = str(value or '').strip()
+    if name.lower() in MODEL_TIERS:
+        return MODEL_TIERS[name.lower()]
+    if name and (not allowed_only or name in MODEL_ALLOWED):
+        return name
+    return None
+
+
+def section_model(section: str, data: Optional[Dict[str, Any]] = None) -> str:
+    """요청 지정 > SECTION_MODEL_<SECTION> > 섹션 기본 단계 순으로 섹션에서 사용할 모델 결정"""
+    overrides = (data or {}).get('models')
+    if isinstance(overrides, dict) and section in overrides:
+        model = _resolve(overrides[section], allowed_only=True)
+        if model:
+            return model
+    model = _resolve(os.getenv(f'SECTION_MODEL_{section.upper()}'), allowed_only=False)
+    if model:
+        return model
+    return MODEL_TIERS[DEFAULT_SECTION_TIERS.get(section, 'fast')]
+
+
+def escalation_model(model: str) -> Optional[str]:
+    """검증 실패 시 재실행할 모델 - 이미 strong 모델로 실행했거나 승격이 꺼져 있으면 None"""
+    if not MODEL_ESCALATION or model == MODEL_STRONG:
+        return None
+    return MODEL_STRONG
+
+
+def validate_output(text: str, required_columns: Sequence[str]) -> Optional[str]:
+    """필수 열을 모두 포함한 마크다운 표와 데이터 행이 있는지 검사 - 문제가 있으면 사유, 없으면 None"""
+    lines = [line.strip() for line in str(text or '').splitlines()]
+    for i, line in enumerate(lines):
+        if not line.startswith('|') or not all(column in line for column in required_columns):
+            continue
+        rows = [row for row in lines[i + 1:] if row.startswith('|') and not set(row) <= set('|-: ')]
+        if rows:
+            return None
+        return "표에 데이터 행이 없음"
+    return f"필수 표 누락 ({', '.join(required_columns)})"
@@ -0,0 +1,206 @@
+import math
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+from backend.agents.llm_factory import OPENAI_MODEL
+from backend.utils.crew_logger import crew_logger
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 바이트 길이 기반 근사치 사용
+    tiktoken = None
+
+# 섹션별 전체 프롬프트 토큰 예산과 주입 데이터 블록 예산
+# PROMPT_TOKEN_BUDGET_<SECTION>, PROMPT_DATA_TOKEN_BUDGET_<SECTION> 환경 변수로 변경 가능
+DEFAULT_PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '3000'))
+DEFAULT_DATA_TOKEN_BUDGET = int(os.getenv('PROMPT_DATA_TOKEN_BUDGET', '800'))
+MIN_DATA_TOKENS = 100
+
+
+def section_budget(section: str) -> Tuple[int, int]:
+    """(전체 프롬프트 예산, 데이터 블록 예산) 토큰 수"""
+    total = int(os.getenv(f'PROMPT_TOKEN_BUDGET_{section.upper()}', str(DEFAULT_PROMPT_TOKEN_BUDGET)))
+    data = int(os.getenv(f'PROMPT_DATA_TOKEN_BUDGET_{section.upper()}', str(DEFAULT_DATA_TOKEN_BUDGET)))
+    return total, data
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """model의 tiktoken 인코딩 - 인코딩 파일을 받을 수 없으면(오프라인 등) None으로 근사치 사용"""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:
+        crew_logger.log_error("tokenizer_load_error", str(e), {'model': model})
+        return None
+
+
+def count_tokens(text: str, model: str = OPENAI_MODEL) -> int:
+    """모델 토크나이저 기준 토큰 수 (tiktoken이 없으면 UTF-8 3바이트당 1토큰으로 근사)"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text.encode('utf-8')) / 3)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def compact_text(text: str) -> str:
+    """줄 끝 공백 제거, 연속 빈 줄과 중복 줄을 하나로 축소"""
+    lines = []
+    seen = set()
+    for line in str(text or '').splitlines():
+        line = line.rstrip()
+        if line and line in seen:
+            continue
+        if line:
+            seen.add(line)
+        elif lines and not lines[-1]:
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def fit_to_budget(text: str, max_tokens: int, model: str = OPENAI_MODEL) -> Tuple[str, bool]:
+    """텍스트를 max_tokens 안에 들어오도록 줄 단위로 자름 - (결과, 잘림 여부)"""
+    text = compact_text(text)
+    if count_tokens(text, model) <= max_tokens:
+        return text, False
+    lines = text.splitlines()
+    kept: List[str] = []
+    used = 0
+    for line in lines:
+        cost = count_tokens(line + "\n", model)
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    omitted = len(lines) - len(kept)
+    kept.append(f"...(이하 {omitted}줄 생략)")
+    return "\n".join(kept), True
+
+
+# ---- 재사용 프롬프트 조각 ----
+
+SEARCH_REQUIRED = "⚠️ **중요**: 반드시 검색 도구를 사용해야 합니다. 검색 없이는 답변할 수 없습니다."
+
+
+def heading(title: str) -> str:
+    return f"## {title}"
+
+
+def info_list(title: str, items: Sequence[Tuple[str, Any]]) -> str:
+    lines = [f"### 📋 {title}"]
+    lines += [f"- **{label}**: {value}" for label, value in items]
+    return "\n".join(lines)
+
+
+def block(title: str, body: str) -> str:
+    return f"### {title}\n{body.strip()}"
+
+
+def search_first(queries: Sequence[str]) -> str:
+    lines = ["먼저 다음 키워드로 반드시 검색해야 합니다:"]
+    lines += [f'- "{query}"' for query in queries]
+    return "\n".join(lines)
+
+
+def steps(title: str, step_items: Sequence[Tuple[str, Sequence[str]]]) -> str:
+    """'**n단계: 이름**' + 항목 목록 형태의 단계별 요구사항"""
+    parts = [f"### {title}"]
+    for i, (name, bullets) in enumerate(step_items, 1):
+        parts.append(f"\n**{i}단계: {name}**")
+        parts += [f"- {bullet}" for bullet in bullets]
+    return "\n".join(parts)
+
+
+def output_table(columns: Sequence[str], *example_rows: Sequence[str]) -> str:
+    lines = [
+        "### 📊 출력 형식 (필수)",
+        "다음 표 형식으로 정확히 작성해주세요:",
+        "",
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("------" for _ in columns) + "|",
+    ]
+    lines += ["| " + " | ".join(row) + " |" for row in example_rows]
+    return "\n".join(lines)
+
+
+def reference_section(*examples: Tuple[str, str, str]) -> str:
+    lines = [
+        "### 📎 필수 참고자료 섹션",
+        "응답 마지막에 반드시 다음 형식으로 참고 링크를 3개 이상 포함하세요:",
+        "",
+        "**📚 참고자료 및 출처:**",
+        "- [사이트명] URL - 정보 설명",
+        "",
+        "예시:",
+    ]
+    lines += [f"- [{name}] {url} - {desc}" for name, url, desc in examples]
+    return "\n".join(lines)
+
+
+class PromptBuilder:
+    """프롬프트 조각을 조립하고 섹션별 토큰 예산에 맞춰 데이터 블록을 줄이는 빌더
+
+    add()로 고정 조각을, add_data()로 외부에서 가져온 데이터 블록을 추가한다.
+    build() 시 (전체 예산 - 고정 조각 토큰)과 데이터 예산 중 작은 값을 데이터 블록들에
+    나누어 배정하고, 넘치는 블록은 줄 단위로 잘라낸다.
+    """
+
+    def __init__(self, section: str, model: str = OPENAI_MODEL):
+        self.section = section
+        self.model = model
+        self._parts: List[Tuple[str, str, str]] = []
+
+    def add(self, *fragments: str) -> 'PromptBuilder':
+        for fragment in fragments:
+            if fragment:
+                self._parts.append(('text', '', fragment.strip()))
+        return self
+
+    def add_data(self, name: str, text: Any, title: str = "📎 참고 데이터") -> 'PromptBuilder':
+        self._parts.append(('data', name, f"{title}\n{text}"))
+        return self
+
+    def build(self) -> Tuple[str, Dict[str, Any]]:
+        total_budget, data_budget = section_budget(self.section)
+        fixed = "\n\n".join(text for kind, _, text in self._parts if kind == 'text')
+        fixed_tokens = count_tokens(fixed, self.model)
+        data_parts = [part for part in self._parts if part[0] == 'data']
+        per_block = 0
+        if data_parts:
+            available = min(data_budget, total_budget - fixed_tokens)
+            per_block = max(MIN_DATA_TOKENS, available // len(data_parts))
+
+        rendered = []
+        data_tokens = {}
+        truncated = []
+        for kind, name, text in self._parts:
+            if kind == 'text':
+                rendered.append(text)
+                continue
+            title, _, body = text.partition("\n")
+            body, was_truncated = fit_to_budget(body, per_block, self.model)
+            if was_truncated:
+                truncated.append(name)
+            data_tokens[name] = count_tokens(body, self.model)
+            rendered.append(f"### {title}\n```\n{body}\n```")
+
+        prompt = "\n\n".join(rendered)
+        metrics = {
+            'section': self.section,
+            'model': self.model,
+            'prompt_tokens': count_tokens(prompt, self.model),
+            'fixed_tokens': fixed_tokens,
+            'data_tokens': data_tokens,
+            'truncated': truncated,
+            'budget': total_budget,
+        }
+        return prompt, metrics
+
@@ -0,0 +1,80 @@
+import importlib
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from backend.agents.llm_factory import OPENAI_MODEL
+from backend.utils.crew_logger import crew_logger
+
+# 에이전트 레지스트리 - crewai import와 Agent/LLM 클라이언트 생성을 처음 사용할 때로 미룸
+# (서버 시작과 /health 응답은 crewai 없이 가능하고, 사용하지 않는 에이전트는 만들지 않음)
+# LLM 클라이언트는 backend.agents.llm_factory.get_llm()으로 (모델, 파라미터)별로 공유
+# 빌더 함수는 사용할 모델 이름을 인자로 받고, Agent는 실행(kickoff)마다 새로 생성
+# (crewai가 Crew 구성 시 Agent에 crew/step_callback/실행기를 직접 설정하므로 동시 실행끼리 공유하지 않음)
+
+# 에이전트 이름 → (모듈, 빌더 함수)
+AGENT_BUILDERS: Dict[str, Tuple[str, str]] = {
+    'weather': ('backend.agents.weather_agent', 'build_weather_agent'),
+    'transport': ('backend.agents.transport_agent', 'build_transport_agent'),
+    'hotel': ('backend.agents.hotel_agent', 'build_hotel_agent'),
+    'plan': ('backend.agents.plan_agent', 'build_plan_agent'),
+    'food': ('backend.agents.food_agent', 'build_food_agent'),
+    # 현재 워크플로(crew_agent)에서는 사용하지 않는 보조 에이전트
+    'route_planner': ('backend.agents.transport_agent', 'build_route_planner'),
+    'transport_searcher': ('backend.agents.transport_agent', 'build_transport_searcher'),
+    'cost_analyzer': ('backend.agents.transport_agent', 'build_cost_analyzer'),
+    'food_planner': ('backend.agents.food_agent', 'build_food_planner'),
+    'food_searcher': ('backend.agents.food_agent', 'build_food_searcher'),
+    'food_analyst': ('backend.agents.food_agent', 'build_food_analyst'),
+}
+SECTION_AGENTS = ('weather', 'transport', 'hotel', 'plan', 'food')
+
+_builders: Dict[str, Callable[..., Any]] = {}
+
+
+def shared_search_tool():
+    """모든 에이전트가 공유하는 검색 도구 (crewai.tools는 이때 처음 import)"""
+    from backend.agents.search_tool import get_search_tool
+    return get_search_tool()
+
+
+def _builder(name: str) -> Callable[..., Any]:
+    """이름에 해당하는 빌더 함수 - 모듈은 처음 사용할 때 import"""
+    builder = _builders.get(name)
+    if builder is None:
+        if name not in AGENT_BUILDERS:
+            raise KeyError(f"등록되지 않은 에이전트: {name}")
+        module_name, builder_name = AGENT_BUILDERS[name]
+        builder = getattr(importlib.import_module(module_name), builder_name)
+        _builders[name] = builder
+    return builder
+
+
+def new_agent(name: str, model: str = OPENAI_MODEL):
+    """실행 1회에 쓸 새 Agent - LLM 클라이언트와 검색 도구는 공유 인스턴스를 사용하므로 생성 비용은 작다"""
+    return _builder(name)(model)
+
+
+def new_task(**kwargs):
+    """crewai Task 생성 (crewai는 이때 처음 import)"""
+    from crewai import Task
+    return Task(**kwargs)
+
+
+def new_crew(**kwargs):
+    """crewai Crew 생성 (crewai는 이때 처음 import)"""
+    from crewai import Crew
+    return Crew(**kwargs)
+
+
+def warm_up(names: Iterable[str] = SECTION_AGENTS) -> float:
+    """워크플로 에이전트 모듈, crewai, LLM 클라이언트(섹션 기본 모델)와 검색 도구를 미리 준비 - gunicorn post_fork 등에서 호출, 소요시간(초) 반환"""
+    from backend.agents.model_router import section_model
+    start = time.time()
+    for name in names:
+        try:
+            new_agent(name, section_model(name))
+        except Exception as e:
+            crew_logger.log_error("agent_warmup_error", str(e), {'agent': name})
+    elapsed = time.time() - start
+    crew_logger.logger.info(f"🔥 에이전트 워밍업 완료 ({elapsed:.2f}초)")
+    return elapsed
@@ -0,0 +1,38 @@
+from typing import Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from backend.agents.execution_budget import current_run
+from backend.utils.search_service import format_search_results, get_search_service
+
+
+class SearchToolInput(BaseModel):
+    search_query: str = Field(..., description="인터넷에서 검색할 키워드")
+
+
+class CachedSearchTool(BaseTool):
+    """SerperDevTool 대체 - 공용 SearchService(캐시 + 동시 요청 병합)를 거쳐 검색"""
+
+    name: str = "Search the internet"
+    description: str = "인터넷에서 키워드를 검색해 제목, 링크, 요약을 반환합니다."
+    args_schema: Type[BaseModel] = SearchToolInput
+
+    def _run(self, search_query: str) -> str:
+        run = current_run()
+        if run is not None:
+            refusal = run.acquire_tool_call()
+            if refusal:
+                return refusal
+        return format_search_results(get_search_service().search(search_query))
+
+
+_search_tool = None
+
+
+def get_search_tool() -> CachedSearchTool:
+    """모든 에이전트가 공유하는 검색 도구 인스턴스"""
+    global _search_tool
+    if _search_tool is None:
+        _search_tool = CachedSearchTool()
+    return _search_tool
@@ -1,129 +1,291 @@
-from crewai import Agent
+import contextvars
+import json
 import os
-import requests
-from typing import Optional
-
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-
-weather_agent = Agent(
-    name="WeatherAgent",
-    role="여행 날씨 정보 분석 및 준비물 추천 전문가",
-    goal="""
-    여행 목적지와 기간의 실시간 날씨 데이터를 단계별로 분석하여 다음을 제공:
-    1. 날씨 패턴 분석 및 해석
-    2. 날씨별 최적 옷차림 조합 추천 
-    3. 필수 준비물 및 액세서리 목록 작성
-    4. 날씨 기반 여행 주의사항 및 실용적 팁 제공
-    5. 실내/실외 활동 비율 최적화 제안
-    """,
-    backstory="""
-    당신은 10년 이상의 기상 분석 경험을 가진 전문 기상 컨설턴트입니다.
-    
-    **전문 분야:**
-    - 기상 데이터 해석 및 패턴 분석
-    - 지역별 기후 특성 및 계절별 변화 이해  
-    - 여행자 안전을 위한 날씨 기반 위험 평가
-    - 활동별 최적 날씨 조건 매칭
-    
-    **작업 원칙:**
-    - 제공된 실시간 날씨 데이터만을 근거로 분석 수행
-    - 모든 추천은 구체적인 근거와 함께 제시
-    - 여행자의 안전과 편의를 최우선으로 고려
-    - 예상치 못한 날씨 변화에 대한 대비책 포함
-    """,
-    llm_config={
-        "provider": "openai",
-        "config": {
-            "model": "gpt-3.5-turbo",
-            "api_key": OPENAI_API_KEY
-        }
-    }
-)
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from backend.agents.llm_factory import OPENAI_MODEL, get_llm
+from backend.utils.cache import normalize_date, normalize_text
+from backend.utils.climatology import climatology_day
+from backend.utils.crew_logger import crew_logger
+from backend.utils.forecast import aggregate_daily_forecasts
+from backend.utils.http_client import get_http_session
 
-def get_weather_data(destination: Optional[str], start_date: Optional[str], end_date: Optional[str]) -> str:
-    """OpenWeatherMap API를 사용하여 날씨 정보 조회"""
+def build_weather_agent(model: str = OPENAI_MODEL):
+    """날씨 에이전트 생성 - backend.agents.registry.new_agent()가 실행마다 호출"""
+    from crewai import Agent
+    return Agent(
+        name="WeatherAgent",
+        role="여행 날씨 정보 분석 및 준비물 추천 전문가",
+        goal="""
+        여행 목적지와 기간의 실시간 날씨 데이터를 단계별로 분석하여 다음을 제공:
+        1. 날씨 패턴 분석 및 해석
+        2. 날씨별 최적 옷차림 조합 추천 
+        3. 필수 준비물 및 액세서리 목록 작성
+        4. 날씨 기반 여행 주의사항 및 실용적 팁 제공
+        5. 실내/실외 활동 비율 최적화 제안
+        """,
+        backstory="""
+        당신은 10년 이상의 기상 분석 경험을 가진 전문 기상 컨설턴트입니다.
+        
+        **전문 분야:**
+        - 기상 데이터 해석 및 패턴 분석
+        - 지역별 기후 특성 및 계절별 변화 이해  
+        - 여행자 안전을 위한 날씨 기반 위험 평가
+        - 활동별 최적 날씨 조건 매칭
+        
+        **작업 원칙:**
+        - 제공된 실시간 날씨 데이터만을 근거로 분석 수행
+        - 모든 추천은 구체적인 근거와 함께 제시
+        - 여행자의 안전과 편의를 최우선으로 고려
+        - 예상치 못한 날씨 변화에 대한 대비책 포함
+        """,
+        llm=get_llm(model)
+    )
+
+# 도시 → 좌표 디스크 캐시 (자주 쓰는 여행지는 미리 채워 둠)
+GEOCODE_CACHE_PATH = os.getenv('GEOCODE_CACHE_PATH', 'geocode_cache.json')
+SEED_GEOCODES = {
+    '서울': (37.5665, 126.9780), '부산': (35.1796, 129.0756), '제주': (33.4996, 126.5312),
+    '제주도': (33.4996, 126.5312), '서귀포': (33.2541, 126.5600), '인천': (37.4563, 126.7052),
+    '대구': (35.8714, 128.6014), '대전': (36.3504, 127.3845), '광주': (35.1595, 126.8526),
+    '울산': (35.5384, 129.3114), '강릉': (37.7519, 128.8761), '속초': (38.2070, 128.5918),
+    '경주': (35.8562, 129.2247), '전주': (35.8242, 127.1480), '여수': (34.7604, 127.6622),
+    '통영': (34.8544, 128.4331), '춘천': (37.8813, 127.7298), '포항': (36.0190, 129.3435),
+    '안동': (36.5684, 128.7294), '가평': (37.8315, 127.5105), '도쿄': (35.6762, 139.6503),
+    '오사카': (34.6937, 135.5023), '후쿠오카': (33.5904, 130.4017), '삿포로': (43.0618, 141.3545),
+    '방콕': (13.7563, 100.5018), '타이베이': (25.0330, 121.5654), '다낭': (16.0544, 108.2022),
+    '싱가포르': (1.3521, 103.8198), '파리': (48.8566, 2.3522), '뉴욕': (40.7128, -74.0060),
+    'seoul': (37.5665, 126.9780), 'busan': (35.1796, 129.0756), 'jeju': (33.4996, 126.5312),
+    'tokyo': (35.6762, 139.6503), 'osaka': (34.6937, 135.5023),
+}
+
+_geocode_cache = None
+_geocode_lock = threading.Lock()
+
+# OpenWeather 무료 5일 예보 범위와 프롬프트에 넣을 최대 일수
+FORECAST_HORIZON_DAYS = 5
+MAX_REPORT_DAYS = int(os.getenv('WEATHER_MAX_REPORT_DAYS', '14'))
+
+# 현재 날씨/예보 동시 조회용 스레드 풀
+_weather_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='weather')
+
+def _load_geocode_cache():
+    global _geocode_cache
+    if _geocode_cache is None:
+        cache = {key: list(coords) for key, coords in SEED_GEOCODES.items()}
+        try:
+            with open(GEOCODE_CACHE_PATH, encoding='utf-8') as f:
+                cache.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        _geocode_cache = cache
+    return _geocode_cache
+
+def _save_geocode_cache(cache):
+    tmp_path = f"{GEOCODE_CACHE_PATH}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, GEOCODE_CACHE_PATH)
+    except OSError as e:
+        crew_logger.log_error("geocode_cache_save_error", str(e))
+
+def geocode_city(destination: str, api_key: str) -> Optional[Tuple[float, float]]:
+    """도시 이름을 (위도, 경도)로 변환 - 캐시에 없을 때만 OpenWeather 지오코딩 API 호출"""
+    key = normalize_text(destination)
+    with _geocode_lock:
+        coords = _load_geocode_cache().get(key)
+    if coords:
+        return coords[0], coords[1]
+
+    response = get_http_session().get(
+        "http://api.openweathermap.org/geo/1.0/direct",
+        params={'q': destination, 'limit': 1, 'appid': api_key},
+        timeout=10
+    )
+    if response.status_code != 200:
+        return None
+    geo_data = response.json()
+    if not geo_data:
+        return None
+
+    coords = [geo_data[0]['lat'], geo_data[0]['lon']]
+    with _geocode_lock:
+        cache = _load_geocode_cache()
+        cache[key] = coords
+        _save_geocode_cache(cache)
+    return coords[0], coords[1]
+
+def _fetch_forecast(destination: str, api_key: str) -> Optional[dict]:
+    coords = geocode_city(destination, api_key)
+    if not coords:
+        return None
+    response = get_http_session().get(
+        "https://api.openweathermap.org/data/2.5/forecast",
+        params={'lat': coords[0], 'lon': coords[1], 'appid': api_key, 'units': 'metric', 'lang': 'kr'},
+        timeout=10
+    )
+    return response.json() if response.status_code == 200 else None
+
+def get_multi_city_daily_forecasts(destinations: List[str]) -> Dict[str, List[dict]]:
+    """여러 도시(다구간 여행, 배치 작업)의 예보를 동시에 받아 한 번에 일별 집계
+
+    조회에 실패한 도시는 빈 리스트로 반환한다.
+    """
     api_key = os.getenv("OPENWEATHER_API_KEY")
-    if not api_key:
-        return "날씨 API 키가 설정되지 않았습니다."
+    destinations = [d.strip() for d in destinations if d and d.strip()]
+    if not api_key or not destinations:
+        return {d: [] for d in destinations}
+    futures = [_weather_executor.submit(contextvars.copy_context().run, _fetch_forecast, d, api_key) for d in destinations]
+    forecasts = []
+    for destination, future in zip(destinations, futures):
+        try:
+            forecasts.append(future.result() or {})
+        except Exception as e:
+            crew_logger.log_error("forecast_fetch_error", str(e), {'destination': destination})
+            forecasts.append({})
+    return dict(zip(destinations, aggregate_daily_forecasts(forecasts)))
+
+def _trip_dates(start_date: Optional[str], end_date: Optional[str]) -> Optional[List[date]]:
+    """여행 시작~종료일 목록 (날짜를 해석할 수 없으면 None, 최대 MAX_REPORT_DAYS일)"""
+    try:
+        start = date.fromisoformat(normalize_date(start_date))
+        end = date.fromisoformat(normalize_date(end_date or start_date))
+    except ValueError:
+        return None
+    if end < start:
+        end = start
+    days = (end - start).days + 1
+    return [start + timedelta(days=i) for i in range(min(days, MAX_REPORT_DAYS))]
+
+def get_weather_report(destination: Optional[str], start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+    """여행 기간에 해당하는 날짜별 날씨를 구조화된 dict로 조회
+
+    예보 범위(약 5일) 안의 날짜는 OpenWeatherMap 예보를, 범위를 벗어난 날짜는
+    기후 평년값을 사용하며 각 날짜의 source('forecast' / 'climatology')에 출처를 기록한다.
+    평년값이 없는 지역이라 정보가 없는 날짜는 days에서 빼고 missing_dates에 기록한다.
+    여행 기간 전체가 예보 범위 밖이면 예보 API를 호출하지 않는다.
+    """
     destination = (destination or "").strip()
+    report = {'destination': destination, 'current': None, 'days': [], 'missing_dates': [], 'notes': [], 'error': None}
     if not destination:
-        return "목적지가 없어 날씨 정보를 조회할 수 없습니다."
-    
-    # 도시 이름을 좌표로 변환
-    geocoding_url = f"http://api.openweathermap.org/geo/1.0/direct?q={destination}&limit=1&appid={api_key}"
-    
-    try:
-        geo_response = requests.get(geocoding_url, timeout=10)
-        if geo_response.status_code != 200:
-            return "도시 정보를 찾을 수 없습니다."
-        
-        geo_data = geo_response.json()
-        if not geo_data:
-            return f"{destination}에 대한 지리 정보를 찾을 수 없습니다."
-        
-        lat = geo_data[0]['lat']
-        lon = geo_data[0]['lon']
-        
-        # 현재 날씨 API 사용 (무료 플랜)
-        current_url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=metric&lang=kr"
-        current_response = requests.get(current_url, timeout=10)
-        
-        # 5일 예보 API 사용 (무료 플랜)
-        forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={api_key}&units=metric&lang=kr"
-        forecast_response = requests.get(forecast_url, timeout=10)
-        
-        if current_response.status_code != 200 or forecast_response.status_code != 200:
-            return f"날씨 정보를 가져올 수 없습니다. Current: {current_response.status_code}, Forecast: {forecast_response.status_code}"
-        
-        current_data = current_response.json()
-        forecast_data = forecast_response.json()
-        
-        # 현재 날씨
-        forecast_summary = f"📍 {destination} 현재 날씨\n"
-        forecast_summary += f"기온: {current_data['main']['temp']:.1f}°C (체감: {current_data['main']['feels_like']:.1f}°C)\n"
-        forecast_summary += f"습도: {current_data['main']['humidity']}%, 날씨: {current_data['weather'][0]['description']}\n"
-        forecast_summary += f"바람: {current_data.get('wind', {}).get('speed', 0):.1f}m/s\n\n"
-        
-        # 5일 예보 (3시간 간격)
-        forecast_summary += "📅 5일 예보 (3시간 간격):\n"
-        from datetime import datetime
-        for i, forecast in enumerate(forecast_data['list'][:12], 1):  # 첫 12개 (36시간)
-            dt = datetime.fromtimestamp(forecast['dt'])
-            date_time = dt.strftime('%m/%d %H시')
-            temp = forecast['main']['temp']
-            description = forecast['weather'][0]['description']
-            humidity = forecast['main']['humidity']
-            
-            forecast_summary += f"{i}. {date_time} - 기온: {temp:.1f}°C, {description}, 습도: {humidity}%\n"
-        
-        # 일별 요약 (첫 번째 예보에서 최고/최저 추출)
-        forecast_summary += "\n📊 일별 날씨 요약:\n"
-        daily_data = {}
-        for forecast in forecast_data['list'][:40]:  # 5일치
-            dt = datetime.fromtimestamp(forecast['dt'])
-            date_key = dt.strftime('%m/%d')
-            temp = forecast['main']['temp']
-            
-            if date_key not in daily_data:
-                daily_data[date_key] = {
-                    'temps': [temp],
-                    'descriptions': [forecast['weather'][0]['description']]
-                }
+        report['error'] = "목적지가 없어 날씨 정보를 조회할 수 없습니다."
+        return report
+
+    trip_days = _trip_dates(start_date, end_date)
+    today = date.today()
+    horizon = today + timedelta(days=FORECAST_HORIZON_DAYS)
+    needs_forecast = trip_days is None or (trip_days[0] <= horizon and trip_days[-1] >= today)
+    needs_current = trip_days is None or trip_days[0] <= today + timedelta(days=1)
+
+    forecast_days = {}
+    api_key = os.getenv("OPENWEATHER_API_KEY")
+    if needs_forecast and not api_key:
+        report['notes'].append("날씨 API 키가 설정되지 않아 예보 대신 평년값을 사용합니다.")
+    elif needs_forecast:
+        try:
+            coords = geocode_city(destination, api_key)
+            if not coords:
+                report['notes'].append(f"{destination}에 대한 지리 정보를 찾을 수 없습니다.")
             else:
-                daily_data[date_key]['temps'].append(temp)
-                daily_data[date_key]['descriptions'].append(forecast['weather'][0]['description'])
-        
-        for i, (date, data) in enumerate(daily_data.items(), 1):
-            min_temp = min(data['temps'])
-            max_temp = max(data['temps'])
-            # 가장 많이 나온 날씨 설명 사용
-            main_desc = max(set(data['descriptions']), key=data['descriptions'].count)
-            forecast_summary += f"{i}. {date} - 최저: {min_temp:.1f}°C, 최고: {max_temp:.1f}°C, {main_desc}\n"
-        
-        return forecast_summary
-        
-    except Exception as e:
-        return f"날씨 정보 조회 중 오류 발생: {str(e)}"
+                # 현재 날씨(여행이 곧 시작될 때만) + 5일 예보 API 동시 호출 (무료 플랜)
+                session = get_http_session()
+                params = {'lat': coords[0], 'lon': coords[1], 'appid': api_key, 'units': 'metric', 'lang': 'kr'}
+                # 요청 우선순위(대화형/배치)가 유지되도록 현재 컨텍스트에서 실행
+                forecast_future = _weather_executor.submit(
+                    contextvars.copy_context().run, session.get, "https://api.openweathermap.org/data/2.5/forecast", params=params, timeout=10
+                )
+                current_future = _weather_executor.submit(
+                    contextvars.copy_context().run, session.get, "https://api.openweathermap.org/data/2.5/weather", params=params, timeout=10
+                ) if needs_current else None
+
+                forecast_response = forecast_future.result()
+                if forecast_response.status_code == 200:
+                    for day in aggregate_daily_forecasts([forecast_response.json()])[0]:
+                        forecast_days[day['date']] = dict(day, source='forecast')
+                else:
+                    report['notes'].append(f"예보 정보를 가져올 수 없습니다. Forecast: {forecast_response.status_code}")
+
+                current_response = current_future.result() if current_future else None
+                if current_response is not None and current_response.status_code == 200:
+                    current_data = current_response.json()
+                    report['current'] = {
+                        'temp': current_data['main']['temp'],
+                        'feels_like': current_data['main']['feels_like'],
+                        'humidity': current_data['main']['humidity'],
+                        'description': current_data['weather'][0]['description'],
+                        'wind': current_data.get('wind', {}).get('speed', 0),
+                    }
+        except Exception as e:
+            report['notes'].append(f"날씨 정보 조회 중 오류 발생: {str(e)}")
+
+    if trip_days is None:
+        # 날짜를 해석할 수 없으면 받은 예보 전체 사용
+        report['days'] = list(forecast_days.values())
+    else:
+        for d in trip_days:
+            day = forecast_days.get(d.isoformat()) or climatology_day(destination, d)
+            if day is None:
+                report['missing_dates'].append(d.isoformat())
+            else:
+                report['days'].append(day)
+        missing = report['missing_dates']
+        if missing:
+            report['notes'].append(
+                f"{destination}의 기후 평년값 정보가 없어 {missing[0][5:].replace('-', '/')}~"
+                f"{missing[-1][5:].replace('-', '/')} ({len(missing)}일)의 날씨 정보가 없습니다."
+            )
+
+    if not report['days']:
+        report['error'] = " ".join(report['notes']) or "날씨 정보를 가져올 수 없습니다."
+    return report
+
+def format_weather_report(report: Dict[str, Any]) -> str:
+    """구조화된 날씨 정보를 프롬프트용 간결한 날짜별 텍스트로 변환"""
+    if report.get('error'):
+        return report['error']
+
+    days = report['days']
+    missing = report.get('missing_dates') or []
+    dates = sorted([day['date'] for day in days] + missing)
+    lines = [f"📍 {report['destination']} 여행 기간 날씨 ({dates[0]} ~ {dates[-1]})"]
+
+    forecast_dates = [d['date'][5:].replace('-', '/') for d in days if d['source'] == 'forecast']
+    climate_dates = [d['date'][5:].replace('-', '/') for d in days if d['source'] == 'climatology']
+    sources = []
+    if forecast_dates:
+        sources.append(f"OpenWeatherMap 5일 예보 ({forecast_dates[0]}~{forecast_dates[-1]})")
+    if climate_dates:
+        sources.append(f"기후 평년값 ({climate_dates[0]}~{climate_dates[-1]}, 예보 가능 범위 밖)")
+    lines.append(f"데이터 출처: {', '.join(sources)}")
+    for note in report.get('notes', []):
+        lines.append(f"※ {note}")
+
+    current = report.get('current')
+    if current:
+        lines.append(
+            f"현재: {current['temp']:.1f}°C (체감 {current['feels_like']:.1f}°C), "
+            f"습도 {current['humidity']}%, {current['description']}, 바람 {current['wind']:.1f}m/s"
+        )
+
+    lines.append("📅 날짜 | 최저~최고 | 강수확률 | 날씨 | 출처")
+    rows = {missing_date: f"{missing_date[5:].replace('-', '/')} | 정보 없음" for missing_date in missing}
+    for day in days:
+        source = '예보' if day['source'] == 'forecast' else '평년'
+        rows[day['date']] = (
+            f"{day['date'][5:].replace('-', '/')} | {day['temp_min']:.0f}~{day['temp_max']:.0f}°C | "
+            f"{day['pop']}% | {day['condition']} | {source}"
+        )
+    lines += [rows[row_date] for row_date in dates]
+    if climate_dates:
+        lines.append("※ 평년값은 과거 기후 통계이며 실제 날씨와 다를 수 있습니다.")
+    return "\n".join(lines)
+
+def get_weather_data(destination: Optional[str], start_date: Optional[str], end_date: Optional[str]) -> str:
+    """여행 기간(start_date~end_date)에 해당하는 날씨 정보를 프롬프트용 텍스트로 조회"""
+    return format_weather_report(get_weather_report(destination, start_date, end_date))
 
 # Only export agent object and helper functions for use by the central workflow
 # No Crew/Task orchestration here
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+from typing import Any, Dict, List, Optional
+
+# 날씨 섹션 규칙 기반 렌더러 - 구조화된 날씨 정보(get_weather_report)로 섹션 표를 LLM 없이 바로 생성
+# WEATHER_RENDER_MODE
+# - rules: 규칙 표만 사용 (여행 기간 중 날씨 정보가 없는 날짜가 있으면 LLM으로 대체)
+# - llm: 기존처럼 LLM이 표 작성
+# - rules+llm: 규칙 표를 초안으로 LLM이 여행 목적에 맞게 보강
+WEATHER_RENDER_MODES = ('rules', 'llm', 'rules+llm')
+WEATHER_RENDER_MODE = os.getenv('WEATHER_RENDER_MODE', 'rules')
+if WEATHER_RENDER_MODE not in WEATHER_RENDER_MODES:
+    WEATHER_RENDER_MODE = 'rules'
+
+WEATHER_TABLE_COLUMNS = ["날짜", "날씨", "기온(°C)", "강수확률", "추천 옷차림", "필수 준비물", "주의사항"]
+
+# (평균기온 하한 °C, 추천 옷차림) - 위에서부터 처음 만족하는 구간 사용
+CLOTHING_BANDS = (
+    (28, "반팔+반바지, 통풍이 잘 되는 옷"),
+    (23, "반팔+얇은 셔츠"),
+    (17, "긴팔+얇은 겉옷"),
+    (12, "맨투맨/니트+가벼운 재킷"),
+    (6, "니트+트렌치코트/코트"),
+    (0, "두꺼운 코트+목도리"),
+    (float('-inf'), "패딩+내복, 장갑·목도리"),
+)
+# 일교차가 이 값(°C) 이상이면 겉옷 추가 권장
+LARGE_DAILY_RANGE = 10
+
+
+def _clothing(day: Dict[str, Any]) -> str:
+    mean = day.get('temp_mean', (day['temp_min'] + day['temp_max']) / 2)
+    clothing = next(text for lower, text in CLOTHING_BANDS if mean >= lower)
+    if day['temp_max'] - day['temp_min'] >= LARGE_DAILY_RANGE:
+        clothing += " (일교차 커서 겉옷 챙기기)"
+    return clothing
+
+
+def _items(day: Dict[str, Any]) -> List[str]:
+    condition = day['condition']
+    items = []
+    if day['pop'] >= 60:
+        items += ["우산", "방수 신발"]
+    elif day['pop'] >= 30 or '비' in condition:
+        items.append("접이식 우산")
+    if '눈' in condition:
+        items.append("미끄럼 방지 신발")
+    if day['temp_max'] >= 20 and day['pop'] < 30:
+        items += ["선크림", "선글라스"]
+    if day['temp_max'] >= 28:
+        items += ["휴대용 선풍기", "물"]
+    if day['temp_min'] <= 0:
+        items += ["핫팩", "장갑"]
+    return items or ["특별한 준비물 없음"]
+
+
+def _cautions(day: Dict[str, Any]) -> List[str]:
+    cautions = []
+    if day['temp_max'] >= 33:
+        cautions.append("폭염 주의, 한낮 야외 활동 자제")
+    elif day['temp_max'] >= 28 and day['pop'] < 30:
+        cautions.append("자외선 주의")
+    if day['temp_min'] <= -5:
+        cautions.append("한파 주의, 실내 일정 배치")
+    if day['pop'] >= 70:
+        cautions.append("비 예보, 실내 대체 일정 준비")
+    if '눈' in day['condition']:
+        cautions.append("빙판길 주의")
+    if day.get('source') == 'climatology':
+        cautions.append("평년값 기준, 출발 전 예보 확인")
+    return cautions or ["특이사항 없음"]
+
+
+def render_weather_section(report: Dict[str, Any]) -> Optional[str]:
+    """get_weather_report() 결과를 날씨 섹션 마크다운 표로 변환
+
+    여행 기간의 모든 날짜에 예보나 평년값이 있을 때만 표를 만들고, 아니면 None을 반환한다.
+    """
+    days = report.get('days') or []
+    if report.get('error') or not days or report.get('missing_dates'):
+        return None
+    lines = [
+        f"## 🌤️ {report['destination']} 여행 날씨 ({days[0]['date']} ~ {days[-1]['date']})",
+        "",
+        "| " + " | ".join(WEATHER_TABLE_COLUMNS) + " |",
+        "|" + "---|" * len(WEATHER_TABLE_COLUMNS),
+    ]
+    for day in days:
+        cells = [
+            day['date'][5:].replace('-', '/'),
+            day['condition'] or '-',
+            f"{day['temp_min']:.0f}~{day['temp_max']:.0f}",
+            f"{day['pop']}%",
+            _clothing(day),
+            ", ".join(_items(day)),
+            ", ".join(_cautions(day)),
+        ]
+        lines.append("| " + " | ".join(cells) + " |")
+
+    current = report.get('current')
+    if current:
+        lines += ["", f"현재 날씨: {current['temp']:.1f}°C (체감 {current['feels_like']:.1f}°C), {current['description']}"]
+    notes = list(report.get('notes') or [])
+    if any(day.get('source') == 'climatology' for day in days):
+        notes.append("예보 가능 범위(약 5일) 밖의 날짜는 기후 평년값이며 실제 날씨와 다를 수 있습니다.")
+    if notes:
+        lines.append("")
+        lines += [f"※ {note}" for note in notes]
+    lines += ["", "참고: [기상청](https://www.weather.go.kr), [OpenWeatherMap](https://openweathermap.org)"]
+    return "\n".join(lines)
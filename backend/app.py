@@ -1,6 +1,12 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
-from backend.agents.crew_agent import get_travel_plan_with_crew
+from backend.agents.crew_agent import collect_plan_sections, iter_travel_plan_events
+from backend.utils import metrics
+from backend.utils.cache import cache_stats, plan_cache_key
+from backend.utils.job_queue import PlanJobQueue, QueueFullError
+from backend.utils.rate_limiter import limiter_stats
+from backend.utils.singleflight import StreamSingleFlight
+import json
 import logging
 import os
 
@@ -11,6 +17,44 @@ CORS(app)  # CORS 허용
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 여행 계획 비동기 작업 큐 (HTTP 워커가 LLM 호출을 기다리지 않도록 별도 워커 스레드에서 실행)
+plan_jobs = PlanJobQueue(iter_travel_plan_events)
+
+# 동일한(정규화 기준) 여행 계획 요청이 동시에 들어오면 진행 중인 생성 작업 하나를 공유
+PLAN_COALESCE = os.getenv('PLAN_COALESCE', '1') == '1'
+
+def _plan_error_event(e):
+    logger.error(f"여행 플랜 생성 중 오류 발생: {str(e)}")
+    return {
+        "event": "error",
+        "error": str(e),
+        "message": "여행 플랜 생성 중 오류가 발생했습니다."
+    }
+
+plan_flights = StreamSingleFlight(iter_travel_plan_events, on_error=_plan_error_event)
+
+def _cache_requests():
+    values = {}
+    for name, stats in cache_stats().items():
+        values[(name, 'hit')] = stats['hits']
+        values[(name, 'miss')] = stats['misses']
+    return values
+
+metrics.queue_depth.set_function(lambda: {(): plan_jobs.queue_depth()})
+metrics.coalesced_requests.set_function(lambda: {(): plan_flights.coalesced})
+metrics.cache_hit_ratio.set_function(lambda: {(name,): stats['hit_ratio'] for name, stats in cache_stats().items()})
+metrics.cache_requests.set_function(_cache_requests)
+metrics.rate_limit_rate.set_function(lambda: {(name,): stats['rate'] for name, stats in limiter_stats().items()})
+
+def plan_events(data):
+    """여행 계획 이벤트 스트림 - 같은 요청이 진행 중이면 그 스트림에 합류"""
+    if not PLAN_COALESCE:
+        return iter_travel_plan_events(data)
+    events, shared = plan_flights.subscribe(plan_cache_key(data), data)
+    if shared:
+        logger.info(f"진행 중인 동일 여행 플랜 생성에 합류: {data.get('destination')}")
+    return events
+
 @app.route('/', methods=['GET'])
 def root():
     """API 정보 엔드포인트"""
@@ -21,7 +65,11 @@ def root():
         "endpoints": {
             "/health": "서버 상태 확인",
             "/plan": "여행 플랜 생성 (POST)",
-            "/weather": "날씨 정보 조회 (POST)"
+            "/plan/stream": "여행 플랜 섹션별 스트리밍 생성 (POST, NDJSON)",
+            "/plan/jobs": "여행 플랜 비동기 작업 등록 (POST)",
+            "/plan/jobs/<job_id>": "여행 플랜 작업 상태/부분 결과 조회 (GET)",
+            "/weather": "날씨 정보 조회 (POST)",
+            "/metrics": "Prometheus 형식 지표 (GET)"
         }
     })
 
@@ -30,6 +78,21 @@ def health_check():
     """서버 상태 확인 엔드포인트"""
     return jsonify({"status": "healthy", "message": "Good Travel Agent API is running"})
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """지연시간 히스토그램, 외부 API 호출/실패 수, 진행 중 요청, 큐 깊이, 캐시 적중률"""
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+def validate_plan_request(data):
+    """필수 필드 검증 - 누락된 필드가 있으면 오류 메시지, 없으면 None 반환"""
+    if not isinstance(data, dict):
+        return "요청 본문이 올바른 JSON 객체가 아닙니다."
+    required_fields = ['destination', 'start_date', 'end_date']
+    for field in required_fields:
+        if not data.get(field):
+            return f"필수 필드가 누락되었습니다: {field}"
+    return None
+
 @app.route('/plan', methods=['POST'])
 def plan():
     """통합 여행 플랜 생성 엔드포인트"""
@@ -37,15 +100,14 @@ def plan():
         data = request.json
         
         # 필수 필드 검증
-        required_fields = ['destination', 'start_date', 'end_date']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({"error": f"필수 필드가 누락되었습니다: {field}"}), 400
+        error = validate_plan_request(data)
+        if error:
+            return jsonify({"error": error}), 400
         
         logger.info(f"여행 플랜 요청: {data.get('destination')} ({data.get('start_date')} ~ {data.get('end_date')})")
         
-        # Crew AI 협업 구조로 여행 플랜 생성
-        result = get_travel_plan_with_crew(data)
+        # Crew AI 협업 구조로 여행 플랜 생성 (동일 요청이 진행 중이면 결과 공유)
+        result = collect_plan_sections(plan_events(data))
         
         logger.info("여행 플랜 생성 완료")
         return jsonify({
@@ -62,6 +124,71 @@ def plan():
             "message": "여행 플랜 생성 중 오류가 발생했습니다."
         }), 500
 
+@app.route('/plan/stream', methods=['POST'])
+def plan_stream():
+    """섹션이 완료될 때마다 결과를 NDJSON(한 줄에 JSON 이벤트 하나)으로 전송하는 엔드포인트"""
+    data = request.get_json(silent=True)
+    error = validate_plan_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    logger.info(f"여행 플랜 스트리밍 요청: {data.get('destination')} ({data.get('start_date')} ~ {data.get('end_date')})")
+
+    def generate():
+        try:
+            for event in plan_events(data):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+            logger.info("여행 플랜 스트리밍 완료")
+        except Exception as e:
+            yield json.dumps(_plan_error_event(e), ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/plan/jobs', methods=['POST'])
+def create_plan_job():
+    """여행 플랜 생성 작업을 큐에 등록하고 작업 ID를 즉시 반환하는 엔드포인트"""
+    data = request.get_json(silent=True)
+    error = validate_plan_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    try:
+        job_id = plan_jobs.submit(data)
+    except QueueFullError as e:
+        logger.warning(f"여행 플랜 작업 큐 포화: {str(e)}")
+        response = jsonify({
+            "success": False,
+            "error": str(e),
+            "message": "요청이 많아 잠시 후 다시 시도해주세요."
+        })
+        response.headers['Retry-After'] = '30'
+        return response, 429
+
+    logger.info(f"여행 플랜 작업 등록: {job_id} - {data.get('destination')}")
+    response = jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/plan/jobs/{job_id}",
+        "message": "여행 플랜 생성 작업이 등록되었습니다."
+    })
+    response.headers['Location'] = f"/plan/jobs/{job_id}"
+    return response, 202
+
+@app.route('/plan/jobs/<job_id>', methods=['GET'])
+def get_plan_job(job_id):
+    """작업 상태, 완료된 섹션(부분 결과), 최종 결과를 조회하는 엔드포인트"""
+    job = plan_jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다.", "job_id": job_id}), 404
+
+    job.pop('request', None)
+    return jsonify({"success": True, **job})
+
 @app.route('/weather', methods=['POST'])
 def weather_info():
     """날씨 정보만 조회하는 엔드포인트"""
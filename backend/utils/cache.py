@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+CACHE_DB_PATH = os.getenv('CACHE_DB_PATH', 'gta_cache.sqlite3')
+
+_DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y.%m.%d', '%Y%m%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S')
+
+
+class MemoryCache:
+    """TTL + LRU 기반 인메모리 캐시"""
+
+    def __init__(self, namespace: str, max_entries: int = 256, default_ttl: float = 3600):
+        self.namespace = namespace
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at < time.time():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'backend': 'memory',
+            'entries': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class SQLiteCache:
+    """TTL + LRU 기반 SQLite 디스크 캐시 (값은 JSON으로 직렬화, 프로세스 간 공유 가능)"""
+
+    def __init__(self, namespace: str, path: str = CACHE_DB_PATH, max_entries: int = 1024,
+                 default_ttl: float = 3600):
+        self.namespace = namespace
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'namespace TEXT, key TEXT, value TEXT, expires_at REAL, last_access REAL, '
+                'PRIMARY KEY (namespace, key))'
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션(커밋/롤백)이 끝나면 닫히는 연결"""
+        with closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+            yield conn
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    conn.execute('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', (self.namespace, key))
+                self.misses += 1
+                return None
+            conn.execute(
+                'UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?',
+                (now, self.namespace, key)
+            )
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)',
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), now + ttl, now)
+            )
+            count = conn.execute(
+                'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE rowid IN ('
+                    'SELECT rowid FROM cache_entries WHERE namespace = ? ORDER BY last_access LIMIT ?)',
+                    (self.namespace, overflow)
+                )
+                self.evictions += overflow
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries = conn.execute(
+                'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'backend': 'sqlite',
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# 생성된 캐시 목록 (통계 조회용)
+_caches: Dict[str, Any] = {}
+_caches_lock = threading.Lock()
+
+
+def make_cache(namespace: str, backend: str = 'memory', max_entries: int = 256, default_ttl: float = 3600):
+    """backend('memory' | 'sqlite' | 'off')에 맞는 캐시 생성 - 'off'이면 None 반환"""
+    backend = (backend or 'memory').lower()
+    if backend == 'off':
+        return None
+    if backend == 'sqlite':
+        cache = SQLiteCache(namespace, max_entries=max_entries, default_ttl=default_ttl)
+    else:
+        cache = MemoryCache(namespace, max_entries=max_entries, default_ttl=default_ttl)
+    with _caches_lock:
+        _caches[namespace] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 캐시의 hit/miss 통계"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.namespace: cache.stats() for cache in caches}
+
+
+def normalize_text(value: Any) -> str:
+    """NFKC 정규화, 앞뒤 공백/구두점 제거, 연속 공백 축소, casefold"""
+    text = unicodedata.normalize('NFKC', str(value or ''))
+    text = re.sub(r'\s+', ' ', text).strip(' .,!?;:')
+    return text.casefold()
+
+
+def normalize_date(value: Any) -> str:
+    """여러 형식의 날짜 문자열을 ISO(YYYY-MM-DD)로 변환 - 해석할 수 없으면 정규화된 원문 반환"""
+    text = str(value or '').strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return normalize_text(text)
+
+
+def normalize_number(value: Any) -> str:
+    """'2', 2, '2.0' 등을 같은 값으로 정규화"""
+    try:
+        number = float(str(value).replace(',', '').strip())
+    except (TypeError, ValueError):
+        return normalize_text(value)
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+PLAN_REQUEST_FIELDS = ('departure', 'destination', 'start_date', 'end_date', 'people', 'budget', 'purpose')
+
+_FIELD_NORMALIZERS = {
+    'start_date': normalize_date,
+    'end_date': normalize_date,
+    'people': normalize_number,
+    'budget': normalize_number,
+}
+
+
+def canonicalize_plan_request(data: Dict[str, Any], fields: Iterable[str] = PLAN_REQUEST_FIELDS) -> Dict[str, str]:
+    """여행 요청에서 fields에 해당하는 값만 골라 정규화"""
+    return {
+        field: _FIELD_NORMALIZERS.get(field, normalize_text)(data.get(field, ''))
+        for field in fields
+    }
+
+
+def cache_key(payload: Any) -> str:
+    """JSON 직렬화가 가능한 값으로부터 내용 기반(sha256) 캐시 키 생성"""
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def plan_cache_key(data: Dict[str, Any]) -> str:
+    fields = canonicalize_plan_request(data)
+    models = data.get('models')
+    if isinstance(models, dict) and models:
+        # 요청 단위 모델 지정이 다르면 다른 결과
+        fields['models'] = {str(section): normalize_text(model) for section, model in models.items()}
+    return cache_key(fields)
@@ -0,0 +1,101 @@
+import re
+from datetime import date
+from typing import Any, Dict, Optional
+
+from backend.utils.cache import normalize_text
+
+# 월별 기후 평년값 (기상청 1991~2020 평년값 기준 근사치)
+# min/max: 월평균 최저/최고기온(°C), rain_days: 월평균 강수일수(일강수량 0.1mm 이상)
+CLIMATE_NORMALS = {
+    'seoul': {
+        'min': [-5.5, -3.2, 1.9, 7.8, 13.2, 18.2, 21.9, 22.4, 17.2, 10.2, 3.2, -3.3],
+        'max': [1.6, 4.6, 10.6, 17.8, 23.4, 27.4, 29.1, 30.0, 26.1, 19.9, 11.5, 3.6],
+        'rain_days': [8, 7, 8, 8, 9, 10, 16, 15, 9, 6, 9, 8],
+    },
+    'busan': {
+        'min': [-0.9, 0.7, 4.9, 9.8, 14.3, 18.3, 22.2, 23.4, 19.7, 14.2, 7.6, 1.6],
+        'max': [8.2, 10.1, 13.8, 18.6, 22.3, 25.0, 27.8, 29.7, 26.6, 22.6, 16.5, 10.5],
+        'rain_days': [5, 6, 8, 9, 9, 11, 13, 12, 9, 6, 6, 4],
+    },
+    'jeju': {
+        'min': [3.3, 3.9, 6.4, 10.3, 14.5, 18.5, 23.2, 24.0, 20.3, 15.1, 9.8, 5.3],
+        'max': [8.6, 9.8, 13.3, 18.1, 22.1, 25.1, 29.1, 30.1, 26.6, 22.2, 16.4, 11.1],
+        'rain_days': [15, 12, 12, 10, 10, 12, 13, 14, 12, 8, 11, 14],
+    },
+    'gangneung': {
+        'min': [-3.5, -2.3, 1.8, 7.1, 12.3, 16.6, 20.6, 21.1, 16.6, 10.6, 4.6, -1.4],
+        'max': [5.2, 6.9, 11.4, 18.3, 22.6, 25.4, 28.0, 28.5, 24.6, 20.1, 13.7, 7.3],
+        'rain_days': [6, 6, 8, 8, 9, 11, 14, 14, 11, 7, 7, 5],
+    },
+    'daegu': {
+        'min': [-3.9, -1.8, 3.1, 8.7, 13.9, 18.7, 22.4, 22.9, 18.0, 11.4, 4.6, -1.6],
+        'max': [5.7, 8.6, 14.2, 20.6, 25.5, 28.7, 30.5, 31.1, 26.9, 21.6, 14.4, 7.6],
+        'rain_days': [4, 5, 7, 8, 9, 10, 14, 13, 9, 5, 5, 3],
+    },
+    # 중부 내륙
+    'daejeon': {
+        'min': [-4.2, -2.2, 2.5, 8.0, 13.5, 18.5, 22.3, 22.7, 17.6, 10.7, 3.8, -2.3],
+        'max': [3.9, 6.8, 12.6, 19.6, 24.7, 28.1, 29.7, 30.6, 26.6, 20.7, 12.9, 5.6],
+        'rain_days': [7, 6, 8, 8, 9, 10, 15, 14, 9, 6, 8, 7],
+    },
+}
+
+CLIMATE_ALIASES = {
+    '서울': 'seoul', '인천': 'seoul', '수원': 'seoul', '가평': 'seoul', '춘천': 'seoul',
+    '부산': 'busan', '울산': 'busan', '통영': 'busan', '거제': 'busan', '여수': 'busan',
+    '제주': 'jeju', '제주도': 'jeju', '서귀포': 'jeju',
+    '강릉': 'gangneung', '속초': 'gangneung', '양양': 'gangneung', '동해': 'gangneung',
+    '대구': 'daegu', '경주': 'daegu', '안동': 'daegu', '포항': 'daegu',
+    '대전': 'daejeon', '세종': 'daejeon', '청주': 'daejeon', '천안': 'daejeon', '공주': 'daejeon',
+}
+
+_TOKEN_RE = re.compile(r'\w+')
+_ADMIN_SUFFIX_RE = re.compile(r'(?<=\w)(특별자치시|특별자치도|특별시|광역시|시|군|도)$')
+
+_DAYS_IN_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+def climate_region(destination: str) -> Optional[str]:
+    """목적지를 평년값 지역 키로 변환 (평년값이 없는 지역이면 None)
+
+    단어 단위로 비교하고 행정구역 접미사(광역시, 시, 군 등)만 떼어 보므로
+    '부산 해운대', '울산광역시'는 찾지만 '울산바위' 같은 지명은 잘못 매칭하지 않는다.
+    """
+    key = normalize_text(destination)
+    for token in [key] + _TOKEN_RE.findall(key):
+        for name in (token, _ADMIN_SUFFIX_RE.sub('', token)):
+            if name in CLIMATE_NORMALS:
+                return name
+            if name in CLIMATE_ALIASES:
+                return CLIMATE_ALIASES[name]
+    return None
+
+
+def climatology_day(destination: str, day: date) -> Optional[Dict[str, Any]]:
+    """해당 날짜가 속한 달의 평년값을 예보와 같은 형태의 일별 dict로 반환 (평년값이 없는 지역이면 None)
+
+    다른 기후대(해외 등)에 국내 값을 잘못 적용하지 않도록 지원 지역이 아니면 추정하지 않는다.
+    """
+    region = climate_region(destination)
+    if region is None:
+        return None
+    normals = CLIMATE_NORMALS[region]
+    m = day.month - 1
+    pop = int(round(normals['rain_days'][m] / _DAYS_IN_MONTH[m] * 100))
+    if pop >= 45:
+        condition = '비 오는 날 잦음'
+    elif pop >= 30:
+        condition = '구름 많고 가끔 비'
+    else:
+        condition = '대체로 맑음'
+    return {
+        'date': day.isoformat(),
+        'temp_min': normals['min'][m],
+        'temp_max': normals['max'][m],
+        'temp_mean': round((normals['min'][m] + normals['max'][m]) / 2, 1),
+        'pop': pop,
+        'humidity': None,
+        'condition': condition,
+        'source': 'climatology',
+        'region': region,
+    }
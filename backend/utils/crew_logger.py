@@ -1,49 +1,29 @@
 import logging
 import time
-import json
-from datetime import datetime
 from functools import wraps
-from typing import Any, Dict, Optional
-import inspect
+from typing import Any, Dict
+from backend.utils.log_pipeline import setup_logger
+from backend.utils.metrics import function_duration
+from backend.utils.trace_store import record_event
 
 class CrewWorkflowLogger:
     """CrewAI workflow 실시간 디버깅 및 로깅 시스템"""
     
     def __init__(self, log_level=logging.INFO):
-        self.logger = logging.getLogger('crewai_workflow')
-        self.logger.setLevel(log_level)
-        
-        # 중복 핸들러 방지
-        if not self.logger.handlers:
-            # 파일 핸들러
-            file_handler = logging.FileHandler('crewai_workflow.log', encoding='utf-8')
-            file_handler.setLevel(log_level)
-            
-            # 콘솔 핸들러
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(log_level)
-            
-            # 포맷터
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            file_handler.setFormatter(formatter)
-            console_handler.setFormatter(formatter)
-            
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+        # 큐 기반 비동기 기록 + 크기 로테이션 (중복 핸들러는 setup_logger에서 방지)
+        self.logger = setup_logger('crewai_workflow', 'crewai_workflow.log', log_level)
     
     def log_tool_execution(self, tool_name: str, input_data: Any, output_data: Any, execution_time: float):
         """툴 실행 로깅"""
         log_data = {
-            'type': 'tool_execution',
+            'phase': 'tool',
             'tool_name': tool_name,
             'input': str(input_data)[:500] if input_data else None,
             'output': str(output_data)[:500] if output_data else None,
-            'execution_time': f"{execution_time:.3f}초",
-            'timestamp': datetime.now().isoformat()
+            'start': round(time.time() - execution_time, 3),
+            'duration': round(execution_time, 3),
         }
+        record_event(log_data)
         
         self.logger.info(f"🔧 TOOL: {tool_name}")
         self.logger.info(f"   ⏱️  실행시간: {execution_time:.3f}초")
@@ -54,14 +34,15 @@ class CrewWorkflowLogger:
                       result: Any, execution_time: float):
         """에이전트 태스크 실행 로깅"""
         log_data = {
-            'type': 'agent_task',
-            'agent_name': agent_name,
+            'phase': 'agent_task',
+            'agent': agent_name,
             'task_name': task_name,
             'task_description': task_description[:200],
             'result': str(result)[:500] if result else None,
-            'execution_time': f"{execution_time:.3f}초",
-            'timestamp': datetime.now().isoformat()
+            'start': round(time.time() - execution_time, 3),
+            'duration': round(execution_time, 3),
         }
+        record_event(log_data)
         
         self.logger.info(f"🤖 AGENT: {agent_name}")
         self.logger.info(f"   📋 TASK: {task_name}")
@@ -130,12 +111,17 @@ def log_function_execution(func_name: str):
                 result = func(*args, **kwargs)
                 execution_time = time.time() - start_time
                 crew_logger.logger.info(f"✅ {func_name} 완료 - {execution_time:.3f}초")
+                function_duration.observe(execution_time, function=func_name)
+                record_event({'phase': 'function', 'name': func_name, 'start': round(start_time, 3),
+                              'duration': round(execution_time, 3), 'ok': True})
                 return result
             except Exception as e:
                 execution_time = time.time() - start_time
                 crew_logger.log_error(f"{func_name}_error", str(e), {
                     'execution_time': execution_time
                 })
+                record_event({'phase': 'function', 'name': func_name, 'start': round(start_time, 3),
+                              'duration': round(execution_time, 3), 'ok': False})
                 raise
         return wrapper
     return decorator
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+_EPOCH = date(1970, 1, 1)
+
+
+def _forecast_columns(forecasts: List[Dict[str, Any]]):
+    """여러 도시의 OpenWeather 5일 예보 응답을 열(column) 배열로 변환
+
+    각 도시의 timezone(초)을 반영해 현지 날짜 기준으로 일자를 나눈다.
+    """
+    city_idx, local_day, dt, temp, pop, humidity, desc = [], [], [], [], [], [], []
+    desc_codes: Dict[str, int] = {}
+    for i, forecast_data in enumerate(forecasts):
+        entries = (forecast_data or {}).get('list') or []
+        tz_offset = int(((forecast_data or {}).get('city') or {}).get('timezone', 0) or 0)
+        for entry in entries:
+            ts = int(entry['dt'])
+            city_idx.append(i)
+            dt.append(ts)
+            local_day.append((ts + tz_offset) // SECONDS_PER_DAY)
+            temp.append(entry['main']['temp'])
+            humidity.append(entry['main'].get('humidity', np.nan))
+            pop.append(entry.get('pop', 0.0) or 0.0)
+            description = entry['weather'][0]['description'] if entry.get('weather') else ''
+            desc.append(desc_codes.setdefault(description, len(desc_codes)))
+    descriptions = np.array(list(desc_codes), dtype=object)
+    columns = {
+        'city': np.array(city_idx, dtype=np.int64),
+        'day': np.array(local_day, dtype=np.int64),
+        'dt': np.array(dt, dtype=np.int64),
+        'temp': np.array(temp, dtype=np.float64),
+        'pop': np.array(pop, dtype=np.float64),
+        'humidity': np.array(humidity, dtype=np.float64),
+        'desc': np.array(desc, dtype=np.int64),
+    }
+    return columns, descriptions
+
+
+def aggregate_daily_forecasts(forecasts: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """여러 도시의 3시간 간격 예보를 한 번의 벡터 연산으로 일별 요약
+
+    입력 순서와 같은 순서로 도시별 일별 요약 리스트를 반환한다. 각 항목은
+    date(ISO), temp_min/temp_max/temp_mean(°C), pop(최대 강수확률 %), humidity(평균 %),
+    condition(가장 많이 나온 날씨 설명), count(집계된 예보 개수)를 가진다.
+    """
+    results: List[List[Dict[str, Any]]] = [[] for _ in forecasts]
+    columns, descriptions = _forecast_columns(forecasts)
+    if columns['dt'].size == 0:
+        return results
+
+    # (도시, 현지 날짜, 시각) 순으로 정렬 후 (도시, 날짜) 그룹 경계 계산
+    order = np.lexsort((columns['dt'], columns['day'], columns['city']))
+    city = columns['city'][order]
+    day = columns['day'][order]
+    temp = columns['temp'][order]
+    pop = columns['pop'][order]
+    humidity = columns['humidity'][order]
+    desc = columns['desc'][order]
+
+    boundary = np.empty(city.size, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = (city[1:] != city[:-1]) | (day[1:] != day[:-1])
+    starts = np.flatnonzero(boundary)
+    group = np.cumsum(boundary) - 1
+    counts = np.diff(np.append(starts, city.size))
+
+    temp_min = np.minimum.reduceat(temp, starts)
+    temp_max = np.maximum.reduceat(temp, starts)
+    temp_mean = np.add.reduceat(temp, starts) / counts
+    pop_max = np.maximum.reduceat(pop, starts)
+    humidity_valid = ~np.isnan(humidity)
+    humidity_sum = np.add.reduceat(np.where(humidity_valid, humidity, 0.0), starts)
+    humidity_count = np.add.reduceat(humidity_valid.astype(np.int64), starts)
+    humidity_mean = np.divide(
+        humidity_sum, humidity_count,
+        out=np.full(starts.size, np.nan), where=humidity_count > 0
+    )
+
+    # 최빈 날씨 설명: (그룹, 설명코드) 쌍의 개수를 한 번에 세고 행별 argmax
+    # 동률이면 코드가 작은(먼저 등장한) 설명을 선택
+    n_desc = len(descriptions)
+    desc_counts = np.bincount(group * n_desc + desc, minlength=starts.size * n_desc).reshape(starts.size, n_desc)
+    modal = desc_counts.argmax(axis=1)
+
+    for g, start in enumerate(starts):
+        results[int(city[start])].append({
+            'date': (_EPOCH + timedelta(days=int(day[start]))).isoformat(),
+            'temp_min': round(float(temp_min[g]), 1),
+            'temp_max': round(float(temp_max[g]), 1),
+            'temp_mean': round(float(temp_mean[g]), 1),
+            'pop': int(round(float(pop_max[g]) * 100)),
+            'humidity': None if np.isnan(humidity_mean[g]) else int(round(float(humidity_mean[g]))),
+            'condition': descriptions[modal[g]],
+            'count': int(counts[g]),
+        })
+    return results
@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.utils.metrics import provider_for_host, record_external_call
+from backend.utils.rate_limiter import RATE_LIMIT_RETRIES, get_limiter, retry_after_seconds
+
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '20'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.3'))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class InstrumentedSession(requests.Session):
+    """제공자(serper/naver/openweather 등)별 속도 제한을 거쳐 호출하고 호출 수, 실패 수, 소요시간을 기록하는 세션
+
+    429 응답은 제공자 백오프(Retry-After)가 끝난 뒤 RATE_LIMIT_RETRIES회까지 다시 시도한다.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        provider = provider_for_host(urlsplit(url).hostname)
+        limiter = get_limiter(provider)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            start = time.time()
+            response = None
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            finally:
+                status = response.status_code if response is not None else None
+                record_external_call(provider, time.time() - start, status is not None and status < 400)
+                if limiter is not None:
+                    retry_after = retry_after_seconds(response.headers) if status == 429 else None
+                    limiter.release(status, retry_after)
+            if status != 429 or limiter is None or attempt >= RATE_LIMIT_RETRIES:
+                return response
+            # 버리는 429 응답의 연결을 풀에 돌려준 뒤 다음 acquire()에서 백오프가 끝나길 기다림
+            response.close()
+            attempt += 1
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'POST']),
+        raise_on_status=False,
+        # 429는 여기서 재시도하지 않고 InstrumentedSession이 제공자 백오프에 반영한 뒤 재시도
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = InstrumentedSession()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """외부 API 호출에 공유하는 keep-alive 연결 풀 + 재시도 설정된 requests.Session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
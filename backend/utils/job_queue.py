@@ -0,0 +1,252 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from backend.utils.crew_logger import crew_logger
+from backend.utils.rate_limiter import BATCH, request_priority
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+PLAN_JOB_WORKERS = int(os.getenv('PLAN_JOB_WORKERS', '2'))
+PLAN_JOB_QUEUE_SIZE = int(os.getenv('PLAN_JOB_QUEUE_SIZE', '10'))
+PLAN_JOB_TTL = float(os.getenv('PLAN_JOB_TTL', '3600'))
+PLAN_JOB_DB = os.getenv('PLAN_JOB_DB', '')
+
+
+class QueueFullError(Exception):
+    """작업 큐가 가득 차서 새 작업을 받을 수 없을 때 발생"""
+
+
+def _new_job(job_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
+    now = time.time()
+    return {
+        'job_id': job_id,
+        'status': JOB_QUEUED,
+        'request': request_data,
+        'sections': {},
+        'result': None,
+        'error': None,
+        'created_at': now,
+        'started_at': None,
+        'finished_at': None,
+    }
+
+
+class InMemoryJobStore:
+    """프로세스 내부 dict 기반 작업 저장소"""
+
+    def __init__(self, ttl: float = PLAN_JOB_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        job = _new_job(job_id, request_data)
+        with self._lock:
+            self._jobs[job_id] = job
+        return dict(job)
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def set_section(self, job_id: str, section: str, content: str):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id]['sections'][section] = content
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+            job['sections'] = dict(job['sections'])
+            return job
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def cleanup(self):
+        """TTL이 지난 완료/실패 작업 삭제"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """SQLite 파일 기반 작업 저장소 (여러 gunicorn 워커가 같은 작업 상태를 조회할 수 있음)"""
+
+    def __init__(self, path: str, ttl: float = PLAN_JOB_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS plan_jobs ('
+                'job_id TEXT PRIMARY KEY, status TEXT, request TEXT, sections TEXT, '
+                'result TEXT, error TEXT, created_at REAL, started_at REAL, finished_at REAL)'
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션(커밋/롤백)이 끝나면 닫히는 연결"""
+        with closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+            yield conn
+
+    def create(self, job_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        job = _new_job(job_id, request_data)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT INTO plan_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, job['status'], json.dumps(request_data, ensure_ascii=False), '{}',
+                 None, None, job['created_at'], None, None)
+            )
+        return job
+
+    def update(self, job_id: str, **fields):
+        if not fields:
+            return
+        columns = []
+        values = []
+        for key, value in fields.items():
+            if key in ('request', 'sections', 'result') and value is not None:
+                value = json.dumps(value, ensure_ascii=False)
+            columns.append(f'{key} = ?')
+            values.append(value)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE plan_jobs SET {', '.join(columns)} WHERE job_id = ?", (*values, job_id))
+
+    def set_section(self, job_id: str, section: str, content: str):
+        with self._lock, self._connect() as conn:
+            row = conn.execute('SELECT sections FROM plan_jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if row is None:
+                return
+            sections = json.loads(row[0] or '{}')
+            sections[section] = content
+            conn.execute(
+                'UPDATE plan_jobs SET sections = ? WHERE job_id = ?',
+                (json.dumps(sections, ensure_ascii=False), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT job_id, status, request, sections, result, error, created_at, started_at, finished_at '
+                'FROM plan_jobs WHERE job_id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row[0],
+            'status': row[1],
+            'request': json.loads(row[2]) if row[2] else None,
+            'sections': json.loads(row[3]) if row[3] else {},
+            'result': json.loads(row[4]) if row[4] else None,
+            'error': row[5],
+            'created_at': row[6],
+            'started_at': row[7],
+            'finished_at': row[8],
+        }
+
+    def delete(self, job_id: str):
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM plan_jobs WHERE job_id = ?', (job_id,))
+
+    def cleanup(self):
+        """TTL이 지난 완료/실패 작업 삭제"""
+        cutoff = time.time() - self.ttl
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM plan_jobs WHERE finished_at IS NOT NULL AND finished_at < ?', (cutoff,))
+
+
+class PlanJobQueue:
+    """여행 계획 생성 작업 큐
+
+    HTTP 요청 스레드는 작업을 큐에 넣고 즉시 반환하며, 별도의 워커 스레드들이
+    event_source(data)가 내보내는 섹션 이벤트를 저장소에 기록한다.
+    대기 중인 작업이 max_queue를 넘으면 QueueFullError를 발생시킨다.
+    """
+
+    def __init__(self, event_source: Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]],
+                 store=None, workers: int = PLAN_JOB_WORKERS, max_queue: int = PLAN_JOB_QUEUE_SIZE):
+        self.event_source = event_source
+        self.store = store if store is not None else (
+            SQLiteJobStore(PLAN_JOB_DB) if PLAN_JOB_DB else InMemoryJobStore()
+        )
+        self.workers = max(1, workers)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    def _ensure_workers(self):
+        # gunicorn fork 이후 처음 작업이 들어올 때 워커 스레드를 시작
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f'plan-job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, data: Dict[str, Any]) -> str:
+        """작업을 큐에 넣고 작업 ID 반환"""
+        self._ensure_workers()
+        self.store.cleanup()
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, data)
+        try:
+            self._queue.put_nowait((job_id, data))
+        except queue.Full:
+            # 호출자는 작업 ID를 받지 못하므로 기록도 남기지 않음
+            self.store.delete(job_id)
+            raise QueueFullError(f"대기 중인 작업이 너무 많습니다 (최대 {self._queue.maxsize}개)") from None
+        crew_logger.logger.info(f"📥 여행 계획 작업 등록: {job_id} (대기 {self._queue.qsize()}개)")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _worker_loop(self):
+        while True:
+            job_id, data = self._queue.get()
+            try:
+                self._run_job(job_id, data)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id: str, data: Dict[str, Any]):
+        self.store.update(job_id, status=JOB_RUNNING, started_at=time.time())
+        sections = {}
+        try:
+            # 비동기 작업의 외부 API 호출은 대화형 요청(/plan, /plan/stream)에 양보
+            with request_priority(BATCH):
+                for event in self.event_source(data):
+                    if 'content' in event:
+                        sections[event['event']] = event['content']
+                        self.store.set_section(job_id, event['event'], event['content'])
+            self.store.update(job_id, status=JOB_COMPLETED, result=sections, finished_at=time.time())
+            crew_logger.logger.info(f"✅ 여행 계획 작업 완료: {job_id}")
+        except Exception as e:
+            self.store.update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+            crew_logger.log_error("plan_job_error", str(e), {'job_id': job_id})
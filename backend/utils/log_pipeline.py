@@ -0,0 +1,120 @@
+import atexit
+import gzip
+import logging
+import os
+import queue
+import random
+import shutil
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Callable, List
+
+# 로그 파이프라인 설정
+# 요청 스레드는 로그 레코드를 큐에 넣기만 하고, 포맷팅/파일 쓰기/로테이션은 리스너 스레드가 처리
+LOG_ASYNC = os.getenv('LOG_ASYNC', '1') == '1'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+LOG_COMPRESS = os.getenv('LOG_COMPRESS', '1') == '1'
+LOG_CONSOLE = os.getenv('LOG_CONSOLE', '1') == '1'
+PROMPT_LOG_SAMPLE_RATE = float(os.getenv('PROMPT_LOG_SAMPLE_RATE', '0.1'))
+
+_listeners: List[QueueListener] = []
+_listeners_lock = threading.Lock()
+
+
+class LazyMessage:
+    """str() 될 때(리스너 스레드에서 포맷팅할 때) 메시지를 만드는 지연 메시지"""
+
+    def __init__(self, build: Callable[..., str], *args: Any, **kwargs: Any):
+        self._build = build
+        self._args = args
+        self._kwargs = kwargs
+
+    def __str__(self) -> str:
+        return self._build(*self._args, **self._kwargs)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는 핸들러 - 큐가 가득 차면 블로킹 대신 버림"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 안의 큐이므로 pickle용 사전 포맷팅이 필요 없음
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def _build_handlers(filename: str, level: int, fmt: str, console: bool) -> List[logging.Handler]:
+    formatter = logging.Formatter(fmt, datefmt='%Y-%m-%d %H:%M:%S')
+    file_handler = RotatingFileHandler(
+        filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    if LOG_COMPRESS:
+        file_handler.rotator = _gzip_rotator
+        file_handler.namer = lambda name: name + '.gz'
+    handlers: List[logging.Handler] = [file_handler]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logger(name: str, filename: str, level: int = logging.INFO, fmt: str = DEFAULT_FORMAT,
+                 console: bool = LOG_CONSOLE) -> logging.Logger:
+    """크기 기반 로테이션(+gzip 압축) 파일 + 콘솔로 기록하는 로거 (LOG_ASYNC=1이면 큐 경유 비동기 기록)"""
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    # 루트 로거(app.py의 basicConfig)로 전파되면 같은 줄이 요청 스레드에서 동기로 한 번 더 기록됨
+    logger.propagate = False
+    # 중복 핸들러 방지
+    if logger.handlers:
+        return logger
+
+    handlers = _build_handlers(filename, level, fmt, console)
+    if not LOG_ASYNC:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    with _listeners_lock:
+        _listeners.append(listener)
+    return logger
+
+
+def should_log_full_prompt() -> bool:
+    """프롬프트/응답 전문을 기록할지 샘플링 (PROMPT_LOG_SAMPLE_RATE 비율)"""
+    return PROMPT_LOG_SAMPLE_RATE >= 1 or random.random() < PROMPT_LOG_SAMPLE_RATE
+
+
+@atexit.register
+def flush_logs():
+    """종료 시 큐에 남은 로그를 모두 기록"""
+    with _listeners_lock:
+        listeners = list(_listeners)
+        _listeners.clear()
+    for listener in listeners:
+        listener.stop()
@@ -0,0 +1,212 @@
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Prometheus 텍스트 노출 형식(0.0.4)으로 /metrics를 제공하는 최소 레지스트리
+# 값은 워커 프로세스별로 집계된다 (gunicorn 워커가 여럿이면 스크레이프마다 다른 워커가 응답할 수 있음)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+EXTERNAL_CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _ValueMetric(_Metric):
+    """라벨 조합별 단일 값을 갖는 지표 (Counter/Gauge 공통)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_function(self, function: Callable[[], Dict[LabelValues, float]]):
+        """스크레이프 시점에 {라벨 값 튜플: 값}을 계산하는 함수 등록 (라벨이 없으면 {(): 값})"""
+        self._function = function
+
+    def render(self) -> List[str]:
+        if self._function is not None:
+            try:
+                items = sorted(self._function().items())
+            except Exception:
+                items = []
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Counter(_ValueMetric):
+    kind = 'counter'
+
+
+class Gauge(_ValueMetric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.setdefault(key, [0] * (len(self.buckets) + 2))
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = self.header()
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {_format_value(state[-1])}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(round(state[-2], 6))}")
+            lines.append(f"{self.name}_count{plain} {_format_value(state[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---- 애플리케이션 지표 ----
+
+plan_duration = registry.register(Histogram(
+    'gta_plan_duration_seconds', "여행 계획 생성 전체 소요시간", ('cached',)))
+plans_total = registry.register(Counter(
+    'gta_plans_total', "여행 계획 생성 횟수", ('status',)))
+plans_in_flight = registry.register(Gauge(
+    'gta_plans_in_flight', "진행 중인 여행 계획 생성 수"))
+section_duration = registry.register(Histogram(
+    'gta_section_duration_seconds', "섹션(에이전트)별 소요시간", ('section', 'cached')))
+sections_total = registry.register(Counter(
+    'gta_sections_total', "섹션 실행 횟수", ('section', 'status')))
+function_duration = registry.register(Histogram(
+    'gta_function_duration_seconds', "사전 수집 함수(log_function_execution) 소요시간", ('function',),
+    buckets=EXTERNAL_CALL_BUCKETS))
+external_calls = registry.register(Counter(
+    'gta_external_calls_total', "외부 API 호출 수", ('provider',)))
+external_call_failures = registry.register(Counter(
+    'gta_external_call_failures_total', "외부 API 호출 실패 수 (연결 오류, 4xx/5xx 응답)", ('provider',)))
+external_call_duration = registry.register(Histogram(
+    'gta_external_call_duration_seconds', "외부 API 호출 소요시간", ('provider',), buckets=EXTERNAL_CALL_BUCKETS))
+queue_depth = registry.register(Gauge(
+    'gta_plan_job_queue_depth', "대기 중인 비동기 여행 계획 작업 수"))
+coalesced_requests = registry.register(Counter(
+    'gta_plan_coalesced_requests_total', "진행 중인 동일 요청에 합류한 요청 수"))
+rate_limit_wait = registry.register(Histogram(
+    'gta_rate_limit_wait_seconds', "외부 API 호출 전 속도 제한 대기시간", ('provider', 'priority'),
+    buckets=EXTERNAL_CALL_BUCKETS))
+rate_limit_throttled = registry.register(Counter(
+    'gta_rate_limit_throttled_total', "외부 API 429(요청 과다) 응답 수", ('provider',)))
+rate_limit_rate = registry.register(Gauge(
+    'gta_rate_limit_rate', "제공자별 현재 허용 호출 속도(초당, 429 이후 낮아졌다가 회복)", ('provider',)))
+model_escalations = registry.register(Counter(
+    'gta_model_escalations_total', "출력 검증 실패로 상위 모델로 재실행한 횟수", ('section', 'from_model', 'to_model')))
+cache_hit_ratio = registry.register(Gauge(
+    'gta_cache_hit_ratio', "캐시 적중률", ('cache',)))
+cache_requests = registry.register(Counter(
+    'gta_cache_requests_total', "캐시 조회 수", ('cache', 'result')))
+
+_PROVIDER_HOSTS = {
+    'google.serper.dev': 'serper',
+    'openapi.naver.com': 'naver',
+    'api.openweathermap.org': 'openweather',
+    'api.openai.com': 'openai',
+}
+
+
+def provider_for_host(host: str) -> str:
+    return _PROVIDER_HOSTS.get((host or '').lower(), 'other')
+
+
+def record_external_call(provider: str, duration: float, ok: bool):
+    external_calls.inc(provider=provider)
+    external_call_duration.observe(duration, provider=provider)
+    if not ok:
+        external_call_failures.inc(provider=provider)
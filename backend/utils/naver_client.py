@@ -0,0 +1,119 @@
+import contextvars
+import html
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+from backend.utils.cache import cache_key, make_cache, normalize_text
+from backend.utils.crew_logger import crew_logger
+from backend.utils.http_client import get_http_session
+from backend.utils.singleflight import SingleFlight
+from backend.utils.trace_store import incr
+
+NAVER_SEARCH_URL = "https://openapi.naver.com/v1/search/{search_type}.json"
+NAVER_CACHE_BACKEND = os.getenv('NAVER_CACHE_BACKEND', 'memory')
+NAVER_CACHE_TTL = float(os.getenv('NAVER_CACHE_TTL', '21600'))
+NAVER_CACHE_MAX_ENTRIES = int(os.getenv('NAVER_CACHE_MAX_ENTRIES', '1024'))
+NAVER_MAX_WORKERS = int(os.getenv('NAVER_MAX_WORKERS', '4'))
+
+# 검색 종류별 display 최대값 (네이버 검색 API 제한)
+MAX_DISPLAY = {'local': 5, 'blog': 100, 'news': 100, 'webkr': 100}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _clean(text: str) -> str:
+    """검색어 강조 <b> 태그와 HTML 엔티티 제거"""
+    return html.unescape(_TAG_RE.sub('', text or '')).strip()
+
+
+class NaverSearchClient:
+    """네이버 검색 API 공용 클라이언트
+
+    공용 HTTP 세션으로 호출하고, (검색 종류, 정규화 검색어, 개수) 단위로 결과를
+    TTL 캐시에 보관한다. 필요한 개수만 display로 요청해 쿼터를 아낀다.
+    """
+
+    def __init__(self, backend: str = NAVER_CACHE_BACKEND, ttl: float = NAVER_CACHE_TTL,
+                 max_entries: int = NAVER_CACHE_MAX_ENTRIES):
+        self.cache = make_cache('naver', backend, max_entries=max_entries, default_ttl=ttl)
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=NAVER_MAX_WORKERS, thread_name_prefix='naver')
+
+    def _fetch(self, query: str, search_type: str, display: int) -> List[Dict[str, Any]]:
+        client_id = os.getenv('NAVER_CLIENT_ID')
+        client_secret = os.getenv('NAVER_CLIENT_SECRET')
+        if not client_id or not client_secret:
+            raise RuntimeError("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET이 설정되지 않았습니다.")
+        incr('naver_external_calls')
+        response = get_http_session().get(
+            NAVER_SEARCH_URL.format(search_type=search_type),
+            params={'query': query, 'display': display, 'sort': 'sim'},
+            headers={'X-Naver-Client-Id': client_id, 'X-Naver-Client-Secret': client_secret},
+            timeout=10
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"네이버 검색 실패 (상태 코드: {response.status_code})")
+        items = response.json().get('items', [])[:display]
+        return [
+            {
+                'title': _clean(item.get('title')),
+                'description': _clean(item.get('description')),
+                'link': item.get('link', ''),
+                'category': _clean(item.get('category')),
+                'address': item.get('roadAddress') or item.get('address', ''),
+            }
+            for item in items
+        ]
+
+    def search(self, query: str, search_type: str = 'local', display: int = 5) -> List[Dict[str, Any]]:
+        """검색 결과 리스트 - 실패 시 빈 리스트"""
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+        display = max(1, min(display, MAX_DISPLAY.get(search_type, 100)))
+        key = cache_key({'type': search_type, 'q': normalized, 'display': display})
+        incr('naver_requests')
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                incr('naver_cache_hits')
+                return cached
+
+        def load():
+            results = self._fetch(query.strip(), search_type, display)
+            if self.cache is not None:
+                self.cache.set(key, results)
+            return results
+
+        try:
+            results, _ = self._flight.do(key, load)
+        except Exception as e:
+            crew_logger.log_error("naver_search_error", str(e), {'query': query})
+            return []
+        return results
+
+    def search_many(self, queries: Sequence[str], search_type: str = 'local',
+                    display: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """여러 검색어를 동시에 조회 - {검색어: 결과} (입력 순서 유지)"""
+        futures = [
+            (query, self._executor.submit(contextvars.copy_context().run, self.search, query, search_type, display))
+            for query in queries
+        ]
+        return {query: future.result() for query, future in futures}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_naver_client() -> NaverSearchClient:
+    """프로세스 전체에서 공유하는 NaverSearchClient"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = NaverSearchClient()
+    return _client
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Mapping, Optional
+
+from backend.utils import metrics
+
+# 외부 API 제공자별 호출 속도/동시성 제어 (프로세스 단위)
+# - 토큰 버킷: 초당 RATE_LIMIT_<PROVIDER>_RPS개, 최대 RATE_LIMIT_<PROVIDER>_BURST개까지 몰아서 호출
+# - 동시 호출 수: RATE_LIMIT_<PROVIDER>_CONCURRENCY (0이면 제한 없음)
+# - 429 응답을 받으면 Retry-After(없으면 지수 백오프)만큼 해당 제공자 호출을 모두 멈추고
+#   호출 속도를 절반으로 낮춘 뒤, 성공 응답마다 조금씩 원래 속도로 회복
+# - 배치 작업(/plan/jobs)은 대화형 요청이 기다리는 동안 양보하고 동시 호출 수의 일부만 사용
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+
+# 제공자: (초당 호출 수, 버스트, 동시 호출 수) - 0이면 해당 제한 없음
+_DEFAULT_LIMITS = {
+    'openai': (5.0, 10, 8),
+    'serper': (5.0, 10, 5),
+    'naver': (10.0, 10, 5),
+    'openweather': (1.0, 10, 4),
+}
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '30'))
+RATE_LIMIT_BATCH_SHARE = float(os.getenv('RATE_LIMIT_BATCH_SHARE', '0.5'))
+RATE_LIMIT_BACKOFF_BASE = float(os.getenv('RATE_LIMIT_BACKOFF_BASE', '1'))
+RATE_LIMIT_BACKOFF_MAX = float(os.getenv('RATE_LIMIT_BACKOFF_MAX', '60'))
+# 429 응답 후 공용 HTTP 세션이 백오프를 기다렸다가 다시 시도하는 횟수
+RATE_LIMIT_RETRIES = int(os.getenv('RATE_LIMIT_RETRIES', '2'))
+
+_priority: ContextVar[str] = ContextVar('request_priority', default=INTERACTIVE)
+
+
+class RateLimitTimeout(RuntimeError):
+    """RATE_LIMIT_MAX_WAIT 안에 호출 차례를 받지 못함"""
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """with 블록 안(및 copy_context로 넘긴 스레드)의 외부 호출 우선순위 지정"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Retry-After(초 또는 HTTP 날짜) / retry-after-ms 헤더를 초 단위로 변환"""
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderLimiter:
+    """제공자 하나의 토큰 버킷 + 동시 호출 제한 + 429 적응형 백오프"""
+
+    def __init__(self, provider: str, rate: float, burst: int, concurrency: int):
+        self.provider = provider
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.concurrency = concurrency
+        self.active = 0
+        self.throttled = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._throttle_streak = 0
+        self._waiting = {INTERACTIVE: 0, BATCH: 0}
+        self._cond = threading.Condition()
+
+    def _slots(self, priority: str) -> int:
+        if priority == BATCH:
+            return max(1, int(self.concurrency * RATE_LIMIT_BATCH_SHARE))
+        return self.concurrency
+
+    def _wait_time(self, priority: str, now: float) -> Optional[float]:
+        """지금 호출할 수 있으면 0, 아니면 기다릴 시간 (None이면 다른 호출이 끝날 때까지)"""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if priority == BATCH and self._waiting[INTERACTIVE]:
+            return None
+        if self.concurrency and self.active >= self._slots(priority):
+            return None
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+        return 0.0
+
+    def acquire(self, priority: Optional[str] = None, timeout: float = RATE_LIMIT_MAX_WAIT):
+        """호출 차례가 올 때까지 대기 - 끝나면 반드시 release() 호출"""
+        priority = priority or current_priority()
+        start = time.monotonic()
+        deadline = start + timeout
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait_time(priority, now)
+                    if wait == 0:
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise RateLimitTimeout(f"{self.provider} 호출 대기 시간 초과 ({timeout:g}초)")
+                    self._cond.wait(remaining if wait is None else min(wait, remaining))
+                if self.rate > 0:
+                    self._tokens -= 1
+                self.active += 1
+            finally:
+                self._waiting[priority] -= 1
+                # 대화형 대기자가 빠지면 배치 대기자가 다시 확인하도록 깨움
+                self._cond.notify_all()
+        metrics.rate_limit_wait.observe(time.monotonic() - start, provider=self.provider, priority=priority)
+
+    def release(self, status: Optional[int] = None, retry_after: Optional[float] = None):
+        """호출 종료 - status가 429면 백오프, 성공(4xx 미만)이면 호출 속도 회복"""
+        with self._cond:
+            self.active -= 1
+            now = time.monotonic()
+            if status == 429:
+                self.throttled += 1
+                self._throttle_streak += 1
+                backoff = retry_after if retry_after is not None else min(
+                    RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * 2 ** (self._throttle_streak - 1)
+                )
+                self._blocked_until = max(self._blocked_until, now + backoff)
+                if self.max_rate > 0:
+                    self.rate = max(self.max_rate * 0.1, self.rate * 0.5)
+                    # 백오프가 끝난 시점부터 줄어든 속도로 충전 (대기 중 쌓인 토큰으로 몰아서 호출하지 않음)
+                    self._tokens = 0.0
+                    self._updated = self._blocked_until
+                metrics.rate_limit_throttled.inc(provider=self.provider)
+            elif status is not None and status < 400:
+                self._throttle_streak = 0
+                if self.rate < self.max_rate:
+                    self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                'rate': round(self.rate, 3),
+                'active': self.active,
+                'waiting': sum(self._waiting.values()),
+                'throttled': self.throttled,
+            }
+
+
+_limiters: Dict[str, Optional[ProviderLimiter]] = {}
+_limiters_lock = threading.Lock()
+
+
+def _build_limiter(provider: str) -> Optional[ProviderLimiter]:
+    if not RATE_LIMIT_ENABLED or provider not in _DEFAULT_LIMITS:
+        return None
+    rate, burst, concurrency = _DEFAULT_LIMITS[provider]
+    prefix = f'RATE_LIMIT_{provider.upper()}'
+    return ProviderLimiter(
+        provider,
+        rate=float(os.getenv(f'{prefix}_RPS', str(rate))),
+        burst=int(os.getenv(f'{prefix}_BURST', str(burst))),
+        concurrency=int(os.getenv(f'{prefix}_CONCURRENCY', str(concurrency))),
+    )
+
+
+def get_limiter(provider: str) -> Optional[ProviderLimiter]:
+    """제공자별 공용 ProviderLimiter - 제한 대상이 아니면 None"""
+    if provider not in _limiters:
+        with _limiters_lock:
+            if provider not in _limiters:
+                _limiters[provider] = _build_limiter(provider)
+    return _limiters[provider]
+
+
+def limiter_stats() -> Dict[str, Dict[str, float]]:
+    return {provider: limiter.stats() for provider, limiter in list(_limiters.items()) if limiter is not None}
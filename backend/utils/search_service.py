@@ -0,0 +1,135 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+from backend.utils.cache import cache_key, make_cache, normalize_text
+from backend.utils.crew_logger import crew_logger
+from backend.utils.http_client import get_http_session
+from backend.utils.singleflight import SingleFlight
+from backend.utils.trace_store import incr
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '21600'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '2048'))
+SEARCH_CACHE_BACKEND = os.getenv('SEARCH_CACHE_BACKEND', 'memory')
+SEARCH_CACHE_DISK = os.getenv('SEARCH_CACHE_DISK', '1') == '1'
+SEARCH_MAX_WORKERS = int(os.getenv('SEARCH_MAX_WORKERS', '8'))
+
+
+def normalize_query(query: str) -> str:
+    """대소문자/공백/유니코드 표기 차이를 없애 같은 검색어를 같은 키로 취급"""
+    return normalize_text(query)
+
+
+class SearchService:
+    """Serper 웹 검색 공용 서비스
+
+    - 검색어 정규화 후 TTL/LRU 메모리 캐시 → SQLite 디스크 캐시 순으로 조회
+    - 같은 검색어의 동시 요청은 외부 호출 한 번으로 합침 (single-flight)
+    - 캐시 적중률과 외부 호출 수는 /metrics의 gta_cache_*, gta_external_calls_total 지표로 확인
+    """
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+                 backend: str = SEARCH_CACHE_BACKEND, disk: bool = SEARCH_CACHE_DISK):
+        backend = (backend or 'memory').lower()
+        if backend not in ('memory', 'off'):
+            # 디스크 계층은 SEARCH_CACHE_DISK로 따로 켜므로 앞단 캐시는 메모리만 허용
+            raise ValueError(f"SEARCH_CACHE_BACKEND는 memory 또는 off만 지원합니다: {backend} (디스크 캐시는 SEARCH_CACHE_DISK)")
+        self.ttl = ttl
+        self.memory = make_cache('search', backend, max_entries=max_entries, default_ttl=ttl)
+        disk = disk and self.memory is not None
+        self.disk = make_cache('search_disk', 'sqlite', max_entries=max_entries * 4, default_ttl=ttl) if disk else None
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=SEARCH_MAX_WORKERS, thread_name_prefix='search')
+
+    def _fetch(self, query: str, num: int) -> List[Dict[str, Any]]:
+        api_key = os.getenv('SERPER_API_KEY')
+        if not api_key:
+            raise RuntimeError("SERPER_API_KEY가 설정되지 않았습니다.")
+        incr('search_external_calls')
+        response = get_http_session().post(
+            SERPER_SEARCH_URL,
+            json={'q': query, 'gl': 'kr', 'hl': 'ko', 'num': num},
+            headers={'X-API-KEY': api_key, 'Content-Type': 'application/json'},
+            timeout=15
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Serper 검색 실패 (상태 코드: {response.status_code})")
+        payload = response.json()
+        return [
+            {
+                'title': item.get('title', ''),
+                'link': item.get('link', ''),
+                'snippet': item.get('snippet', ''),
+            }
+            for item in payload.get('organic', [])[:num]
+        ]
+
+    def search(self, query: str, num: int = 10) -> List[Dict[str, Any]]:
+        """웹 검색 결과(title, link, snippet) 리스트 - 실패 시 빈 리스트"""
+        normalized = normalize_query(query)
+        if not normalized:
+            return []
+        incr('search_requests')
+        key = cache_key({'q': normalized, 'num': num})
+
+        if self.memory is not None:
+            results = self.memory.get(key)
+            if results is not None:
+                incr('search_cache_hits')
+                return results
+        if self.disk is not None:
+            results = self.disk.get(key)
+            if results is not None:
+                incr('search_cache_hits')
+                self.memory.set(key, results)
+                return results
+
+        def load():
+            fetched = self._fetch(query.strip(), num)
+            if self.memory is not None:
+                self.memory.set(key, fetched)
+            if self.disk is not None:
+                self.disk.set(key, fetched)
+            return fetched
+
+        try:
+            results, _ = self._flight.do(key, load)
+        except Exception as e:
+            crew_logger.log_error("search_error", str(e), {'query': query})
+            return []
+        return results
+
+    def search_many(self, queries: Sequence[str], num: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """여러 검색어를 동시에 조회 - {검색어: 결과} (입력 순서 유지)"""
+        futures = [
+            (query, self._executor.submit(contextvars.copy_context().run, self.search, query, num))
+            for query in queries
+        ]
+        return {query: future.result() for query, future in futures}
+
+
+def format_search_results(results: List[Dict[str, Any]]) -> str:
+    """에이전트에게 전달할 검색 결과 텍스트"""
+    if not results:
+        return "검색 결과가 없습니다."
+    lines = []
+    for i, item in enumerate(results, 1):
+        lines.append(f"{i}. {item['title']}\n   링크: {item['link']}\n   요약: {item['snippet']}")
+    return "\n".join(lines)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_search_service() -> SearchService:
+    """프로세스 전체에서 공유하는 SearchService"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SearchService()
+    return _service
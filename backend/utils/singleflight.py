@@ -0,0 +1,130 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합쳐 결과를 공유
+
+    먼저 들어온 호출(리더)만 fn을 실행하고, 실행 중에 같은 키로 들어온 호출은
+    리더가 끝날 때까지 기다렸다가 같은 결과(또는 예외)를 받는다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(결과, 다른 호출의 결과를 공유했는지 여부) 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class _Broadcast:
+    """진행 중인 이벤트 스트림 - 모든 이벤트를 보관해 늦게 합류한 구독자도 처음부터 재생"""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def publish(self, event: Any):
+        with self.cond:
+            self.events.append(event)
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def subscribe(self) -> Iterator[Any]:
+        position = 0
+        while True:
+            with self.cond:
+                while position >= len(self.events) and not self.closed:
+                    self.cond.wait()
+                batch = self.events[position:]
+                position = len(self.events)
+                if not batch and self.closed:
+                    return
+            yield from batch
+
+
+class StreamSingleFlight:
+    """같은 키의 동시 스트리밍 요청이 하나의 이벤트 생성 작업을 공유
+
+    첫 요청이 별도 스레드에서 event_source(data)를 실행하고, 실행 중에 같은 키로 들어온
+    요청은 지금까지의 이벤트를 재생한 뒤 이어지는 이벤트를 함께 받는다.
+    생성 작업은 구독자 연결이 끊겨도 끝까지 실행되며, 끝나면 키가 해제된다.
+    """
+
+    def __init__(self, event_source: Callable[[Any], Iterator[Any]],
+                 on_error: Optional[Callable[[Exception], Any]] = None):
+        self._source = event_source
+        self._on_error = on_error
+        self._active: Dict[Hashable, _Broadcast] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def subscribe(self, key: Hashable, data: Any) -> Tuple[Iterator[Any], bool]:
+        """(이벤트 이터레이터, 진행 중인 작업에 합류했는지 여부) 반환"""
+        with self._lock:
+            broadcast = self._active.get(key)
+            shared = broadcast is not None
+            if shared:
+                self.coalesced += 1
+            else:
+                broadcast = _Broadcast()
+                self._active[key] = broadcast
+        if not shared:
+            threading.Thread(
+                target=self._produce, args=(key, broadcast, data), name='stream-singleflight', daemon=True
+            ).start()
+        return broadcast.subscribe(), shared
+
+    def _produce(self, key: Hashable, broadcast: _Broadcast, data: Any):
+        try:
+            for event in self._source(data):
+                broadcast.publish(event)
+        except Exception as e:
+            if self._on_error is not None:
+                broadcast.publish(self._on_error(e))
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+            broadcast.close()
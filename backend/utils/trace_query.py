@@ -0,0 +1,128 @@
+"""추적 로그(gta_traces.jsonl) 집계 CLI
+
+사용 예:
+    python -m backend.utils.trace_query --hours 6 agents
+    python -m backend.utils.trace_query --hours 24 destinations --top 10
+    python -m backend.utils.trace_query trace <trace_id>
+"""
+import argparse
+import glob
+import gzip
+import json
+import math
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List
+
+from backend.utils.trace_store import TRACE_LOG_PATH
+
+
+def iter_events(path: str = TRACE_LOG_PATH, since: float = 0.0) -> Iterator[Dict[str, Any]]:
+    """현재 파일과 로테이션된 파일(.N, .N.gz)의 이벤트 중 since 이후 것만 반환"""
+    for file_path in sorted(glob.glob(f"{path}.*"), reverse=True) + [path]:
+        opener = gzip.open if file_path.endswith('.gz') else open
+        try:
+            with opener(file_path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event.get('end', event.get('start', 0)) >= since:
+                        yield event
+        except FileNotFoundError:
+            continue
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def agent_summary(events: Iterator[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """에이전트(섹션)별 소요시간 분포, 토큰, 도구 호출, 캐시 적중 요약 - p95 내림차순"""
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for event in events:
+        if event.get('phase') == 'section':
+            groups[event.get('agent') or '?'].append(event)
+    rows = []
+    for agent, items in groups.items():
+        durations = [e['duration'] for e in items if not e.get('cached')]
+        runs = max(1, len(durations))
+        rows.append({
+            'agent': agent,
+            'count': len(items),
+            'cached': sum(1 for e in items if e.get('cached')),
+            'errors': sum(1 for e in items if e.get('ok') is False),
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'max': max(durations, default=0.0),
+            'avg_prompt_tokens': sum(e.get('prompt_tokens', e.get('prompt_tokens_est', 0)) for e in items) / runs,
+            'avg_completion_tokens': sum(e.get('completion_tokens', 0) for e in items) / runs,
+            'avg_tool_calls': sum(e.get('tool_calls', 0) for e in items) / runs,
+            'search_cache_hits': sum(e.get('counters', {}).get('search_cache_hits', 0) for e in items),
+        })
+    return sorted(rows, key=lambda row: row['p95'], reverse=True)
+
+
+def destination_summary(events: Iterator[Dict[str, Any]], top: int = 10) -> List[Dict[str, Any]]:
+    """목적지별 전체 계획 생성 시간 - 평균 내림차순 상위 top개 (캐시 응답 제외)"""
+    groups: Dict[str, List[float]] = defaultdict(list)
+    for event in events:
+        if event.get('phase') == 'plan' and not event.get('cached'):
+            groups[event.get('destination') or '?'].append(event['duration'])
+    rows = [
+        {
+            'destination': destination,
+            'count': len(durations),
+            'mean': sum(durations) / len(durations),
+            'p95': percentile(durations, 95),
+            'max': max(durations),
+        }
+        for destination, durations in groups.items()
+    ]
+    return sorted(rows, key=lambda row: row['mean'], reverse=True)[:top]
+
+
+def _print_table(rows: List[Dict[str, Any]]):
+    if not rows:
+        print("기록된 이벤트가 없습니다.")
+        return
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.2f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GTA 추적 로그 집계")
+    parser.add_argument('--path', default=TRACE_LOG_PATH, help="추적 로그 파일 경로")
+    parser.add_argument('--hours', type=float, default=24, help="최근 N시간 이벤트만 집계")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('agents', help="에이전트별 p50/p95 소요시간, 토큰, 도구 호출")
+    destinations = sub.add_parser('destinations', help="전체 생성 시간이 긴 목적지")
+    destinations.add_argument('--top', type=int, default=10)
+    trace = sub.add_parser('trace', help="trace_id 하나의 이벤트를 시간순 출력")
+    trace.add_argument('trace_id')
+    args = parser.parse_args()
+
+    since = time.time() - args.hours * 3600
+    events = iter_events(args.path, since)
+    if args.command == 'agents':
+        _print_table(agent_summary(events))
+    elif args.command == 'destinations':
+        _print_table(destination_summary(events, args.top))
+    else:
+        matched = sorted((e for e in events if e.get('trace_id') == args.trace_id), key=lambda e: e.get('start', 0))
+        for event in matched:
+            print(json.dumps(event, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
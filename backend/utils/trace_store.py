@@ -0,0 +1,90 @@
+import json
+import os
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from backend.utils.log_pipeline import LazyMessage, setup_logger
+
+# 요청 단위 추적 이벤트를 JSON Lines로 기록 (조회: python -m backend.utils.trace_query)
+TRACE_ENABLED = os.getenv('TRACE_ENABLED', '1') == '1'
+TRACE_LOG_PATH = os.getenv('TRACE_LOG_PATH', 'gta_traces.jsonl')
+
+_trace_logger = None
+_trace: ContextVar[Optional[Dict[str, Any]]] = ContextVar('trace', default=None)
+_span: ContextVar[Optional[Dict[str, Any]]] = ContextVar('trace_span', default=None)
+
+
+def _logger():
+    global _trace_logger
+    if _trace_logger is None:
+        _trace_logger = setup_logger('gta_traces', TRACE_LOG_PATH, fmt='%(message)s', console=False)
+        _trace_logger.propagate = False
+    return _trace_logger
+
+
+def _reset(var: ContextVar, token):
+    try:
+        var.reset(token)
+    except ValueError:
+        # 제너레이터가 다른 스레드/컨텍스트에서 정리되는 경우
+        pass
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str] = None, **attrs: Any) -> Iterator[str]:
+    """with 블록 안에서 기록되는 이벤트에 trace_id와 공통 속성(예: destination)을 붙임"""
+    trace = {'trace_id': trace_id or uuid.uuid4().hex, **attrs}
+    token = _trace.set(trace)
+    try:
+        yield trace['trace_id']
+    finally:
+        _reset(_trace, token)
+
+
+def record_event(event: Dict[str, Any]):
+    """이벤트 한 줄 기록 - 직렬화와 파일 쓰기는 로그 스레드에서 수행"""
+    if not TRACE_ENABLED:
+        return
+    trace = _trace.get() or {}
+    record = {'ts': datetime.now().isoformat(timespec='milliseconds'), **trace, **event}
+    _logger().info('%s', LazyMessage(json.dumps, record, ensure_ascii=False, default=str))
+
+
+@contextmanager
+def trace_span(phase: str, agent: Optional[str] = None, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """구간의 시작/종료 시각과 소요시간, 구간 안에서 incr()로 센 카운터를 이벤트로 기록
+
+    yield된 dict에 값을 넣으면 이벤트 필드로 함께 기록된다.
+    """
+    span = {'phase': phase, 'agent': agent, **fields}
+    counters: Counter = Counter()
+    token = _span.set({'counters': counters})
+    start = time.time()
+    try:
+        yield span
+    except BaseException:
+        span.setdefault('ok', False)
+        raise
+    finally:
+        _reset(_span, token)
+        end = time.time()
+        span.update({
+            'start': round(start, 3),
+            'end': round(end, 3),
+            'duration': round(end - start, 3),
+        })
+        if counters:
+            span['counters'] = dict(counters)
+        record_event(span)
+
+
+def incr(name: str, amount: int = 1):
+    """현재 구간의 카운터 증가 (예: search_cache_hits) - 구간 밖이면 무시"""
+    span = _span.get()
+    if span is not None:
+        span['counters'][name] += amount
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Good Travel Agent - 여행 계획 생성 벤치마크
+
+OpenAI / Serper / Naver / OpenWeather를 실제로 호출하지 않고, 지연시간 분포를
+설정할 수 있는 로컬 대역(stub)으로 바꾼 뒤 get_travel_plan_with_crew 또는
+Flask /plan 라우트에 동시 부하를 걸어 p50/p95/p99 지연시간, 처리량,
+에이전트(섹션)별 소요시간을 JSON으로 기록한다.
+
+예시:
+    python -m benchmarks.bench_plan --target crew --requests 20 --concurrency 5
+    python -m benchmarks.bench_plan --target flask --llm-median 1.5 --output bench_results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+SECTIONS = ['weather', 'transport', 'hotel', 'plan', 'food']
+DESTINATIONS = ['제주도', '부산', '강릉', '경주', '여수', '전주', '속초', '서울']
+
+
+class LatencyModel:
+    """시드 고정 로그정규 지연시간 분포 (median 초, sigma)"""
+
+    def __init__(self, median: float, sigma: float, seed: int):
+        self.median = median
+        self.sigma = sigma
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.median <= 0:
+            return 0.0
+        with self._lock:
+            return self.median * math.exp(self._rng.gauss(0.0, self.sigma))
+
+    def sleep(self):
+        time.sleep(self.sample())
+
+
+class StubResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+
+class StubHTTPSession:
+    """OpenWeather, Serper, 네이버 검색 엔드포인트를 흉내내는 requests.Session 대역"""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.latency.sleep()
+        now = int(time.time())
+        if 'openapi.naver.com' in url:
+            params = params or {}
+            return StubResponse(200, {'items': stub_search_results(params.get('query', ''), params.get('display', 5))})
+        if 'geo/1.0/direct' in url:
+            return StubResponse(200, [{'lat': 37.5, 'lon': 127.0}])
+        if 'forecast' in url:
+            return StubResponse(200, {
+                'city': {'timezone': 32400},
+                'list': [
+                    {
+                        'dt': now + 3 * 3600 * i,
+                        'main': {'temp': 12 + (i % 8), 'humidity': 60},
+                        'pop': (i % 5) / 10,
+                        'weather': [{'description': ['맑음', '구름 조금', '흐림', '비'][i % 4]}],
+                    }
+                    for i in range(40)
+                ],
+            })
+        return StubResponse(200, {
+            'main': {'temp': 15.0, 'feels_like': 14.0, 'humidity': 55},
+            'weather': [{'description': '맑음'}],
+            'wind': {'speed': 2.0},
+        })
+
+    def post(self, url, json=None, headers=None, timeout=None, **kwargs):
+        self.latency.sleep()
+        query = (json or {}).get('q', '')
+        return StubResponse(200, {'organic': stub_search_results(query)})
+
+
+def stub_search_results(query, count=5):
+    return [
+        {
+            'title': f"{query} 결과 {i}",
+            'link': f"https://example.com/{abs(hash((query, i))) % 100000}",
+            'snippet': f"{query} 관련 정보 {i} - 1박 {8 + i}만원",
+            'description': f"{query} 관련 정보 {i}",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+STUB_OUTPUTS = {
+    'weather': "| 날짜 | 날씨 | 기온(°C) | 강수확률 | 추천 옷차림 | 필수 준비물 | 주의사항 |\n|---|---|---|---|---|---|---|\n| 03/15 | 맑음 | 8-17 | 10% | 긴팔+겉옷 | 선크림 | 일교차 |",
+    'transport': "| 순위 | 교통수단 | 소요시간 | 총비용 | 예약방법 | 장점 | 단점 | 추천이유 |\n|---|---|---|---|---|---|---|---|\n| 1 | KTX | 2시간30분 | 12만원 | 코레일톡 | 빠름 | 비쌈 | 시간 절약 |",
+    'hotel': "| 순위 | 숙소명 | 유형 | 위치 | 1박요금 | 총비용 | 주요시설 | 장점 | 단점 | 예약링크 |\n|---|---|---|---|---|---|---|---|---|---|\n| 1 | 벤치호텔 | 호텔 | 시내 | 10만원 | 30만원 | 조식 | 교통 | 소음 | example.com |",
+    'plan': "| 일차 | 시간 | 장소/활동 | 소요시간 | 예상비용 | 이동방법 | 예약필요 | 준비물/팁 |\n|---|---|---|---|---|---|---|---|\n| 1일차 | 09:00 | 명소 | 2시간 | 무료 | 도보 | X | 편한 신발 |",
+    'food': "| 순위 | 맛집명 | 음식종류 | 가격대 | 대표메뉴 | 위치 | 예약방법 | 추천시간 | 특징/팁 |\n|---|---|---|---|---|---|---|---|---|\n| 1 | 벤치식당 | 한식 | 1만원 | 국수 | 시내 | 불필요 | 점심 | 대기 |",
+}
+
+
+class StubTask:
+    """crewai.Task 대역"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def make_stub_crew(llm_latency: LatencyModel, llm_turns: int):
+    """crewai.Crew 대역 - LLM 호출 llm_turns회에 해당하는 지연 후 고정 마크다운 반환"""
+    from backend.agents.execution_budget import current_run
+
+    class StubCrew:
+        def __init__(self, tasks=None, **kwargs):
+            self.tasks = tasks or []
+
+        def kickoff(self, *args, **kwargs):
+            for _ in range(llm_turns):
+                llm_latency.sleep()
+                run = current_run()
+                if run is not None:
+                    run.on_llm_call()
+            section = getattr(self.tasks[0], 'name', '') if self.tasks else ''
+            return STUB_OUTPUTS.get(section, 'ok')
+
+    return StubCrew
+
+
+def install_stubs(args):
+    """백엔드 모듈의 외부 호출 지점을 로컬 대역으로 교체하고 섹션별 소요시간 기록 리스트 반환"""
+    from backend.agents import crew_agent, registry, weather_agent
+    from backend.utils import naver_client, search_service
+
+    llm_latency = LatencyModel(args.llm_median, args.llm_sigma, args.seed)
+    http_latency = LatencyModel(args.http_median, args.http_sigma, args.seed + 1)
+    http_session = StubHTTPSession(http_latency)
+
+    # crewai를 import하지 않도록 Task/Crew 생성과 에이전트 조회를 대역으로 교체
+    registry.new_task = StubTask
+    registry.new_crew = make_stub_crew(llm_latency, args.llm_turns)
+    registry.new_agent = lambda name, model=None: name
+    weather_agent.get_http_session = lambda: http_session
+    search_service.get_http_session = lambda: http_session
+    naver_client.get_http_session = lambda: http_session
+
+    section_timings = []
+    timings_lock = threading.Lock()
+    original_run_section = crew_agent.run_section
+
+    def timed_run_section(section, data, upstream=None):
+        result = original_run_section(section, data, upstream)
+        with timings_lock:
+            section_timings.append((section, result[1]))
+        return result
+
+    crew_agent.run_section = timed_run_section
+    return section_timings
+
+
+def make_requests(count: int, unique: int, seed: int):
+    rng = random.Random(seed)
+    start = date.today() + timedelta(days=1)
+    pool = []
+    for i in range(max(1, unique)):
+        # 출발일이 모두 달라 unique개의 요청이 항상 서로 다름
+        trip_start = start + timedelta(days=i)
+        pool.append({
+            'departure': '서울',
+            'destination': DESTINATIONS[i % len(DESTINATIONS)],
+            'start_date': trip_start.isoformat(),
+            'end_date': (trip_start + timedelta(days=2)).isoformat(),
+            'people': 1 + i % 4,
+            'budget': 30 + 10 * (i % 5),
+            'purpose': '커플여행',
+        })
+    # 중복 없이 순서대로 채운 뒤 섞어서, 서로 다른 요청 수가 정확히 min(unique, count)가 되도록 함
+    payloads = [pool[i % len(pool)] for i in range(count)]
+    rng.shuffle(payloads)
+    return payloads
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1], 4)
+
+
+def summarize(values):
+    return {
+        'count': len(values),
+        'mean': round(sum(values) / len(values), 4) if values else None,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': round(max(values), 4) if values else None,
+    }
+
+
+def run_load(target: str, payloads, concurrency: int):
+    """payloads를 concurrency 개 스레드로 실행하고 (요청별 지연시간, 오류 수, 총 소요시간) 반환"""
+    if target == 'flask':
+        from backend.app import app
+        local = threading.local()
+
+        def call(payload):
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+            response = local.client.post('/plan', json=payload)
+            return response.status_code == 200 and response.get_json().get('success')
+    else:
+        from backend.agents import crew_agent
+
+        def call(payload):
+            result = crew_agent.get_travel_plan_with_crew(payload)
+            return set(result) == set(SECTIONS)
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(payload):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            ok = call(payload)
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, payloads))
+    return latencies, errors, time.perf_counter() - wall_start
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="여행 계획 생성 벤치마크 (외부 API 대역 사용)")
+    parser.add_argument('--target', choices=['crew', 'flask'], default='crew',
+                        help="crew: get_travel_plan_with_crew 직접 호출, flask: /plan 라우트 호출")
+    parser.add_argument('--requests', type=int, default=20, help="총 요청 수")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 요청 수")
+    parser.add_argument('--unique', type=int, default=0, help="서로 다른 요청 수 (0이면 모두 다름)")
+    parser.add_argument('--llm-median', type=float, default=1.0, help="LLM 호출 1회 지연시간 중앙값(초)")
+    parser.add_argument('--llm-sigma', type=float, default=0.3, help="LLM 지연시간 로그정규 sigma")
+    parser.add_argument('--llm-turns', type=int, default=2, help="섹션당 LLM 호출 횟수")
+    parser.add_argument('--http-median', type=float, default=0.1, help="외부 HTTP 호출 지연시간 중앙값(초)")
+    parser.add_argument('--http-sigma', type=float, default=0.3, help="HTTP 지연시간 로그정규 sigma")
+    parser.add_argument('--enable-cache', action='store_true', help="결과 캐시 사용 (기본: 비활성)")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드")
+    parser.add_argument('--output', default='bench_results.json', help="결과 JSON 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 모듈 import 시점에 읽는 설정이므로 import 전에 지정
+    os.environ.setdefault('OPENWEATHER_API_KEY', 'bench')
+    os.environ.setdefault('OPENAI_API_KEY', 'bench')
+    os.environ.setdefault('SERPER_API_KEY', 'bench')
+    os.environ.setdefault('NAVER_CLIENT_ID', 'bench')
+    os.environ.setdefault('NAVER_CLIENT_SECRET', 'bench')
+    if not args.enable_cache:
+        os.environ['PLAN_CACHE_BACKEND'] = 'off'
+        os.environ['SECTION_CACHE_BACKEND'] = 'off'
+        os.environ['SEARCH_CACHE_BACKEND'] = 'off'
+        os.environ['NAVER_CACHE_BACKEND'] = 'off'
+
+    section_timings = install_stubs(args)
+    payloads = make_requests(args.requests, args.unique or args.requests, args.seed)
+
+    print(f"🏁 벤치마크 시작 - target={args.target}, requests={args.requests}, concurrency={args.concurrency}")
+    latencies, errors, wall_time = run_load(args.target, payloads, args.concurrency)
+
+    per_agent = {
+        section: summarize([t for s, t in section_timings if s == section])
+        for section in SECTIONS
+    }
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'args': vars(args),
+        },
+        'latency': summarize(latencies),
+        'throughput_rps': round(len(latencies) / wall_time, 4) if wall_time else None,
+        'wall_time': round(wall_time, 4),
+        'errors': errors,
+        'per_agent': per_agent,
+    }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    lat = report['latency']
+    print(f"⏱️  p50={lat['p50']}s p95={lat['p95']}s p99={lat['p99']}s, 처리량={report['throughput_rps']} req/s, 오류={errors}")
+    for section, stats in per_agent.items():
+        print(f"   - {section}: p50={stats['p50']}s p95={stats['p95']}s (n={stats['count']})")
+    print(f"📄 결과 저장: {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -101,91 +101,84 @@ if submitted:
         st.info("""
         🤖 **AI 에이전트들이 협업하여 여행 계획을 생성하고 있습니다...**
         
-        다음 전문가들이 순차적으로 작업합니다:
+        다음 전문가들이 동시에 작업합니다:
         - 🌤️ 날씨 에이전트: 날씨 분석 및 준비물 추천
         - 🚗 교통 에이전트: 최적 이동수단 검색
         - 🏨 숙박 에이전트: 숙소 추천 및 분석
         - 📅 일정 에이전트: 효율적인 동선 계획
         - 🍽️ 맛집 에이전트: 현지 맛집 추천
         
-        ⏱️ **소요 시간: 약 2-3분** (복잡한 요청일수록 시간이 더 걸릴 수 있습니다)
+        ⏱️ **완료되는 섹션부터 바로 표시됩니다** (전체 완료까지는 복잡한 요청일수록 시간이 더 걸릴 수 있습니다)
         """)
         
-        # 로딩 표시
-        with st.spinner('🔄 AI 에이전트들이 작업 중입니다... 잠시만 기다려주세요!'):
-            try:
-                response = requests.post(f"{BACKEND_URL}/plan", json=data, timeout=300)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    if result.get('success'):
-                        travel_data = result.get('data', {})
-                        
-                        st.success('✅ 여행 계획이 성공적으로 생성되었습니다!')
-                        
-                        # 탭으로 결과 구성
-                        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🌤️ 날씨 & 준비물", "🚗 교통편", "🏨 숙소", "📅 일정", "🍽️ 맛집"])
-                        
-                        with tab1:
-                            st.header("🌤️ 날씨 정보 및 준비물")
-                            if 'weather' in travel_data:
-                                st.markdown(travel_data['weather'], unsafe_allow_html=True)
-                            else:
-                                st.info("날씨 정보를 불러오지 못했습니다.")
-                        
-                        with tab2:
-                            st.header("🚗 교통편 추천")
-                            if 'transport' in travel_data:
-                                st.markdown(travel_data['transport'], unsafe_allow_html=True)
-                            else:
-                                st.info("교통편 정보를 불러오지 못했습니다.")
-                        
-                        with tab3:
-                            st.header("🏨 숙소 추천")
-                            if 'hotel' in travel_data:
-                                st.markdown(travel_data['hotel'], unsafe_allow_html=True)
-                            else:
-                                st.info("숙소 정보를 불러오지 못했습니다.")
-                        
-                        with tab4:
-                            st.header("📅 여행 일정")
-                            if 'plan' in travel_data:
-                                st.markdown(travel_data['plan'], unsafe_allow_html=True)
-                            else:
-                                st.info("일정 정보를 불러오지 못했습니다.")
-                        
-                        with tab5:
-                            st.header("🍽️ 맛집 추천")
-                            if 'food' in travel_data:
-                                st.markdown(travel_data['food'], unsafe_allow_html=True)
-                            else:
-                                st.info("맛집 정보를 불러오지 못했습니다.")
-                                
-                    else:
-                        st.error(f"❌ {result.get('message', '알 수 없는 오류가 발생했습니다.')}")
-                        if result.get('error'):
-                            st.error(f"오류 상세: {result['error']}")
-                else:
+        # 섹션별 탭을 먼저 만들고, 각 에이전트가 끝나는 즉시 내용을 채움
+        progress_bar = st.progress(0, text='🔄 AI 에이전트들이 작업 중입니다... 완료되는 섹션부터 바로 표시됩니다!')
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🌤️ 날씨 & 준비물", "🚗 교통편", "🏨 숙소", "📅 일정", "🍽️ 맛집"])
+        sections = {
+            'weather': (tab1, "🌤️ 날씨 정보 및 준비물", "날씨 정보를 불러오지 못했습니다."),
+            'transport': (tab2, "🚗 교통편 추천", "교통편 정보를 불러오지 못했습니다."),
+            'hotel': (tab3, "🏨 숙소 추천", "숙소 정보를 불러오지 못했습니다."),
+            'plan': (tab4, "📅 여행 일정", "일정 정보를 불러오지 못했습니다."),
+            'food': (tab5, "🍽️ 맛집 추천", "맛집 정보를 불러오지 못했습니다."),
+        }
+        placeholders = {}
+        for key, (tab, header, _) in sections.items():
+            with tab:
+                st.header(header)
+                placeholders[key] = st.empty()
+                placeholders[key].info("⏳ 에이전트가 작업 중입니다...")
+
+        received = set()
+        try:
+            with requests.post(f"{BACKEND_URL}/plan/stream", json=data, stream=True, timeout=(10, 300)) as response:
+                if response.status_code != 200:
                     st.error(f'❌ 서버 오류 (상태 코드: {response.status_code})')
-                    
-            except requests.exceptions.Timeout:
-                st.error("""
-                ⏰ **요청 시간이 초과되었습니다.**
-                
-                AI 에이전트들이 매우 복잡한 분석을 수행하느라 예상보다 시간이 걸렸습니다.
-                
-                **해결 방법:**
-                1. 잠시 후 다시 시도해주세요
-                2. 목적지를 더 구체적으로 입력해보세요
-                3. 특이사항을 간단히 줄여보세요
-                
-                💡 일반적으로 2-3분 내에 완료되지만, 복잡한 요청의 경우 더 오래 걸릴 수 있습니다.
-                """)
-            except requests.exceptions.ConnectionError:
-                st.error('❌ 서버에 연결할 수 없습니다. 백엔드 서버가 실행 중인지 확인해주세요.')
-            except Exception as e:
-                st.error(f'❌ API 요청 실패: {str(e)}')
+                else:
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line:
+                            continue
+                        event = json.loads(line)
+                        event_type = event.get('event')
+
+                        if event_type in sections:
+                            received.add(event_type)
+                            placeholders[event_type].markdown(event.get('content', ''), unsafe_allow_html=True)
+                        elif event_type == 'progress':
+                            completed = event.get('completed', 0)
+                            total = event.get('total', len(sections)) or len(sections)
+                            progress_bar.progress(
+                                completed / total,
+                                text=f"🔄 {completed}/{total} 섹션 완료 ({event.get('elapsed', 0):.0f}초 경과)"
+                            )
+                        elif event_type == 'done':
+                            progress_bar.progress(1.0, text=f"✅ 완료 - 총 소요시간 {event.get('total_time', 0):.0f}초")
+                            st.success('✅ 여행 계획이 성공적으로 생성되었습니다!')
+                        elif event_type == 'error':
+                            st.error(f"❌ {event.get('message', '알 수 없는 오류가 발생했습니다.')}")
+                            if event.get('error'):
+                                st.error(f"오류 상세: {event['error']}")
+
+        except requests.exceptions.Timeout:
+            st.error("""
+            ⏰ **요청 시간이 초과되었습니다.**
+            
+            AI 에이전트들이 매우 복잡한 분석을 수행하느라 예상보다 시간이 걸렸습니다.
+            
+            **해결 방법:**
+            1. 잠시 후 다시 시도해주세요
+            2. 목적지를 더 구체적으로 입력해보세요
+            3. 특이사항을 간단히 줄여보세요
+            
+            💡 일반적으로 2-3분 내에 완료되지만, 복잡한 요청의 경우 더 오래 걸릴 수 있습니다.
+            """)
+        except requests.exceptions.ConnectionError:
+            st.error('❌ 서버에 연결할 수 없습니다. 백엔드 서버가 실행 중인지 확인해주세요.')
+        except Exception as e:
+            st.error(f'❌ API 요청 실패: {str(e)}')
+        finally:
+            for key, (_, _, missing_message) in sections.items():
+                if key not in received:
+                    placeholders[key].info(missing_message)
 
 # 하단 정보
 st.markdown("---")
@@ -0,0 +1,26 @@
+"""gunicorn 설정 - Dockerfile.backend에서 `gunicorn -c gunicorn.conf.py backend.app:app`으로 사용"""
+import os
+import threading
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5555')}"
+# gthread 워커는 긴 /plan 요청이 진행 중이어도 /health에 응답할 수 있음
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+
+# GTA_WARMUP=1이면 워커 포크 직후 백그라운드에서 에이전트/LLM 클라이언트를 미리 생성
+# (/health는 바로 응답하고, 첫 /plan 요청이 crewai import 비용을 치르지 않음)
+GTA_WARMUP = os.getenv('GTA_WARMUP', '0') == '1'
+
+
+def post_fork(server, worker):
+    if not GTA_WARMUP:
+        return
+
+    def warm_up():
+        from backend.agents.registry import warm_up as warm_up_agents
+        elapsed = warm_up_agents()
+        server.log.info(f"worker {worker.pid}: 에이전트 워밍업 {elapsed:.2f}초")
+
+    threading.Thread(target=warm_up, name='agent-warmup', daemon=True).start()
@@ -33,6 +33,9 @@ try:
         print("   - GET  /               : API 정보")
         print("   - GET  /health          : 서버 상태 확인")
         print("   - POST /plan            : 통합 여행 계획 생성")
+        print("   - POST /plan/stream     : 통합 여행 계획 스트리밍 생성 (NDJSON)")
+        print("   - POST /plan/jobs       : 여행 계획 비동기 작업 등록")
+        print("   - GET  /plan/jobs/<id>  : 작업 상태 및 결과 조회")
         print("   - POST /weather         : 날씨 정보만 조회")
         print("⏹️  서버 종료: Ctrl+C")
         print("-" * 50)
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+WAIT_TIMEOUT = 5
+
+
+class FakeClock:
+    """time 모듈 대역 - now를 직접 옮겨 TTL/토큰 버킷 시간을 제어"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def wait_until():
+    """다른 스레드의 상태 변화를 기다리는 함수 - WAIT_TIMEOUT초 안에 조건이 참이 되지 않으면 실패"""
+
+    def wait(predicate):
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while not predicate():
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+
+    return wait
@@ -0,0 +1,123 @@
+import pytest
+
+from backend.utils import cache as cache_module
+from backend.utils.cache import MemoryCache, canonicalize_plan_request, plan_cache_key
+
+BASE_REQUEST = {
+    'departure': '서울',
+    'destination': '제주도',
+    'start_date': '2025-07-01',
+    'end_date': '2025-07-03',
+    'people': 2,
+    'budget': 500000,
+    'purpose': '가족 여행',
+}
+
+
+@pytest.fixture
+def clock(monkeypatch, fake_clock):
+    monkeypatch.setattr(cache_module, 'time', fake_clock)
+    return fake_clock
+
+
+def test_canonicalize_normalizes_text_dates_and_numbers():
+    fields = canonicalize_plan_request({
+        'departure': '  서울 ',
+        'destination': '제주도!',
+        'start_date': '2025/07/01',
+        'end_date': '20250703',
+        'people': '2.0',
+        'budget': '500,000',
+        'purpose': '가족   여행',
+    })
+    assert fields == canonicalize_plan_request(BASE_REQUEST)
+    assert fields['start_date'] == '2025-07-01'
+    assert fields['people'] == '2'
+    assert fields['budget'] == '500000'
+
+
+def test_canonicalize_only_selected_fields():
+    assert canonicalize_plan_request(BASE_REQUEST, ('destination', 'people')) == {'destination': '제주도', 'people': '2'}
+
+
+@pytest.mark.parametrize('left, right', [
+    ({'destination': 'ＪＥＪＵ'}, {'destination': 'jeju'}),
+    ({'departure': 'SEOUL '}, {'departure': 'seoul'}),
+    ({'start_date': '2025.07.01', 'end_date': '2025-07-03T00:00:00'}, {}),
+    ({'people': '2', 'budget': '500000.0'}, {}),
+])
+def test_plan_cache_key_equivalent_requests(left, right):
+    assert plan_cache_key(dict(BASE_REQUEST, **left)) == plan_cache_key(dict(BASE_REQUEST, **right))
+
+
+def test_plan_cache_key_ignores_unrelated_fields():
+    assert plan_cache_key(dict(BASE_REQUEST, request_id='abc', stream=True)) == plan_cache_key(BASE_REQUEST)
+
+
+@pytest.mark.parametrize('change', [
+    {'destination': '부산'},
+    {'end_date': '2025-07-04'},
+    {'people': 3},
+    {'budget': 400000},
+    {'purpose': '출장'},
+])
+def test_plan_cache_key_differs_when_request_differs(change):
+    assert plan_cache_key(dict(BASE_REQUEST, **change)) != plan_cache_key(BASE_REQUEST)
+
+
+def test_plan_cache_key_includes_model_overrides():
+    fast = dict(BASE_REQUEST, models={'plan': 'fast'})
+    assert plan_cache_key(fast) != plan_cache_key(BASE_REQUEST)
+    assert plan_cache_key(dict(BASE_REQUEST, models={'plan': ' FAST '})) == plan_cache_key(fast)
+    assert plan_cache_key(dict(BASE_REQUEST, models={})) == plan_cache_key(BASE_REQUEST)
+
+
+def test_memory_cache_expires_after_ttl(clock):
+    cache = MemoryCache('test', default_ttl=10)
+    cache.set('default', 1)
+    cache.set('short', 2, ttl=1)
+
+    clock.now += 5
+    assert cache.get('short') is None
+    assert cache.get('default') == 1
+
+    clock.now += 6
+    assert cache.get('default') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_memory_cache_evicts_least_recently_used(clock):
+    cache = MemoryCache('test', max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # a가 최근 사용 → b가 가장 오래됨
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_memory_cache_overwrite_refreshes_ttl_and_recency(clock):
+    cache = MemoryCache('test', max_entries=2, default_ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    clock.now += 8
+    cache.set('a', 10)
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    clock.now += 8
+    assert cache.get('a') == 10
+
+
+def test_memory_cache_stats_hit_ratio(clock):
+    cache = MemoryCache('test')
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('a')
+    cache.get('missing')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+    assert stats['hit_ratio'] == pytest.approx(0.6667)
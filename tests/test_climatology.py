@@ -0,0 +1,29 @@
+from datetime import date
+
+import pytest
+
+from backend.utils.climatology import climate_region, climatology_day
+
+
+@pytest.mark.parametrize('destination, region', [
+    ('울산', 'busan'),
+    ('울산광역시', 'busan'),
+    ('부산 해운대', 'busan'),
+    ('서울특별시 강남구', 'seoul'),
+    ('제주도', 'jeju'),
+    ('제주시', 'jeju'),
+    ('강원도 강릉시', 'gangneung'),
+    ('Seoul', 'seoul'),
+])
+def test_climate_region_matches_whole_place_names(destination, region):
+    assert climate_region(destination) == region
+
+
+@pytest.mark.parametrize('destination', ['울산바위', '동해안', '대전차', '파리', ''])
+def test_climate_region_ignores_partial_matches(destination):
+    assert climate_region(destination) is None
+
+
+def test_climatology_day_unknown_region():
+    assert climatology_day('울산바위', date(2025, 7, 1)) is None
+    assert climatology_day('울산', date(2025, 7, 1)) is not None
@@ -0,0 +1,102 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.agents import crew_agent
+from backend.utils import trace_store
+from backend.utils.cache import MemoryCache
+
+REQUEST = {
+    'departure': '서울',
+    'destination': '부산',
+    'start_date': '2025-07-01',
+    'end_date': '2025-07-02',
+    'people': 2,
+    'budget': 300000,
+    'purpose': '관광',
+}
+PROMPT_STATS = {'prompt_tokens': 10, 'fixed_tokens': 5, 'data_tokens': {}, 'budget': 100, 'truncated': []}
+
+
+def table(columns):
+    return "| " + " | ".join(columns) + " |\n|" + "---|" * len(columns) + "\n| " + " | ".join("x" for _ in columns) + " |"
+
+
+@pytest.fixture
+def sections(monkeypatch):
+    """섹션 준비/Crew 실행을 대역으로 바꾸고 {섹션: 출력}과 실행 기록(섹션, 모델) 반환"""
+    monkeypatch.setattr(trace_store, 'TRACE_ENABLED', False)
+    monkeypatch.setattr(crew_agent, 'plan_cache', MemoryCache('plan-test'))
+    monkeypatch.setattr(crew_agent, 'section_cache', MemoryCache('section-test'))
+    outputs = {section: table(spec['required_columns']) for section, spec in crew_agent.SECTION_SPECS.items()}
+    calls = []
+    for section, spec in crew_agent.SECTION_SPECS.items():
+        monkeypatch.setitem(spec, 'render', None)
+        monkeypatch.setitem(spec, 'prepare', lambda *args, **kwargs: ('prompt', 'expected', PROMPT_STATS))
+
+    def kickoff(section, prompt, expected_output, model, usages):
+        calls.append((section, model))
+        return outputs[section]
+
+    monkeypatch.setattr(crew_agent, '_kickoff', kickoff)
+    return outputs, calls
+
+
+def plan(data):
+    events = list(crew_agent.iter_travel_plan_events(dict(data)))
+    return crew_agent.collect_plan_sections(iter(events)), events[-1]
+
+
+def test_valid_plan_is_cached(sections):
+    outputs, calls = sections
+    first, first_done = plan(REQUEST)
+    second, second_done = plan(REQUEST)
+
+    assert first == second == outputs
+    assert (first_done['cached'], second_done['cached']) == (False, True)
+    assert len(calls) == len(crew_agent.SECTION_SPECS)
+
+
+def test_plan_with_invalid_section_is_not_cached(sections):
+    outputs, calls = sections
+    outputs['food'] = "추천할 맛집을 찾지 못했습니다."
+
+    first, first_done = plan(REQUEST)
+    food_runs = sum(1 for section, _ in calls if section == 'food')
+    second, second_done = plan(REQUEST)
+
+    assert first['food'] == second['food'] == outputs['food']
+    assert not first_done['cached'] and not second_done['cached']
+    # 유효한 섹션은 섹션 캐시에서, 검증에 실패한 섹션만 다시 실행
+    assert [section for section, _ in calls[-food_runs:]] == ['food'] * food_runs
+    assert len(calls) == len(crew_agent.SECTION_SPECS) - 1 + 2 * food_runs
+
+
+def test_sections_ready_after_deadline_are_not_submitted(sections, monkeypatch):
+    outputs, calls = sections
+    release = threading.Event()
+    kickoff = crew_agent._kickoff
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, worker, section, *args):
+            submitted.append(section)
+            return super().submit(fn, worker, section, *args)
+
+    def slow_hotel(section, *args):
+        if section == 'hotel':
+            release.wait(5)
+        return kickoff(section, *args)
+
+    monkeypatch.setattr(crew_agent, 'ThreadPoolExecutor', RecordingExecutor)
+    monkeypatch.setattr(crew_agent, '_kickoff', slow_hotel)
+    monkeypatch.setattr(crew_agent, 'CREW_TOTAL_TIMEOUT', 0.2)
+    try:
+        result, done = plan(REQUEST)
+    finally:
+        release.set()
+
+    assert '시간 초과' in result['hotel'] and '시간 초과' in result['plan']
+    assert 'plan' not in submitted
+    assert not done['cached']
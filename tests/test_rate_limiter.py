@@ -0,0 +1,158 @@
+import threading
+
+import pytest
+
+from backend.utils import rate_limiter
+from backend.utils.rate_limiter import (
+    BATCH, INTERACTIVE, ProviderLimiter, RateLimitTimeout, current_priority, request_priority, retry_after_seconds,
+)
+
+TIMEOUT = 5
+
+
+@pytest.fixture
+def clock(monkeypatch, fake_clock):
+    monkeypatch.setattr(rate_limiter, 'time', fake_clock)
+    return fake_clock
+
+
+def acquire_now(limiter, priority=INTERACTIVE) -> bool:
+    """기다리지 않고 호출 차례를 받을 수 있으면 True"""
+    try:
+        limiter.acquire(priority, timeout=0)
+    except RateLimitTimeout:
+        return False
+    return True
+
+
+def test_burst_then_refill_at_rate(clock):
+    limiter = ProviderLimiter('test', rate=2.0, burst=3, concurrency=0)
+
+    assert all(acquire_now(limiter) for _ in range(3))
+    assert not acquire_now(limiter)
+
+    clock.now += 0.25
+    assert not acquire_now(limiter)
+    clock.now += 0.25
+    assert acquire_now(limiter)
+    assert not acquire_now(limiter)
+
+
+def test_refill_is_capped_at_burst(clock):
+    limiter = ProviderLimiter('test', rate=2.0, burst=3, concurrency=0)
+    assert all(acquire_now(limiter) for _ in range(3))
+
+    clock.now += 100
+    assert all(acquire_now(limiter) for _ in range(3))
+    assert not acquire_now(limiter)
+
+
+def test_concurrency_slot_is_returned_on_release(clock):
+    limiter = ProviderLimiter('test', rate=0, burst=1, concurrency=1)
+
+    assert acquire_now(limiter)
+    assert not acquire_now(limiter)
+    limiter.release(200)
+    assert acquire_now(limiter)
+    assert limiter.stats()['active'] == 1
+
+
+def test_batch_uses_only_its_share_of_slots(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_BATCH_SHARE', 0.5)
+    limiter = ProviderLimiter('test', rate=0, burst=1, concurrency=4)
+
+    assert acquire_now(limiter, BATCH)
+    assert acquire_now(limiter, BATCH)
+    assert not acquire_now(limiter, BATCH)
+    assert acquire_now(limiter, INTERACTIVE)
+    assert acquire_now(limiter, INTERACTIVE)
+    assert not acquire_now(limiter, INTERACTIVE)
+
+
+def test_throttle_blocks_halves_rate_and_recovers(clock):
+    limiter = ProviderLimiter('test', rate=4.0, burst=4, concurrency=0)
+    assert acquire_now(limiter)
+    limiter.release(429, retry_after=2)
+
+    assert limiter.stats()['rate'] == 2.0
+    assert limiter.stats()['throttled'] == 1
+    clock.now += 1.9
+    assert not acquire_now(limiter)
+    clock.now += 0.6  # 백오프 종료 후 줄어든 속도(초당 2회)로 0.5초에 1개 충전
+    assert acquire_now(limiter)
+    assert not acquire_now(limiter)
+
+    limiter.release(200)
+    assert limiter.stats()['rate'] == pytest.approx(2.4)
+    for _ in range(10):
+        limiter.active += 1
+        limiter.release(200)
+    assert limiter.stats()['rate'] == 4.0
+
+
+def test_throttle_without_retry_after_backs_off_exponentially(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_BACKOFF_BASE', 1.0)
+    limiter = ProviderLimiter('test', rate=0, burst=1, concurrency=0)
+
+    assert acquire_now(limiter)
+    limiter.release(429)
+    clock.now += 1
+    assert acquire_now(limiter)
+    limiter.release(429)
+    clock.now += 1.5
+    assert not acquire_now(limiter)
+    clock.now += 0.5
+    assert acquire_now(limiter)
+
+
+def test_interactive_waiter_goes_before_earlier_batch_waiter(wait_until):
+    limiter = ProviderLimiter('test', rate=0, burst=1, concurrency=1)
+    limiter.acquire(INTERACTIVE)
+    order = []
+
+    def waiter(priority):
+        limiter.acquire(priority, timeout=TIMEOUT)
+        order.append(priority)
+        limiter.release(200)
+
+    batch = threading.Thread(target=waiter, args=(BATCH,))
+    batch.start()
+    wait_until(lambda: limiter.stats()['waiting'] == 1)
+    interactive = threading.Thread(target=waiter, args=(INTERACTIVE,))
+    interactive.start()
+    wait_until(lambda: limiter.stats()['waiting'] == 2)
+
+    limiter.release(200)
+    batch.join(TIMEOUT)
+    interactive.join(TIMEOUT)
+    assert order == [INTERACTIVE, BATCH]
+
+
+def test_acquire_uses_context_priority(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'RATE_LIMIT_BATCH_SHARE', 0.5)
+    limiter = ProviderLimiter('test', rate=0, burst=1, concurrency=2)
+
+    assert current_priority() == INTERACTIVE
+    with request_priority(BATCH):
+        assert current_priority() == BATCH
+        limiter.acquire(timeout=0)
+        with pytest.raises(RateLimitTimeout):
+            limiter.acquire(timeout=0)
+    assert current_priority() == INTERACTIVE
+    limiter.acquire(timeout=0)
+
+
+@pytest.mark.parametrize('headers, expected', [
+    ({'retry-after': '3'}, 3.0),
+    ({'retry-after-ms': '1500', 'retry-after': '9'}, 1.5),
+    ({'retry-after': '-1'}, 0.0),
+    ({'retry-after': 'soon'}, None),
+    ({}, None),
+])
+def test_retry_after_seconds(headers, expected):
+    assert retry_after_seconds(headers) == expected
+
+
+def test_retry_after_http_date(clock):
+    clock.now = 1_700_000_000
+    assert retry_after_seconds({'retry-after': 'Tue, 14 Nov 2023 22:13:30 GMT'}) == pytest.approx(10.0)
@@ -0,0 +1,150 @@
+import threading
+
+import pytest
+
+from backend.utils.singleflight import SingleFlight, StreamSingleFlight
+
+TIMEOUT = 5
+
+
+def gated_source(gate, calls, events=('start', 'middle', 'end')):
+    """첫 이벤트 후 gate가 열릴 때까지 멈추는 이벤트 생성기"""
+
+    def source(data):
+        calls.append(data)
+        yield events[0]
+        assert gate.wait(TIMEOUT)
+        yield from events[1:]
+
+    return source
+
+
+def key_released(flights, key):
+    """같은 키로 다시 구독했을 때 새 작업이 시작되면 True"""
+    events, shared = flights.subscribe(key, None)
+    list(events)
+    return not shared
+
+
+def test_stream_fans_out_to_concurrent_subscribers():
+    gate, calls = threading.Event(), []
+    flights = StreamSingleFlight(gated_source(gate, calls))
+
+    first, first_shared = flights.subscribe('key', {'n': 1})
+    assert next(first) == 'start'
+    second, second_shared = flights.subscribe('key', {'n': 2})
+    gate.set()
+
+    assert (first_shared, second_shared) == (False, True)
+    assert list(first) == ['middle', 'end']
+    assert list(second) == ['start', 'middle', 'end']  # 늦게 합류해도 처음부터 재생
+    assert calls == [{'n': 1}]
+    assert flights.coalesced == 1
+    assert key_released(flights, 'key')
+
+
+def test_stream_different_keys_run_separately():
+    gate, calls = threading.Event(), []
+    gate.set()
+    flights = StreamSingleFlight(gated_source(gate, calls))
+
+    a, a_shared = flights.subscribe('a', 'a')
+    b, b_shared = flights.subscribe('b', 'b')
+
+    assert list(a) == list(b) == ['start', 'middle', 'end']
+    assert not a_shared and not b_shared
+    assert sorted(calls) == ['a', 'b']
+
+
+def test_stream_key_released_after_completion():
+    gate, calls = threading.Event(), []
+    gate.set()
+    flights = StreamSingleFlight(gated_source(gate, calls))
+
+    list(flights.subscribe('key', 1)[0])
+    events, shared = flights.subscribe('key', 2)
+    list(events)
+
+    assert not shared
+    assert calls == [1, 2]
+
+
+def test_stream_error_is_published_to_every_subscriber():
+    gate = threading.Event()
+
+    def source(data):
+        yield 'start'
+        assert gate.wait(TIMEOUT)
+        raise RuntimeError('boom')
+
+    flights = StreamSingleFlight(source, on_error=lambda e: {'error': str(e)})
+    first, _ = flights.subscribe('key', None)
+    assert next(first) == 'start'
+    second, shared = flights.subscribe('key', None)
+    gate.set()
+
+    assert shared
+    assert list(first) == [{'error': 'boom'}]
+    assert list(second) == ['start', {'error': 'boom'}]
+    assert key_released(flights, 'key')
+
+
+def test_stream_error_without_handler_ends_stream():
+    def source(data):
+        yield 'start'
+        raise RuntimeError('boom')
+
+    flights = StreamSingleFlight(source)
+    assert list(flights.subscribe('key', None)[0]) == ['start']
+    assert key_released(flights, 'key')
+
+
+@pytest.mark.parametrize('outcome', ['result', ValueError('boom')])
+def test_singleflight_shares_result_or_error(outcome, wait_until):
+    flights = SingleFlight()
+    release = threading.Event()
+    calls, results = [], []
+
+    def fn():
+        calls.append(outcome)
+        assert release.wait(TIMEOUT)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def call():
+        try:
+            results.append(flights.do('key', fn))
+        except Exception as e:
+            results.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    wait_until(lambda: calls)
+    follower = threading.Thread(target=call)
+    follower.start()
+    wait_until(lambda: flights.coalesced == 1)
+    release.set()
+    leader.join(TIMEOUT)
+    follower.join(TIMEOUT)
+
+    assert calls == [outcome]
+    if isinstance(outcome, Exception):
+        assert results == [outcome, outcome]
+    else:
+        assert sorted(results) == [('result', False), ('result', True)]
+    assert flights.in_flight() == 0
+
+
+def test_stream_many_subscribers_receive_identical_streams():
+    gate, calls = threading.Event(), []
+    flights = StreamSingleFlight(gated_source(gate, calls, events=tuple(range(5))))
+    first, _ = flights.subscribe('key', None)
+    assert next(first) == 0
+    others = [flights.subscribe('key', None)[0] for _ in range(7)]
+    gate.set()
+
+    assert list(first) == [1, 2, 3, 4]
+    assert all(list(events) == [0, 1, 2, 3, 4] for events in others)
+    assert flights.coalesced == 7
+    assert len(calls) == 1